@@ -0,0 +1,99 @@
+# coding=utf-8
+# Copyright 2026 The Alibaba Qwen team.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Compare the ODE solvers of the 25Hz tokenizer's DiT.
+
+Every solver / step count samples the mel from the same initial noise, and is scored by its error against a
+high-step RK4 reference (with guidance on every step), next to its number of DiT passes and wall time. A DiT pass
+with classifier-free guidance counts twice; `--guidance-interval` / `--reuse-guidance` guide only part of the steps.
+
+    python examples/benchmark_dit_solvers.py --model /path/to/Qwen3-TTS-Tokenizer-25Hz --device cuda:0
+    python examples/benchmark_dit_solvers.py --model ... --solvers euler --guidance-interval 0 0.5 --reuse-guidance
+"""
+import argparse
+import time
+
+import torch
+
+from qwen_tts import Qwen3TTSTokenizer
+from qwen_tts.core.tokenizer_25hz.ode_solvers import ODE_SOLVERS
+
+AUDIO = "https://qianwen-res.oss-cn-beijing.aliyuncs.com/Qwen3-TTS-Repo/tokenizer_demo_1.wav"
+
+
+def _sync(device: str) -> None:
+    if device.startswith("cuda"):
+        torch.cuda.synchronize(device)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--model", required=True, help="25Hz speech tokenizer repo id or local directory")
+    parser.add_argument("--audio", default=AUDIO)
+    parser.add_argument("--device", default="cuda:0" if torch.cuda.is_available() else "cpu")
+    parser.add_argument("--solvers", nargs="+", default=sorted(ODE_SOLVERS), choices=sorted(ODE_SOLVERS))
+    parser.add_argument("--num-steps", type=int, nargs="+", default=[4, 6, 10, 16])
+    parser.add_argument("--reference-steps", type=int, default=64, help="Time points of the RK4 reference")
+    parser.add_argument("--guidance-interval", type=float, nargs=2, default=None, metavar=("LO", "HI"))
+    parser.add_argument("--reuse-guidance", action="store_true")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    tokenizer = Qwen3TTSTokenizer.from_pretrained(args.model, device_map=args.device)
+    if tokenizer.get_model_type() != "qwen3_tts_tokenizer_25hz":
+        raise ValueError(f"{args.model} is not a 25Hz tokenizer.")
+    enc = tokenizer.encode(args.audio)
+
+    dit = tokenizer.model.decoder.dit
+    dtype = tokenizer.model.dtype
+    code = enc.audio_codes[0].unsqueeze(0).to(tokenizer.device)
+    xvector = enc.xvectors[0].unsqueeze(0).to(tokenizer.device).to(dtype)
+    ref_mel = enc.ref_mels[0].unsqueeze(0).to(tokenizer.device).to(dtype)
+    generator = torch.Generator(device=tokenizer.device).manual_seed(args.seed)
+    noise = torch.randn(
+        (1, code.shape[1] * dit.repeats, dit.mel_dim), generator=generator, device=tokenizer.device, dtype=dtype
+    )
+
+    passes = []
+    dit.register_forward_pre_hook(
+        lambda module, inputs, kwargs: passes.append(2 if kwargs.get("apply_cfg", True) else 1), with_kwargs=True
+    )
+
+    def run(solver, num_steps, **guidance):
+        passes.clear()
+        _sync(args.device)
+        start = time.perf_counter()
+        mel = dit.sample(xvector, ref_mel, code, num_steps=num_steps, noise=noise, solver=solver, **guidance)
+        _sync(args.device)
+        return mel.float(), time.perf_counter() - start
+
+    guidance = {"guidance_interval": args.guidance_interval, "reuse_guidance": args.reuse_guidance}
+    run("euler", 2)  # warmup
+    reference, _ = run("rk4", args.reference_steps)
+    print(f"{args.model} on {args.device}: {code.shape[1] / 25:.1f} s of audio, reference RK4 {args.reference_steps} steps")
+    print(f"  {'solver':<14} {'steps':>5} {'DiT passes':>10} {'mel RMSE':>10} {'max abs':>9} {'time (ms)':>10}")
+    for solver in args.solvers:
+        for num_steps in args.num_steps:
+            mel, seconds = run(solver, num_steps, **guidance)
+            error = mel - reference
+            print(
+                f"  {solver:<14} {num_steps:>5} {sum(passes):>10} {error.pow(2).mean().sqrt().item():>10.4f} "
+                f"{error.abs().max().item():>9.4f} {seconds * 1000:>10.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
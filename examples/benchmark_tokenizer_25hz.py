@@ -0,0 +1,106 @@
+# coding=utf-8
+# Copyright 2026 The Alibaba Qwen team.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Benchmark the 25Hz tokenizer decode (DiT sampling + BigVGAN).
+
+Compares the DiT sampler, which computes the speaker / code conditioning once per `sample()`, with a loop
+that recomputes it on every ODE step, and times the full `Qwen3TTSTokenizer.decode`.
+
+    python examples/benchmark_tokenizer_25hz.py --model /path/to/Qwen3-TTS-Tokenizer-25Hz --device cuda:0
+"""
+import argparse
+import time
+
+import torch
+
+from qwen_tts import Qwen3TTSTokenizer
+
+AUDIO = "https://qianwen-res.oss-cn-beijing.aliyuncs.com/Qwen3-TTS-Repo/tokenizer_demo_1.wav"
+
+
+def _sync(device: str) -> None:
+    if device.startswith("cuda"):
+        torch.cuda.synchronize(device)
+
+
+def _timeit(fn, device: str, repeats: int) -> float:
+    fn()  # warmup
+    _sync(device)
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    _sync(device)
+    return (time.perf_counter() - start) / repeats
+
+
+@torch.no_grad()
+def sample_per_step_conditioning(dit, conditioning_vector, reference_mel, code, num_steps=10, guidance_scale=0.5, sway_coefficient=-1.0):
+    """Euler sampling that recomputes the conditioning on every ODE step (the behavior before caching)."""
+    maximum_duration = code.shape[1] * dit.repeats
+    values = torch.randn([code.shape[0], maximum_duration, dit.mel_dim], dtype=reference_mel.dtype, device=code.device)
+    conditioning_vector = conditioning_vector.unsqueeze(1).repeat(1, maximum_duration, 1)
+    time_embedding = torch.linspace(0, 1, num_steps, device=code.device, dtype=conditioning_vector.dtype)
+    time_embedding += sway_coefficient * (torch.cos(torch.pi / 2 * time_embedding) - 1 + time_embedding)
+    for t0, t1 in zip(time_embedding[:-1], time_embedding[1:]):
+        output = dit(
+            hidden_states=values,
+            condition_vector=reference_mel,
+            speaker_embedding=conditioning_vector,
+            quantized_code=code,
+            time_step=t0,
+            apply_cfg=True,
+        )
+        guided, null = torch.chunk(output, 2, dim=0)
+        values = values + (guided + (guided - null) * guidance_scale) * (t1 - t0)
+    return values.permute(0, 2, 1)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--model", required=True, help="25Hz speech tokenizer repo id or local directory")
+    parser.add_argument("--audio", default=AUDIO)
+    parser.add_argument("--device", default="cuda:0" if torch.cuda.is_available() else "cpu")
+    parser.add_argument("--num-steps", type=int, default=10)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    tokenizer = Qwen3TTSTokenizer.from_pretrained(args.model, device_map=args.device)
+    if tokenizer.get_model_type() != "qwen3_tts_tokenizer_25hz":
+        raise ValueError(f"{args.model} is not a 25Hz tokenizer.")
+    enc = tokenizer.encode(args.audio)
+
+    dit = tokenizer.model.decoder.dit
+    dtype = tokenizer.model.dtype
+    code = enc.audio_codes[0].unsqueeze(0).to(tokenizer.device)
+    xvector = enc.xvectors[0].unsqueeze(0).to(tokenizer.device).to(dtype)
+    ref_mel = enc.ref_mels[0].unsqueeze(0).to(tokenizer.device).to(dtype)
+    seconds = code.shape[1] / 25
+
+    print(f"{args.model} on {args.device}: {seconds:.1f} s of audio, {args.num_steps} ODE steps")
+    per_step = _timeit(
+        lambda: sample_per_step_conditioning(dit, xvector, ref_mel, code, num_steps=args.num_steps),
+        args.device, args.repeats,
+    )
+    cached = _timeit(lambda: dit.sample(xvector, ref_mel, code, num_steps=args.num_steps), args.device, args.repeats)
+    print(f"  DiT sample, per-step conditioning: {per_step * 1000:8.1f} ms")
+    print(f"  DiT sample, cached conditioning:   {cached * 1000:8.1f} ms  ({per_step / cached:.2f}x)")
+
+    decode = _timeit(lambda: tokenizer.decode(enc), args.device, args.repeats)
+    print(f"  tokenizer.decode:                  {decode * 1000:8.1f} ms  (RTF {decode / seconds:.3f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -18,6 +18,7 @@
 qwen_tts: Qwen-TTS package.
 """
 
+from .inference.qwen3_tts_host import Qwen3TTSModelHost
 from .inference.qwen3_tts_model import Qwen3TTSModel, VoiceClonePromptItem
 from .inference.qwen3_tts_tokenizer import Qwen3TTSTokenizer
 
@@ -14,6 +14,11 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 from .tokenizer_25hz.configuration_qwen3_tts_tokenizer_v1 import Qwen3TTSTokenizerV1Config
-from .tokenizer_25hz.modeling_qwen3_tts_tokenizer_v1 import Qwen3TTSTokenizerV1Model
+from .tokenizer_25hz.modeling_qwen3_tts_tokenizer_v1 import Qwen3TTSTokenizerV1EncoderOutput, Qwen3TTSTokenizerV1Model
 from .tokenizer_12hz.configuration_qwen3_tts_tokenizer_v2 import Qwen3TTSTokenizerV2Config
-from .tokenizer_12hz.modeling_qwen3_tts_tokenizer_v2 import Qwen3TTSTokenizerV2Model
\ No newline at end of file
+from .tokenizer_12hz.modeling_qwen3_tts_tokenizer_v2 import Qwen3TTSTokenizerV2EncoderOutput, Qwen3TTSTokenizerV2Model
+from .tokenizer_12hz.onnx_qwen3_tts_tokenizer_v2 import (
+    Qwen3TTSTokenizerV2OnnxDecoder,
+    Qwen3TTSTokenizerV2OnnxStreamingDecoder,
+    export_decoder_to_onnx,
+)
@@ -1653,6 +1653,7 @@ class Qwen3TTSTalkerForConditionalGeneration(Qwen3TTSTalkerTextPreTrainedModel,
         subtalker_top_p=None,
         subtalker_top_k=None,
         subtalker_temperature=None,
+        subtalker_num_code_groups=None,
         **kwargs,
     ) -> CausalLMOutputWithPast:
         r"""
@@ -1660,6 +1661,11 @@ class Qwen3TTSTalkerForConditionalGeneration(Qwen3TTSTalkerTextPreTrainedModel,
             Labels for computing the masked language modeling loss. Indices should either be in `[0, ...,
             config.vocab_size]` or -100 (see `input_ids` docstring). Tokens with indices set to `-100` are ignored
             (masked), the loss is only computed for the tokens with labels in `[0, ..., config.vocab_size]`.
+        subtalker_num_code_groups (`int`, *optional*):
+            Preview mode: only the first `subtalker_num_code_groups` code groups are predicted per frame, the
+            later sub-talker steps are skipped. The returned codec frames have only the predicted groups, and
+            the skipped ones are left out of the next input embedding, like missing residuals. The 12Hz decoder
+            decodes such codes from that many quantizers.
         ```"""
         # Prefill
         if inputs_embeds is not None and inputs_embeds.shape[1] > 1:
@@ -1667,24 +1673,26 @@ class Qwen3TTSTalkerForConditionalGeneration(Qwen3TTSTalkerTextPreTrainedModel,
             codec_ids = None
         # Generate
         else:
+            num_code_groups = subtalker_num_code_groups or self.config.num_code_groups
             last_id_hidden = self.get_input_embeddings()(input_ids)
-            predictor_result = self.code_predictor.generate(
-                inputs_embeds=torch.cat((past_hidden, last_id_hidden), dim=1),
-                max_new_tokens=self.config.num_code_groups - 1,
-                do_sample=subtalker_dosample,
-                top_p=subtalker_top_p,
-                top_k=subtalker_top_k,
-                temperature=subtalker_temperature,
-                output_hidden_states=True,
-                return_dict_in_generate=True,
-            )
-            codec_ids = torch.cat((input_ids, predictor_result.sequences), dim=-1)
-            codec_hiddens = torch.cat(
-                [last_id_hidden]
-                + [self.code_predictor.get_input_embeddings()[i](predictor_result.sequences[..., i:i+1]) for i in range(self.config.num_code_groups - 1)],
-                dim=1,
-            )
-            inputs_embeds = codec_hiddens.sum(1, keepdim=True)
+            codec_hiddens = [last_id_hidden]
+            if num_code_groups > 1:
+                predictor_result = self.code_predictor.generate(
+                    inputs_embeds=torch.cat((past_hidden, last_id_hidden), dim=1),
+                    max_new_tokens=num_code_groups - 1,
+                    do_sample=subtalker_dosample,
+                    top_p=subtalker_top_p,
+                    top_k=subtalker_top_k,
+                    temperature=subtalker_temperature,
+                    output_hidden_states=True,
+                    return_dict_in_generate=True,
+                )
+                sub_ids = predictor_result.sequences
+                codec_hiddens += [self.code_predictor.get_input_embeddings()[i](sub_ids[..., i:i+1]) for i in range(num_code_groups - 1)]
+            else:
+                sub_ids = input_ids.new_zeros(input_ids.shape[0], 0)
+            codec_ids = torch.cat((input_ids, sub_ids), dim=-1)
+            inputs_embeds = torch.cat(codec_hiddens, dim=1).sum(1, keepdim=True)
 
             if generation_step < trailing_text_hidden.shape[1]:
                 inputs_embeds = inputs_embeds + trailing_text_hidden[:, generation_step].unsqueeze(1)
@@ -1868,6 +1876,9 @@ class Qwen3TTSForConditionalGeneration(Qwen3TTSPreTrainedModel, GenerationMixin)
         weights_only=True,
         **kwargs,
     ):
+        # Optional callable `speech_tokenizer_dir -> Qwen3TTSTokenizer`, used to share one tokenizer across checkpoints
+        speech_tokenizer_loader = kwargs.pop("speech_tokenizer_loader", None)
+
         # Hotfix to enable passing the correct attn implementation which is stored in the config but not in kwargs
         requested_attn_implementation = kwargs.pop("attn_implementation", None)
         if requested_attn_implementation is None and config and config._attn_implementation:
@@ -1912,11 +1923,14 @@ class Qwen3TTSForConditionalGeneration(Qwen3TTSPreTrainedModel, GenerationMixin)
         if speech_tokenizer_path is None:
             raise ValueError(f"""{pretrained_model_name_or_path}/{speech_tokenizer_path} not exists""")
         speech_tokenizer_dir = os.path.dirname(speech_tokenizer_path)
-        speech_tokenizer = Qwen3TTSTokenizer.from_pretrained(
-            speech_tokenizer_dir,
-            *model_args,
-            **kwargs,
-        )
+        if speech_tokenizer_loader is not None:
+            speech_tokenizer = speech_tokenizer_loader(speech_tokenizer_dir)
+        else:
+            speech_tokenizer = Qwen3TTSTokenizer.from_pretrained(
+                speech_tokenizer_dir,
+                *model_args,
+                **kwargs,
+            )
         model.load_speech_tokenizer(speech_tokenizer)
 
         generate_config_path = cached_file(
@@ -2037,10 +2051,15 @@ class Qwen3TTSForConditionalGeneration(Qwen3TTSPreTrainedModel, GenerationMixin)
         subtalker_top_k: int = 50,
         subtalker_top_p: float = 1.0,
         subtalker_temperature: float = 0.9,
+        subtalker_num_code_groups: Optional[int] = None,
         eos_token_id: Optional[int] = None,
         repetition_penalty: float = 1.05,
         **kwargs,
     ):
+        num_code_groups = self.config.talker_config.num_code_groups
+        if subtalker_num_code_groups is not None and not 1 <= subtalker_num_code_groups <= num_code_groups:
+            raise ValueError(f"subtalker_num_code_groups must be in [1, {num_code_groups}], got {subtalker_num_code_groups}")
+
         talker_kwargs = {
             "max_new_tokens": max_new_tokens,
             "min_new_tokens": 2,
@@ -2052,6 +2071,7 @@ class Qwen3TTSForConditionalGeneration(Qwen3TTSPreTrainedModel, GenerationMixin)
             "subtalker_top_k": subtalker_top_k,
             "subtalker_top_p": subtalker_top_p,
             "subtalker_temperature": subtalker_temperature,
+            "subtalker_num_code_groups": subtalker_num_code_groups,
             "eos_token_id": eos_token_id
             if eos_token_id is not None
             else self.config.talker_config.codec_eos_token_id,
@@ -2064,7 +2084,11 @@ class Qwen3TTSForConditionalGeneration(Qwen3TTSPreTrainedModel, GenerationMixin)
             "output_hidden_states": getattr(kwargs, "output_hidden_states", True),
             "return_dict_in_generate": getattr(kwargs, "return_dict_in_generate", True)
         }
-        
+        # generation controls forwarded to the talker as-is, e.g. cancellation via stopping criteria
+        for key in ("stopping_criteria", "streamer"):
+            if kwargs.get(key, None) is not None:
+                talker_kwargs[key] = kwargs[key]
+
         talker_input_embeds = [[] for _ in range(len(input_ids))]
 
         voice_clone_spk_embeds = None
@@ -24,6 +24,7 @@ from torch import nn
 from torch.nn import Parameter
 from torch.nn import functional as F
 from transformers import MimiConfig, MimiModel
+from transformers.models.mimi.modeling_mimi import MimiConv1dPaddingCache
 from transformers.activations import ACT2FN
 from transformers.cache_utils import Cache, DynamicCache
 from transformers.integrations import use_kernel_forward_from_hub
@@ -41,6 +42,7 @@ from transformers.utils import ModelOutput, auto_docstring, logging
 from transformers.utils.deprecation import deprecate_kwarg
 from transformers.utils.generic import check_model_inputs
 
+from ..utils import trailing_code_lengths
 from .configuration_qwen3_tts_tokenizer_v2 import (
     Qwen3TTSTokenizerV2Config,
     Qwen3TTSTokenizerV2DecoderConfig,
@@ -223,6 +225,17 @@ class Qwen3TTSTokenizerV2ConvNeXtBlock(nn.Module):
         self.act = nn.GELU()
         self.pwconv2 = nn.Linear(4 * dim, dim)
         self.gamma = nn.Parameter(1e-6 * torch.ones(dim))
+        self.gamma_folded = False
+
+    @torch.no_grad()
+    def fold_gamma(self):
+        """Fold `gamma` into `pwconv2`, gamma becomes all ones and is skipped in `forward`."""
+        if self.gamma_folded:
+            return
+        self.pwconv2.weight.mul_(self.gamma[:, None])
+        self.pwconv2.bias.mul_(self.gamma)
+        self.gamma.fill_(1.0)
+        self.gamma_folded = True
 
     def forward(self, hidden_states):
         input = hidden_states
@@ -234,7 +247,8 @@ class Qwen3TTSTokenizerV2ConvNeXtBlock(nn.Module):
         hidden_states = self.act(hidden_states)
         hidden_states = self.pwconv2(hidden_states)
 
-        hidden_states = self.gamma * hidden_states
+        if not self.gamma_folded:
+            hidden_states = self.gamma * hidden_states
 
         hidden_states = hidden_states.permute(0, 2, 1)
 
@@ -401,8 +415,22 @@ class Qwen3TTSTokenizerV2DecoderLayerScale(nn.Module):
         channels = config.hidden_size
         initial_scale = config.layer_scale_initial_scale
         self.scale = nn.Parameter(torch.full((channels,), initial_scale, requires_grad=True))
+        self.folded = False
+
+    @torch.no_grad()
+    def fold_into(self, linear: nn.Linear):
+        """Fold the scale into the output rows of the preceding `linear`, the scale becomes an identity."""
+        if self.folded:
+            return
+        linear.weight.mul_(self.scale[:, None])
+        if linear.bias is not None:
+            linear.bias.mul_(self.scale)
+        self.scale.fill_(1.0)
+        self.folded = True
 
     def forward(self, x: torch.Tensor):
+        if self.folded:
+            return x
         return self.scale * x
 
 
@@ -472,6 +500,85 @@ class Qwen3TTSTokenizerV2DecoderTransformerLayer(GradientCheckpointingLayer):
         return hidden_states
 
 
+def sliding_window_attention_mask(
+    query_positions: torch.LongTensor, key_positions: torch.LongTensor, sliding_window: int, dtype: torch.dtype
+) -> torch.Tensor:
+    """
+    Additive mask of shape `(1, 1, num_queries, num_keys)` from absolute positions. Keys at negative positions are
+    empty cache slots and are always masked.
+    """
+    distance = query_positions[:, None] - key_positions[None, :]
+    allowed = (key_positions[None, :] >= 0) & (distance >= 0) & (distance < sliding_window)
+    mask = torch.zeros(allowed.shape, dtype=dtype, device=query_positions.device)
+    mask = mask.masked_fill(~allowed, torch.finfo(dtype).min)
+    return mask[None, None]
+
+
+class Qwen3TTSTokenizerV2DecoderRollingCache:
+    """
+    Fixed size KV cache for incremental runs of `Qwen3TTSTokenizerV2DecoderTransformerModel` (and of the Mimi
+    encoder transformer in `Qwen3TTSTokenizerV2StreamingEncoder`).
+
+    Every layer only attends to the last `sliding_window` positions, so each layer keeps a preallocated ring
+    buffer of the last `sliding_window - 1` keys and values. New states overwrite the oldest slots in place and
+    the absolute position of every slot is tracked, which lets the transformer build a small
+    `(new_tokens, sliding_window - 1 + new_tokens)` mask instead of one over the whole stream. Memory stays
+    constant and every new frame costs O(sliding_window), however long the stream runs.
+    """
+
+    def __init__(self, config: Union[Qwen3TTSTokenizerV2DecoderConfig, MimiConfig]):
+        self.num_slots = max(config.sliding_window - 1, 0)
+        self.key_cache: List[Optional[torch.Tensor]] = [None] * config.num_hidden_layers
+        self.value_cache: List[Optional[torch.Tensor]] = [None] * config.num_hidden_layers
+        # absolute position stored in every slot, -1 for empty slots
+        self.slot_positions = torch.full((self.num_slots,), -1, dtype=torch.long)
+        self.seen_tokens = 0
+
+    def get_seq_length(self, layer_idx: Optional[int] = 0) -> int:
+        return self.seen_tokens
+
+    def reset(self) -> None:
+        self.key_cache = [None] * len(self.key_cache)
+        self.value_cache = [None] * len(self.value_cache)
+        self.slot_positions.fill_(-1)
+        self.seen_tokens = 0
+
+    def get_attention_mask(self, cache_position: torch.LongTensor, dtype: torch.dtype) -> torch.Tensor:
+        """
+        Additive mask of shape `(1, 1, new_tokens, num_slots + new_tokens)` over `[cached slots, new tokens]`.
+        """
+        key_positions = torch.cat([self.slot_positions.to(cache_position.device), cache_position])
+        return sliding_window_attention_mask(cache_position, key_positions, self.num_slots + 1, dtype)
+
+    def update(
+        self,
+        key_states: torch.Tensor,
+        value_states: torch.Tensor,
+        layer_idx: int,
+        cache_kwargs: Optional[dict] = None,
+    ) -> tuple[torch.Tensor, torch.Tensor]:
+        if self.key_cache[layer_idx] is None:
+            shape = (*key_states.shape[:2], self.num_slots, key_states.shape[-1])
+            self.key_cache[layer_idx] = key_states.new_zeros(shape)
+            self.value_cache[layer_idx] = value_states.new_zeros(shape)
+        keys = torch.cat([self.key_cache[layer_idx], key_states], dim=-2)
+        values = torch.cat([self.value_cache[layer_idx], value_states], dim=-2)
+
+        # only the last `num_slots` new states can be seen by later tokens
+        num_new = key_states.shape[-2]
+        keep = min(num_new, self.num_slots)
+        if keep > 0:
+            positions = torch.arange(self.seen_tokens + num_new - keep, self.seen_tokens + num_new)
+            slots = (positions % self.num_slots).to(key_states.device)
+            self.key_cache[layer_idx].index_copy_(-2, slots, key_states[..., num_new - keep :, :])
+            self.value_cache[layer_idx].index_copy_(-2, slots, value_states[..., num_new - keep :, :])
+            if layer_idx == len(self.key_cache) - 1:
+                self.slot_positions[slots.cpu()] = positions
+        if layer_idx == len(self.key_cache) - 1:
+            self.seen_tokens += num_new
+        return keys, values
+
+
 @auto_docstring
 class Qwen3TTSTokenizerV2DecoderTransformerModel(Qwen3TTSTokenizerV2DecoderPreTrainedModel):
     _can_record_outputs = {
@@ -531,6 +638,17 @@ class Qwen3TTSTokenizerV2DecoderTransformerModel(Qwen3TTSTokenizerV2DecoderPreTr
         if position_ids is None:
             position_ids = cache_position.unsqueeze(0)
 
+        if isinstance(past_key_values, Qwen3TTSTokenizerV2DecoderRollingCache):
+            if attention_mask is not None:
+                raise ValueError("attention_mask is not supported with Qwen3TTSTokenizerV2DecoderRollingCache")
+            if self.config._attn_implementation not in ("eager", "sdpa"):
+                raise ValueError(
+                    "Qwen3TTSTokenizerV2DecoderRollingCache needs the `eager` or `sdpa` attention implementation, "
+                    f"got {self.config._attn_implementation}"
+                )
+            rolling_mask = past_key_values.get_attention_mask(cache_position, inputs_embeds.dtype)
+            attention_mask = {"full_attention": rolling_mask, "sliding_attention": rolling_mask}
+
         # It may already have been prepared by e.g. `generate`
         if not isinstance(causal_mask_mapping := attention_mask, dict):
             # Prepare mask arguments
@@ -598,6 +716,18 @@ class SnakeBeta(nn.Module):
         self.beta = Parameter(torch.zeros(in_features) * alpha)
 
         self.no_div_by_zero = 0.000000001
+        self.frozen = False
+
+    @torch.no_grad()
+    def freeze(self):
+        """
+        Precompute exp(alpha) and 1 / (exp(beta) + eps) for inference. Call again after changing alpha or beta.
+        """
+        alpha = torch.exp(self.alpha.unsqueeze(0).unsqueeze(-1))
+        beta = torch.exp(self.beta.unsqueeze(0).unsqueeze(-1))
+        self.register_buffer("alpha_exp", alpha, persistent=False)
+        self.register_buffer("beta_inv", 1.0 / (beta + self.no_div_by_zero), persistent=False)
+        self.frozen = True
 
     def forward(self, hidden_states):
         """
@@ -605,6 +735,9 @@ class SnakeBeta(nn.Module):
         Applies the function to the input elementwise.
         SnakeBeta ∶= x + 1/b * sin^2 (xa)
         """
+        if self.frozen:
+            return hidden_states + self.beta_inv * torch.pow(torch.sin(hidden_states * self.alpha_exp), 2)
+
         alpha = self.alpha.unsqueeze(0).unsqueeze(-1)  # line up with x to [B, C, T]
         beta = self.beta.unsqueeze(0).unsqueeze(-1)
         alpha = torch.exp(alpha)
@@ -811,10 +944,44 @@ class SplitResidualVectorQuantizer(nn.Module):
             q_dropout=q_dropout,
             **kwargs,
         )
+        self.register_buffer("decode_table", None, persistent=False)
+
+    @torch.no_grad()
+    def freeze(self):
+        """
+        Precompute the stacked table of projected codebook vectors used by `decode`.
+
+        `project_out` and `output_proj` are linear, so every codebook entry can be projected once. The table has
+        shape `(n_q, bins, output_dimension)` and turns `decode` into a single gather and a sum over quantizers.
+        Call again after changing the codebooks or projections.
+        """
+        tables = []
+        for rvq in (self.rvq_first, self.rvq_rest):
+            weight = rvq.output_proj.weight[:, :, 0] if isinstance(rvq.output_proj, nn.Conv1d) else None
+            for layer in rvq.vq.layers:
+                codebook = layer._codebook
+                table = codebook.embedding_sum / codebook.cluster_usage.clamp(min=codebook.epsilon)[:, None]
+                table = layer.project_out(table)
+                if weight is not None:
+                    table = table @ weight.T
+                tables.append(table)
+        self.decode_table = torch.stack(tables, dim=0)
 
     def decode(self, codes: torch.Tensor) -> torch.Tensor:
         """Decode the given codes to the quantized representation."""
         # codes is [B, K, T], with T frames, K nb of codebooks.
+        if self.decode_table is not None:
+            num_quantizers, bins, dim = self.decode_table.shape
+            offsets = torch.arange(codes.shape[1], device=codes.device)[None, :, None] * bins
+            if torch.onnx.is_in_onnx_export():
+                # embedding_bag exports to a Loop, Gather + ReduceSum is fused by onnxruntime instead
+                table = self.decode_table.view(num_quantizers * bins, dim)
+                return F.embedding(codes + offsets, table).sum(dim=1).transpose(1, 2)
+            # one fused gather + sum over the quantizer axis: (B * T, K) bags of table rows
+            bags = (codes + offsets).transpose(1, 2).reshape(-1, codes.shape[1])
+            quantized = F.embedding_bag(bags, self.decode_table.view(num_quantizers * bins, dim), mode="sum")
+            return quantized.view(codes.shape[0], codes.shape[2], dim).transpose(1, 2)
+
         quantized = self.rvq_first.decode(codes[:, : self.n_q_semantic])
         if codes.shape[1] > self.n_q_semantic:
             quantized += self.rvq_rest.decode(codes[:, self.n_q_semantic :])
@@ -867,8 +1034,14 @@ class Qwen3TTSTokenizerV2Decoder(Qwen3TTSTokenizerV2DecoderPreTrainedModel):
         self.post_init()
 
     def forward(self, codes):
-        if codes.shape[1] != self.config.num_quantizers:
-            raise ValueError(f"Expected {self.config.num_quantizers} layer of codes, got {codes.shape[1]}")
+        """
+        Args:
+            codes (`torch.LongTensor` of shape `(batch_size, num_quantizers, codes_length)`):
+                Codes of the first `num_quantizers` quantizers, at most `config.num_quantizers`. The codec is
+                residual, so passing fewer layers decodes a coarser preview with the missing residuals set to zero.
+        """
+        if not 1 <= codes.shape[1] <= self.config.num_quantizers:
+            raise ValueError(f"Expected 1 to {self.config.num_quantizers} layers of codes, got {codes.shape[1]}")
 
         hidden = self.quantizer.decode(codes)
         hidden = self.pre_conv(hidden).transpose(1, 2)
@@ -895,6 +1068,208 @@ class Qwen3TTSTokenizerV2Decoder(Qwen3TTSTokenizerV2DecoderPreTrainedModel):
             start_index = end_index
         return torch.cat(wavs, dim=-1)
 
+    def parallel_chunked_decode(self, codes, chunk_size=300, left_context_size=25, max_chunks_per_batch=None):
+        """
+        Same chunking as `chunked_decode`, but the chunks are decoded as a batch instead of one after another.
+
+        All chunks are sliced with their left context up front and right padded to the same length. The decoder
+        is causal, so the right padding does not change the samples of the real frames, and the stitched output
+        matches `chunked_decode`.
+
+        Args:
+            codes (`torch.LongTensor` of shape `(batch_size, num_quantizers, codes_length)`):
+                Codes to decode.
+            max_chunks_per_batch (`int`, *optional*):
+                Maximum number of chunks per forward pass, to bound the activation memory. Defaults to all chunks
+                in one forward pass.
+        """
+        batch_size, _, length = codes.shape
+        starts = list(range(0, length, chunk_size))
+        contexts = [left_context_size if start - left_context_size > 0 else start for start in starts]
+        window = max(min(start + chunk_size, length) - start + context for start, context in zip(starts, contexts))
+
+        slices = []
+        for start, context in zip(starts, contexts):
+            codes_chunk = codes[..., start - context : start + chunk_size]
+            slices.append(F.pad(codes_chunk, (0, window - codes_chunk.shape[-1])))
+        # (num_chunks, batch_size, num_quantizers, window) -> (num_chunks * batch_size, num_quantizers, window)
+        slices = torch.stack(slices, dim=0).flatten(0, 1)
+
+        max_chunks_per_batch = max_chunks_per_batch or len(starts)
+        step = max_chunks_per_batch * batch_size
+        wav = torch.cat([self(slices[i : i + step]) for i in range(0, slices.shape[0], step)], dim=0)
+        wav = wav.unflatten(0, (len(starts), batch_size))
+
+        wavs = []
+        for index, (start, context) in enumerate(zip(starts, contexts)):
+            num_frames = min(start + chunk_size, length) - start
+            begin = context * self.total_upsample
+            wavs.append(wav[index, ..., begin : begin + num_frames * self.total_upsample])
+        return torch.cat(wavs, dim=-1)
+
+    def freeze_for_inference(self) -> "Qwen3TTSTokenizerV2Decoder":
+        """
+        Remove per-forward constant work for inference and switch to eval mode.
+
+        - The quantizer precomputes a stacked table of projected codebook vectors, see
+          `SplitResidualVectorQuantizer.freeze`.
+        - `SnakeBeta` precomputes exp(alpha) and 1 / (exp(beta) + eps) into buffers.
+        - The ConvNeXt `gamma` and the transformer `LayerScale`s are folded into the preceding `pwconv2`,
+          `o_proj` and `down_proj` weights, which is exact up to float rounding.
+
+        The folded weights replace the trained ones in place, so the state dict stays self-consistent
+        (scales become ones) but differs from the checkpoint. Reload the model to train it again.
+        """
+        self.eval()
+        self.quantizer.freeze()
+        for module in self.modules():
+            if isinstance(module, SnakeBeta):
+                module.freeze()
+            elif isinstance(module, Qwen3TTSTokenizerV2ConvNeXtBlock):
+                module.fold_gamma()
+            elif isinstance(module, Qwen3TTSTokenizerV2DecoderTransformerLayer):
+                module.self_attn_layer_scale.fold_into(module.self_attn.o_proj)
+                module.mlp_layer_scale.fold_into(module.mlp.down_proj)
+        return self
+
+    def streaming_decoder(self) -> "Qwen3TTSTokenizerV2StreamingDecoder":
+        """
+        Create a stateful decoder that turns codec frames into audio incrementally.
+        """
+        return Qwen3TTSTokenizerV2StreamingDecoder(self)
+
+
+class Qwen3TTSTokenizerV2StreamingDecoder:
+    """
+    Incremental version of `Qwen3TTSTokenizerV2Decoder.forward`.
+
+    Every conv of the decoder is causal, and the pre-transformer attends causally within a sliding
+    window, so the decoder can run frame by frame without recomputation:
+      - `Qwen3TTSTokenizerV2CausalConvNet` keeps the last `padding` input samples as its left context
+        (zeros at the start, exactly like the offline left padding),
+      - `Qwen3TTSTokenizerV2CausalTransConvNet` keeps the last input frames whose outputs overlap the
+        next chunk and recomputes only that overlap,
+      - the pre-transformer keeps a `Qwen3TTSTokenizerV2DecoderRollingCache` bounded to its sliding window.
+
+    `decode()` on N new frames returns exactly N * `total_upsample` new samples, and the concatenation of
+    all returned chunks equals the offline `decoder(codes)` output up to floating point rounding of
+    kernels run on different lengths.
+    """
+
+    def __init__(self, decoder: Qwen3TTSTokenizerV2Decoder):
+        self.decoder = decoder
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Drop all state, the next `decode()` starts a new stream.
+        """
+        self._buffers = {}
+        self.past_key_values = None
+        self.num_frames = 0
+
+    def _causal_conv(self, module: Qwen3TTSTokenizerV2CausalConvNet, hidden_state: torch.Tensor) -> torch.Tensor:
+        if module.stride != 1:
+            raise ValueError("Streaming decode only supports stride 1 causal convolutions.")
+        if module.padding > 0:
+            tail = self._buffers.get(module, None)
+            if tail is None:
+                tail = hidden_state.new_zeros(*hidden_state.shape[:-1], module.padding)
+            hidden_state = torch.cat([tail, hidden_state], dim=-1)
+            self._buffers[module] = hidden_state[..., -module.padding :]
+        return module.conv(hidden_state).contiguous()
+
+    def _causal_trans_conv(self, module: Qwen3TTSTokenizerV2CausalTransConvNet, hidden_state: torch.Tensor) -> torch.Tensor:
+        stride = module.conv.stride[0]
+        # input frames whose outputs still overlap the first output of the next frame
+        context = -(-module.right_pad // stride)
+        if context == 0:
+            return module(hidden_state)
+        tail = self._buffers.get(module, None)
+        if tail is None:
+            tail = hidden_state.new_zeros(*hidden_state.shape[:-1], context)
+        hidden_state = torch.cat([tail, hidden_state], dim=-1)
+        self._buffers[module] = hidden_state[..., -context:]
+        return module(hidden_state)[..., context * stride :].contiguous()
+
+    def _convnext(self, block: Qwen3TTSTokenizerV2ConvNeXtBlock, hidden_states: torch.Tensor) -> torch.Tensor:
+        input = hidden_states
+        hidden_states = self._causal_conv(block.dwconv, hidden_states)
+        hidden_states = hidden_states.permute(0, 2, 1)
+        hidden_states = block.norm(hidden_states)
+        hidden_states = block.pwconv1(hidden_states)
+        hidden_states = block.act(hidden_states)
+        hidden_states = block.pwconv2(hidden_states)
+        if not block.gamma_folded:
+            hidden_states = block.gamma * hidden_states
+        hidden_states = hidden_states.permute(0, 2, 1)
+        return input + hidden_states
+
+    def _residual_unit(self, unit: Qwen3TTSTokenizerV2DecoderDecoderResidualUnit, hidden_state: torch.Tensor) -> torch.Tensor:
+        residual = hidden_state
+        hidden_state = unit.act1(hidden_state)
+        hidden_state = self._causal_conv(unit.conv1, hidden_state)
+        hidden_state = unit.act2(hidden_state)
+        hidden_state = self._causal_conv(unit.conv2, hidden_state)
+        return hidden_state + residual
+
+    def _module(self, module: nn.Module, hidden: torch.Tensor) -> torch.Tensor:
+        if isinstance(module, Qwen3TTSTokenizerV2CausalConvNet):
+            return self._causal_conv(module, hidden)
+        if isinstance(module, Qwen3TTSTokenizerV2CausalTransConvNet):
+            return self._causal_trans_conv(module, hidden)
+        if isinstance(module, Qwen3TTSTokenizerV2ConvNeXtBlock):
+            return self._convnext(module, hidden)
+        if isinstance(module, Qwen3TTSTokenizerV2DecoderDecoderResidualUnit):
+            return self._residual_unit(module, hidden)
+        if isinstance(module, Qwen3TTSTokenizerV2DecoderDecoderBlock):
+            for block in module.block:
+                hidden = self._module(block, hidden)
+            return hidden
+        # point-wise modules (SnakeBeta)
+        return module(hidden)
+
+    def _pre_transformer(self, hidden: torch.Tensor) -> torch.Tensor:
+        pre_transformer = self.decoder.pre_transformer
+        if self.past_key_values is None and pre_transformer.config._attn_implementation in ("eager", "sdpa"):
+            # other attention backends fall back to the transformers sliding window cache
+            self.past_key_values = Qwen3TTSTokenizerV2DecoderRollingCache(pre_transformer.config)
+        outputs = pre_transformer(inputs_embeds=hidden, past_key_values=self.past_key_values, use_cache=True)
+        self.past_key_values = outputs.past_key_values
+        return outputs.last_hidden_state
+
+    def decode(self, codes: torch.Tensor) -> torch.Tensor:
+        """
+        Decode the next frames of the stream.
+
+        Args:
+            codes (`torch.LongTensor` of shape `(batch_size, num_quantizers, num_new_frames)`):
+                New codec frames. The batch size must stay the same for the whole stream. Fewer than
+                `config.num_quantizers` layers decode a preview, see `Qwen3TTSTokenizerV2Decoder.forward`.
+
+        Returns:
+            `torch.FloatTensor` of shape `(batch_size, 1, num_new_frames * total_upsample)`.
+        """
+        decoder = self.decoder
+        if not 1 <= codes.shape[1] <= decoder.config.num_quantizers:
+            raise ValueError(f"Expected 1 to {decoder.config.num_quantizers} layers of codes, got {codes.shape[1]}")
+        if codes.shape[-1] == 0:
+            return codes.new_zeros(codes.shape[0], 1, 0, dtype=decoder.dtype)
+
+        hidden = decoder.quantizer.decode(codes)
+        hidden = self._causal_conv(decoder.pre_conv, hidden).transpose(1, 2)
+        hidden = self._pre_transformer(hidden).permute(0, 2, 1)
+
+        for blocks in decoder.upsample:
+            for block in blocks:
+                hidden = self._module(block, hidden)
+        wav = hidden
+        for block in decoder.decoder:
+            wav = self._module(block, wav)
+
+        self.num_frames += codes.shape[-1]
+        return wav.clamp(min=-1, max=1)
+
 
 class Qwen3TTSTokenizerV2Encoder(MimiModel):
     def __init__(self, config: MimiConfig):
@@ -908,6 +1283,114 @@ class Qwen3TTSTokenizerV2Encoder(MimiModel):
         self.post_init()
 
 
+class Qwen3TTSTokenizerV2StreamingEncoder:
+    """
+    Incremental version of `Qwen3TTSTokenizerV2Model.encode` with bounded memory.
+
+    Audio is consumed in whole codec frames (`encode_downsample_rate` samples), leftover samples are kept for the
+    next call. The causal convs of the Mimi encoder carry their left context in a `MimiConv1dPaddingCache` and
+    the encoder transformer keeps a `Qwen3TTSTokenizerV2DecoderRollingCache`, so memory does not grow with the
+    length of the stream.
+
+    The encoder transformer attends to the last `sliding_window` encoder steps, the context Mimi is trained with,
+    while the offline `encode` attends to the whole clip. Codes are therefore the same as the offline `encode` for
+    clips up to `sliding_window` encoder steps (except for the zero padded last frame), and use the sliding window
+    context beyond that.
+    """
+
+    def __init__(self, model: "Qwen3TTSTokenizerV2Model"):
+        self.encoder = model.encoder
+        self.num_quantizers = model.encoder_valid_num_quantizers
+        self.frame_size = model.encode_downsample_rate
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Drop all state, the next `encode()` starts a new stream.
+        """
+        self.padding_cache = None
+        self.past_key_values = None
+        self.pending = None
+        self.num_frames = 0
+
+    def _create_padding_cache(self) -> MimiConv1dPaddingCache:
+        encoder = self.encoder
+        layers = [encoder.encoder.get_submodule(name) for name in encoder.encoder._mimiconv1d_layer_names]
+        layers.append(encoder.downsample)
+        return MimiConv1dPaddingCache(
+            num_layers=len(layers),
+            per_layer_padding=[layer.padding_total for layer in layers],
+            per_layer_padding_mode=[layer.pad_mode for layer in layers],
+            per_layer_in_channels=[layer.in_channels for layer in layers],
+        )
+
+    def _encode_frames(self, input_values: torch.Tensor) -> torch.Tensor:
+        encoder = self.encoder
+        if encoder.config._attn_implementation not in ("eager", "sdpa"):
+            raise ValueError(
+                f"Streaming encode needs the `eager` or `sdpa` attention implementation, got {encoder.config._attn_implementation}"
+            )
+        if self.padding_cache is None:
+            self.padding_cache = self._create_padding_cache()
+            self.past_key_values = Qwen3TTSTokenizerV2DecoderRollingCache(encoder.config)
+
+        embeddings = encoder.encoder(input_values.unsqueeze(1), padding_cache=self.padding_cache).transpose(1, 2)
+        past_seen_tokens = self.past_key_values.get_seq_length()
+        cache_position = torch.arange(
+            past_seen_tokens, past_seen_tokens + embeddings.shape[1], device=embeddings.device
+        )
+        embeddings = encoder.encoder_transformer(
+            embeddings,
+            attention_mask=self.past_key_values.get_attention_mask(cache_position, embeddings.dtype),
+            position_ids=cache_position.unsqueeze(0),
+            past_key_values=self.past_key_values,
+            cache_position=cache_position,
+            return_dict=True,
+        ).last_hidden_state
+        embeddings = encoder.downsample(embeddings.transpose(1, 2), padding_cache=self.padding_cache)
+
+        codes = encoder.quantizer.encode(embeddings, self.num_quantizers).transpose(0, 1)
+        self.num_frames += codes.shape[-1]
+        return codes.transpose(1, 2)
+
+    def encode(self, input_values: torch.Tensor) -> torch.Tensor:
+        """
+        Encode the next block of the stream.
+
+        Args:
+            input_values (`torch.Tensor` of shape `(batch_size, num_samples)`):
+                Next waveform samples at the input sample rate, any block size. The batch size must stay the same
+                for the whole stream.
+
+        Returns:
+            `torch.LongTensor` of shape `(batch_size, num_new_frames, num_quantizers)` with the codes of every frame
+            completed by this block.
+        """
+        if self.pending is not None:
+            input_values = torch.cat([self.pending, input_values], dim=-1)
+        num_samples = input_values.shape[-1] // self.frame_size * self.frame_size
+        self.pending = input_values[..., num_samples:]
+        if num_samples == 0:
+            return input_values.new_zeros(input_values.shape[0], 0, self.num_quantizers, dtype=torch.long)
+        return self._encode_frames(input_values[..., :num_samples])
+
+    def flush(self) -> torch.Tensor:
+        """
+        Zero pad the leftover samples to a full frame, encode it and end the stream.
+
+        Returns:
+            `torch.LongTensor` of shape `(batch_size, 0 or 1, num_quantizers)`, or `None` if nothing was encoded.
+        """
+        pending = self.pending
+        codes = None
+        if pending is not None and pending.shape[-1] > 0:
+            codes = self._encode_frames(F.pad(pending, (0, self.frame_size - pending.shape[-1])))
+        elif pending is not None:
+            codes = pending.new_zeros(pending.shape[0], 0, self.num_quantizers, dtype=torch.long)
+        self.reset()
+        return codes
+
+
 @auto_docstring
 class Qwen3TTSTokenizerV2PreTrainedModel(PreTrainedModel):
     config: Qwen3TTSTokenizerV2Config
@@ -957,6 +1440,12 @@ class Qwen3TTSTokenizerV2Model(Qwen3TTSTokenizerV2PreTrainedModel):
     
     def get_decode_upsample_rate(self):
         return self.decode_upsample_rate
+
+    def streaming_decoder(self) -> Qwen3TTSTokenizerV2StreamingDecoder:
+        return self.decoder.streaming_decoder()
+
+    def streaming_encoder(self) -> Qwen3TTSTokenizerV2StreamingEncoder:
+        return Qwen3TTSTokenizerV2StreamingEncoder(self)
     
     def encode(
         self,
@@ -994,6 +1483,8 @@ class Qwen3TTSTokenizerV2Model(Qwen3TTSTokenizerV2PreTrainedModel):
         self,
         audio_codes: torch.Tensor,
         return_dict: Optional[bool] = None,
+        parallel_chunks: Optional[int] = 1,
+        audio_lengths: Optional[torch.LongTensor] = None,
     ) -> Union[tuple[torch.Tensor, torch.Tensor], Qwen3TTSTokenizerV2DecoderOutput]:
         """
         Decodes the given frames into an output audio waveform.
@@ -1003,16 +1494,29 @@ class Qwen3TTSTokenizerV2Model(Qwen3TTSTokenizerV2PreTrainedModel):
 
         Args:
             audio_codes (`torch.LongTensor`  of shape `(batch_size, codes_length, num_quantizers)`, *optional*):
-                Discret code embeddings computed using `model.encode`.
+                Discret code embeddings computed using `model.encode`. Passing only the first K quantizers
+                decodes a lower quality preview.
             return_dict (`bool`, *optional*):
                 Whether or not to return a [`~utils.ModelOutput`] instead of a plain tuple.
+            parallel_chunks (`int`, *optional*, defaults to 1):
+                Number of 300-frame chunks decoded together in one forward pass. `1` decodes the chunks one after
+                another, `None` decodes all chunks of a long sequence in a single batch.
+            audio_lengths (`torch.LongTensor` of shape `(batch_size,)`, *optional*):
+                Number of valid frames per item. Defaults to everything up to the last frame with a non-zero code.
 
         """
         return_dict = return_dict if return_dict is not None else self.config.return_dict
 
-        audio_values = self.decoder.chunked_decode(audio_codes.transpose(1, 2)).squeeze(1)
+        if parallel_chunks == 1:
+            audio_values = self.decoder.chunked_decode(audio_codes.transpose(1, 2)).squeeze(1)
+        else:
+            audio_values = self.decoder.parallel_chunked_decode(
+                audio_codes.transpose(1, 2), max_chunks_per_batch=parallel_chunks
+            ).squeeze(1)
 
-        audio_lengths = (audio_codes[..., 0] > 0).sum(1) * self.decode_upsample_rate
+        if audio_lengths is None:
+            audio_lengths = trailing_code_lengths(audio_codes)
+        audio_lengths = audio_lengths * self.decode_upsample_rate
         audio_values = [a[:l] for a, l in zip(audio_values, audio_lengths)]
 
         if not return_dict:
@@ -1023,4 +1527,9 @@ class Qwen3TTSTokenizerV2Model(Qwen3TTSTokenizerV2PreTrainedModel):
         return Qwen3TTSTokenizerV2DecoderOutput(audio_values)
 
 
-__all__ = ["Qwen3TTSTokenizerV2Model", "Qwen3TTSTokenizerV2PreTrainedModel"]
+__all__ = [
+    "Qwen3TTSTokenizerV2Model",
+    "Qwen3TTSTokenizerV2PreTrainedModel",
+    "Qwen3TTSTokenizerV2StreamingDecoder",
+    "Qwen3TTSTokenizerV2StreamingEncoder",
+]
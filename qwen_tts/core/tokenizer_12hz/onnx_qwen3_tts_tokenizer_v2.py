@@ -0,0 +1,327 @@
+# coding=utf-8
+# Copyright 2026 The Qwen team, Alibaba Group and the HuggingFace Inc. team. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""ONNX export of the Qwen3TTSTokenizerV2 decoder and onnxruntime execution."""
+
+from typing import List, Optional, Union
+
+import numpy as np
+import onnxruntime
+import torch
+from torch import nn
+
+from .modeling_qwen3_tts_tokenizer_v2 import (
+    Qwen3TTSTokenizerV2CausalConvNet,
+    Qwen3TTSTokenizerV2CausalTransConvNet,
+    Qwen3TTSTokenizerV2Decoder,
+    Qwen3TTSTokenizerV2StreamingDecoder,
+    sliding_window_attention_mask,
+)
+
+
+class _WindowKVState:
+    """KV cache keeping the last `num_slots` keys and values of every layer in chronological order."""
+
+    def __init__(self, keys: List[torch.Tensor], values: List[torch.Tensor], num_slots: int):
+        self.keys = keys
+        self.values = values
+        self.num_slots = num_slots
+
+    def update(self, key_states, value_states, layer_idx, cache_kwargs=None):
+        keys = torch.cat([self.keys[layer_idx], key_states], dim=-2)
+        values = torch.cat([self.values[layer_idx], value_states], dim=-2)
+        if self.num_slots > 0:
+            self.keys[layer_idx] = keys[..., -self.num_slots :, :]
+            self.values[layer_idx] = values[..., -self.num_slots :, :]
+        return keys, values
+
+
+class _ExportStreamingDecoder(Qwen3TTSTokenizerV2StreamingDecoder):
+    """
+    Streaming decoder whose state is a flat list of tensors, so it can be traced.
+
+    The state is the left context of every stateful conv, the last `sliding_window - 1` keys and values of every
+    transformer layer and the number of frames decoded so far. With `num_slots=0` and no input state, decoding
+    is the same as the full `Qwen3TTSTokenizerV2Decoder.forward`.
+    """
+
+    def __init__(self, decoder: Qwen3TTSTokenizerV2Decoder, num_slots: int):
+        super().__init__(decoder)
+        self.num_slots = num_slots
+        self.conv_modules = [
+            module
+            for module in decoder.modules()
+            if isinstance(module, Qwen3TTSTokenizerV2CausalConvNet) and module.padding > 0
+            or isinstance(module, Qwen3TTSTokenizerV2CausalTransConvNet) and module.right_pad > 0
+        ]
+
+    def state_shapes(self, batch_size: int) -> List[tuple]:
+        shapes = []
+        for module in self.conv_modules:
+            if isinstance(module, Qwen3TTSTokenizerV2CausalConvNet):
+                shapes.append((batch_size, module.conv.in_channels, module.padding))
+            else:
+                stride = module.conv.stride[0]
+                shapes.append((batch_size, module.conv.in_channels, -(-module.right_pad // stride)))
+        config = self.decoder.pre_transformer.config
+        head_dim = getattr(config, "head_dim", config.hidden_size // config.num_attention_heads)
+        kv_shape = (batch_size, config.num_key_value_heads, self.num_slots, head_dim)
+        shapes += [kv_shape] * (2 * config.num_hidden_layers)
+        return shapes
+
+    def load_state(self, states: List[torch.Tensor], offset: torch.LongTensor, batch_size: int) -> None:
+        self.reset()
+        self.offset = offset
+        num_convs = len(self.conv_modules)
+        for module, state in zip(self.conv_modules, states[:num_convs]):
+            self._buffers[module] = state
+        kv = list(states[num_convs:])
+        if not kv:
+            # full sequence decode: empty cache
+            dtype, device = self.decoder.dtype, self.decoder.device
+            kv = [torch.zeros(shape, dtype=dtype, device=device) for shape in self.state_shapes(batch_size)[num_convs:]]
+        self.window = _WindowKVState(kv[0::2], kv[1::2], self.num_slots)
+
+    def dump_state(self) -> List[torch.Tensor]:
+        states = [self._buffers[module] for module in self.conv_modules]
+        for keys, values in zip(self.window.keys, self.window.values):
+            states += [keys, values]
+        return states
+
+    def _pre_transformer(self, hidden: torch.Tensor) -> torch.Tensor:
+        pre_transformer = self.decoder.pre_transformer
+        steps = torch.arange(hidden.shape[1], device=hidden.device)
+        positions = self.offset + steps
+        key_positions = torch.cat(
+            [self.offset - self.num_slots + torch.arange(self.num_slots, device=hidden.device), positions]
+        )
+        mask = sliding_window_attention_mask(positions, key_positions, pre_transformer.config.sliding_window, hidden.dtype)
+        outputs = pre_transformer(
+            inputs_embeds=hidden,
+            attention_mask={"full_attention": mask, "sliding_attention": mask},
+            position_ids=positions.unsqueeze(0),
+            cache_position=positions,
+            past_key_values=self.window,
+            use_cache=True,
+        )
+        return outputs.last_hidden_state
+
+
+class _DecoderOnnxWrapper(nn.Module):
+    def __init__(self, decoder: Qwen3TTSTokenizerV2Decoder, streaming: bool):
+        super().__init__()
+        self.decoder = decoder
+        self.streaming = streaming
+        num_slots = decoder.config.sliding_window - 1 if streaming else 0
+        self.stream = _ExportStreamingDecoder(decoder, num_slots)
+
+    def forward(self, codes, *inputs):
+        if not self.streaming:
+            self.stream.load_state([], torch.zeros(1, dtype=torch.long, device=codes.device), codes.shape[0])
+            return self.stream.decode(codes)
+        offset, states = inputs[0], list(inputs[1:])
+        self.stream.load_state(states, offset, codes.shape[0])
+        wav = self.stream.decode(codes)
+        return (wav, offset + codes.shape[-1], *self.stream.dump_state())
+
+
+@torch.no_grad()
+def export_decoder_to_onnx(
+    decoder: Qwen3TTSTokenizerV2Decoder,
+    output_path: str,
+    streaming: bool = False,
+    opset_version: int = 17,
+) -> str:
+    """
+    Export the 12Hz decoder (codes -> waveform) to ONNX.
+
+    Full form (`streaming=False`):
+        inputs `codes` int64 (batch, num_quantizers, frames) -> `wav` float (batch, 1, frames * total_upsample)
+
+    Streaming form (`streaming=True`):
+        inputs `codes`, `offset` int64 (1,) and `state_0 ... state_{n-1}`,
+        outputs `wav`, `new_offset` and `new_state_0 ... new_state_{n-1}`.
+        The states are the left context of the causal convs and the sliding window KV cache of the pre-transformer.
+        Start a stream with all-zero states and offset 0, then feed the outputs back as the next inputs.
+        This is the same computation as `Qwen3TTSTokenizerV2StreamingDecoder`.
+
+    The graph is traced in the decoder's dtype with eager attention. Run `decoder.freeze_for_inference()` first
+    for a smaller graph.
+
+    Returns:
+        str: `output_path`.
+
+    Raises:
+        ValueError: If the decoder is bfloat16, which numpy (and so the onnxruntime wrappers) cannot feed or read.
+    """
+    if decoder.dtype not in (torch.float32, torch.float16):
+        raise ValueError(
+            f"Cannot export a {decoder.dtype} decoder to ONNX, its states and waveform must be float32 or float16. "
+            "Cast it first, e.g. `decoder.float()`."
+        )
+    was_training = decoder.training
+    attn_implementation = decoder.pre_transformer.config._attn_implementation
+    decoder.eval()
+    decoder.pre_transformer.config._attn_implementation = "eager"
+    try:
+        wrapper = _DecoderOnnxWrapper(decoder, streaming)
+        codes = torch.zeros(1, decoder.config.num_quantizers, 4 if streaming else 16, dtype=torch.long, device=decoder.device)
+        args = (codes,)
+        input_names, output_names = ["codes"], ["wav"]
+        dynamic_axes = {"codes": {0: "batch", 2: "frames"}, "wav": {0: "batch", 2: "samples"}}
+        if streaming:
+            shapes = wrapper.stream.state_shapes(1)
+            states = tuple(torch.zeros(shape, dtype=decoder.dtype, device=decoder.device) for shape in shapes)
+            args += (torch.zeros(1, dtype=torch.long, device=decoder.device),) + states
+            input_names += ["offset"] + [f"state_{i}" for i in range(len(states))]
+            output_names += ["new_offset"] + [f"new_state_{i}" for i in range(len(states))]
+            for i in range(len(states)):
+                dynamic_axes[f"state_{i}"] = {0: "batch"}
+                dynamic_axes[f"new_state_{i}"] = {0: "batch"}
+        torch.onnx.export(
+            wrapper,
+            args,
+            output_path,
+            input_names=input_names,
+            output_names=output_names,
+            dynamic_axes=dynamic_axes,
+            opset_version=opset_version,
+            dynamo=False,
+        )
+    finally:
+        decoder.pre_transformer.config._attn_implementation = attn_implementation
+        decoder.train(was_training)
+    return output_path
+
+
+# numpy dtype of the float tensors of an exported decoder, see `export_decoder_to_onnx`
+_NUMPY_DTYPES = {"tensor(float)": np.float32, "tensor(float16)": np.float16}
+
+
+def _create_session(
+    model: Union[str, bytes, "onnxruntime.InferenceSession"],
+    providers: Optional[List[str]] = None,
+    intra_op_num_threads: Optional[int] = None,
+) -> "onnxruntime.InferenceSession":
+    if isinstance(model, onnxruntime.InferenceSession):
+        return model
+    option = onnxruntime.SessionOptions()
+    option.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+    if intra_op_num_threads is not None:
+        option.intra_op_num_threads = intra_op_num_threads
+    providers = providers or ["CPUExecutionProvider"]
+    return onnxruntime.InferenceSession(model, sess_options=option, providers=providers)
+
+
+class Qwen3TTSTokenizerV2OnnxDecoder:
+    """
+    Runs a full-form decoder exported by `export_decoder_to_onnx` with onnxruntime, numpy in and out.
+
+    Long sequences are decoded in chunks with left context exactly like `Qwen3TTSTokenizerV2Decoder.chunked_decode`.
+    """
+
+    def __init__(
+        self,
+        model: Union[str, bytes, "onnxruntime.InferenceSession"],
+        providers: Optional[List[str]] = None,
+        intra_op_num_threads: Optional[int] = None,
+        chunk_size: int = 300,
+        left_context_size: int = 25,
+    ):
+        self.session = _create_session(model, providers, intra_op_num_threads)
+        self.wav_dtype = _NUMPY_DTYPES[self.session.get_outputs()[0].type]
+        self.chunk_size = chunk_size
+        self.left_context_size = left_context_size
+
+    def decode(self, codes: np.ndarray) -> np.ndarray:
+        """
+        Args:
+            codes (`np.ndarray` of shape `(batch_size, num_quantizers, codes_length)`): integer codes.
+
+        Returns:
+            `np.ndarray` of shape `(batch_size, 1, codes_length * total_upsample)`.
+        """
+        codes = np.asarray(codes, dtype=np.int64)
+        if codes.shape[-1] == 0:
+            return np.zeros((codes.shape[0], 1, 0), dtype=self.wav_dtype)
+        wavs = []
+        start_index = 0
+        while start_index < codes.shape[-1]:
+            end_index = min(start_index + self.chunk_size, codes.shape[-1])
+            context_size = self.left_context_size if start_index - self.left_context_size > 0 else start_index
+            codes_chunk = codes[..., start_index - context_size : end_index]
+            wav_chunk = self.session.run(["wav"], {"codes": codes_chunk})[0]
+            upsample = wav_chunk.shape[-1] // codes_chunk.shape[-1]
+            wavs.append(wav_chunk[..., context_size * upsample :])
+            start_index = end_index
+        return np.concatenate(wavs, axis=-1)
+
+
+class Qwen3TTSTokenizerV2OnnxStreamingDecoder:
+    """
+    Runs a streaming-form decoder exported by `export_decoder_to_onnx(..., streaming=True)` with onnxruntime.
+
+    Same interface as `Qwen3TTSTokenizerV2StreamingDecoder`, but with numpy arrays: every `decode()` call on N new
+    frames returns the next N * total_upsample samples.
+    """
+
+    def __init__(
+        self,
+        model: Union[str, bytes, "onnxruntime.InferenceSession"],
+        providers: Optional[List[str]] = None,
+        intra_op_num_threads: Optional[int] = None,
+    ):
+        self.session = _create_session(model, providers, intra_op_num_threads)
+        self.state_inputs = [i for i in self.session.get_inputs() if i.name.startswith("state_")]
+        self.output_names = [o.name for o in self.session.get_outputs()]
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Drop all state, the next `decode()` starts a new stream.
+        """
+        self.offset = np.zeros(1, dtype=np.int64)
+        self.states = None
+
+    def _initial_states(self, batch_size: int) -> List[np.ndarray]:
+        states = []
+        for state in self.state_inputs:
+            states.append(np.zeros((batch_size, *state.shape[1:]), dtype=_NUMPY_DTYPES[state.type]))
+        return states
+
+    def decode(self, codes: np.ndarray) -> np.ndarray:
+        """
+        Args:
+            codes (`np.ndarray` of shape `(batch_size, num_quantizers, num_new_frames)`):
+                New codec frames. The batch size must stay the same for the whole stream.
+
+        Returns:
+            `np.ndarray` of shape `(batch_size, 1, num_new_frames * total_upsample)`.
+        """
+        codes = np.asarray(codes, dtype=np.int64)
+        if self.states is None:
+            self.states = self._initial_states(codes.shape[0])
+        feed = {"codes": codes, "offset": self.offset}
+        feed.update({state.name: value for state, value in zip(self.state_inputs, self.states)})
+        outputs = self.session.run(self.output_names, feed)
+        self.offset = outputs[1]
+        self.states = outputs[2:]
+        return outputs[0]
+
+
+__all__ = [
+    "export_decoder_to_onnx",
+    "Qwen3TTSTokenizerV2OnnxDecoder",
+    "Qwen3TTSTokenizerV2OnnxStreamingDecoder",
+]
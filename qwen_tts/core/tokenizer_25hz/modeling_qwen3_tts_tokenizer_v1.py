@@ -16,7 +16,7 @@
 
 import math
 from dataclasses import dataclass
-from typing import Optional, Union, List
+from typing import Optional, Union, List, Tuple
 
 import numpy as np
 import torch
@@ -29,8 +29,10 @@ from transformers.utils.hub import cached_file
 
 from torch.nn.utils.rnn import pad_sequence
 
+from ..utils import trailing_code_lengths
 from .vq.whisper_encoder import get_mel_audio, get_T_after_cnn
 from .vq.speech_vq import WhisperEncoderVQ, XVectorExtractor
+from .ode_solvers import get_ode_solver
 
 from .configuration_qwen3_tts_tokenizer_v1 import (
     Qwen3TTSTokenizerV1Config,
@@ -426,34 +428,56 @@ class ECAPA_TimeDelayNet(torch.nn.Module):
 class DiTInputEmbedding(nn.Module):
     def __init__(self, config: Qwen3TTSTokenizerV1DecoderBigVGANConfig):
         super().__init__()
+        self.mel_dim = config.mel_dim
         self.proj = nn.Linear(
             config.mel_dim + config.enc_dim + config.enc_emb_dim + config.emb_dim,
             config.hidden_size,
         )
         self.spk_encoder = ECAPA_TimeDelayNet(config)
 
-    def forward(
+    def embed_conditioning(
         self,
-        hidden_states: torch.Tensor,
         speaker_embedding: torch.Tensor,
         condition_vector: torch.Tensor,
         code_embed: torch.Tensor,
         drop_audio_cond: Optional[bool] = False,
         code_embed_uncond: Optional[bool] = None,
         apply_cfg: Optional[bool] = True,
-    ):
+    ) -> torch.Tensor:
+        """
+        Projection of the conditioning inputs (reference mel through `spk_encoder`, code and speaker embeddings),
+        including `proj.bias`. It does not depend on the noised input, so `forward` only has to add the projection
+        of `hidden_states` to it.
+        """
         if apply_cfg:
-            hidden_states = torch.cat([hidden_states, hidden_states], dim=0)
             speaker_embedding = torch.cat([speaker_embedding, torch.zeros_like(speaker_embedding)], dim=0)
             condition_vector = torch.cat([condition_vector, torch.zeros_like(condition_vector)], dim=0)
             code_embed = torch.cat([code_embed, code_embed_uncond], dim=0)
         elif drop_audio_cond:  # cfg for cond audio
             condition_vector = torch.zeros_like(condition_vector)
             speaker_embedding = torch.zeros_like(speaker_embedding)
-        condition_vector = self.spk_encoder(condition_vector).unsqueeze(1).repeat(1, hidden_states.size(1), 1)
-        hidden_states = self.proj(torch.cat((hidden_states, condition_vector, code_embed, speaker_embedding), dim=-1))
+        condition_vector = self.spk_encoder(condition_vector).unsqueeze(1).repeat(1, code_embed.size(1), 1)
+        conditioning = torch.cat((condition_vector, code_embed, speaker_embedding), dim=-1)
+        return F.linear(conditioning, self.proj.weight[:, self.mel_dim :], self.proj.bias)
 
-        return hidden_states
+    def forward(
+        self,
+        hidden_states: torch.Tensor,
+        speaker_embedding: Optional[torch.Tensor] = None,
+        condition_vector: Optional[torch.Tensor] = None,
+        code_embed: Optional[torch.Tensor] = None,
+        drop_audio_cond: Optional[bool] = False,
+        code_embed_uncond: Optional[bool] = None,
+        apply_cfg: Optional[bool] = True,
+        conditioning: Optional[torch.Tensor] = None,
+    ):
+        if conditioning is None:
+            conditioning = self.embed_conditioning(
+                speaker_embedding, condition_vector, code_embed, drop_audio_cond, code_embed_uncond, apply_cfg
+            )
+        if apply_cfg:
+            hidden_states = torch.cat([hidden_states, hidden_states], dim=0)
+        return F.linear(hidden_states, self.proj.weight[:, : self.mel_dim]) + conditioning
 
 
 # Transformer backbone using DiT blocks
@@ -567,6 +591,50 @@ def apply_rotary_pos_emb(q, k, cos, sin, position_ids=None, unsqueeze_dim=1):
     return q_embed, k_embed
 
 
+def block_sparse_attention(query, key, value, block_size, look_backward_block=0, look_ahead_block=0):
+    """
+    Attention where the queries of block `i` (`block_size` consecutive positions) only attend to the keys of blocks
+    `i - look_backward_block` to `i + look_ahead_block`. Equivalent to dense attention with the mask
+    `-look_backward_block <= block_j - block_i <= look_ahead_block`, but only the permitted block pairs are computed,
+    so time and memory grow linearly with the sequence length.
+
+    Args:
+        query, key, value (`torch.Tensor` of shape `(batch_size, num_heads, seq_len, head_dim)`)
+
+    Returns:
+        `torch.Tensor` of shape `(batch_size, seq_len, num_heads, head_dim)`, like the attention interfaces.
+    """
+    batch_size, num_heads, seq_len, head_dim = query.shape
+    num_blocks = -(-seq_len // block_size)
+    pad = num_blocks * block_size - seq_len
+    window = look_backward_block + 1 + look_ahead_block
+
+    def to_blocks(x):
+        return F.pad(x, (0, 0, 0, pad)).view(batch_size, num_heads, num_blocks, block_size, head_dim)
+
+    # neighbourhood of block i: blocks i - look_backward_block .. i + look_ahead_block, zero padded at the edges
+    query = to_blocks(query)
+    key = F.pad(to_blocks(key), (0, 0, 0, 0, look_backward_block, look_ahead_block))
+    value = F.pad(to_blocks(value), (0, 0, 0, 0, look_backward_block, look_ahead_block))
+    key = torch.cat([key[:, :, i : i + num_blocks] for i in range(window)], dim=3)
+    value = torch.cat([value[:, :, i : i + num_blocks] for i in range(window)], dim=3)
+
+    # keys outside the sequence (edge blocks and the padding of the last block) are masked out
+    valid = torch.arange(-look_backward_block * block_size, (num_blocks + look_ahead_block) * block_size, device=query.device)
+    valid = ((valid >= 0) & (valid < seq_len)).view(num_blocks + window - 1, block_size)
+    valid = torch.cat([valid[i : i + num_blocks] for i in range(window)], dim=1)
+    attn_mask = valid[None, :, None, :].expand(num_heads, -1, -1, -1).reshape(1, num_heads * num_blocks, 1, -1)
+
+    output = F.scaled_dot_product_attention(
+        query.reshape(batch_size, num_heads * num_blocks, block_size, head_dim),
+        key.reshape(batch_size, num_heads * num_blocks, window * block_size, head_dim),
+        value.reshape(batch_size, num_heads * num_blocks, window * block_size, head_dim),
+        attn_mask=attn_mask,
+    )
+    output = output.view(batch_size, num_heads, num_blocks * block_size, head_dim)[:, :, :seq_len]
+    return output.transpose(1, 2)
+
+
 class DiTAttention(nn.Module):
     def __init__(self, config: Qwen3TTSTokenizerV1DecoderBigVGANConfig):
         super().__init__()
@@ -589,6 +657,7 @@ class DiTAttention(nn.Module):
         hidden_states,  # noised input x
         position_embeddings=None,  # rotary position embedding for x
         attention_mask=None,
+        block_window=None,  # (look_backward_block, look_ahead_block) for block-sparse attention
     ) -> torch.Tensor:
         batch_size = hidden_states.shape[0]
 
@@ -609,15 +678,18 @@ class DiTAttention(nn.Module):
         cos, sin = position_embeddings
         query, key = apply_rotary_pos_emb(query, key, cos, sin)
 
-        attention_interface = ALL_ATTENTION_FUNCTIONS[self.config._attn_implementation]
-        attention_weights, _ = attention_interface(
-            self,
-            query,
-            key,
-            value,
-            attention_mask=attention_mask,
-            is_causal=False,
-        )
+        if block_window is not None:
+            attention_weights = block_sparse_attention(query, key, value, self.config.block_size, *block_window)
+        else:
+            attention_interface = ALL_ATTENTION_FUNCTIONS[self.config._attn_implementation]
+            attention_weights, _ = attention_interface(
+                self,
+                query,
+                key,
+                value,
+                attention_mask=attention_mask,
+                is_causal=False,
+            )
 
         # mask. e.g. inference got a batch with different target durations, mask out the padding
         attention_weights = attention_weights.reshape(batch_size, -1, self.heads * head_dim)
@@ -672,17 +744,26 @@ class DiTDecoderLayer(nn.Module):
         self.ff = DiTMLP(dim=config.hidden_size, mult=config.ff_mult, dropout=config.dropout)
 
     def forward(
-        self, hidden_states, timestep, position_embeddings=None, block_diff=None
+        self, hidden_states, timestep, position_embeddings=None, block_diff=None, attention_mask=None
     ):  # x: noised input, t: time embedding
         # pre-norm & modulation for attention input
         norm, gate_msa, shift_mlp, scale_mlp, gate_mlp = self.attn_norm(hidden_states, emb=timestep)
 
+        # without a dense mask / block_diff, only the permitted block pairs are computed
+        block_window = None
+        if attention_mask is None and block_diff is not None:
+            attention_mask = (block_diff >= -float(self.look_backward_block)) & (
+                block_diff <= float(self.look_ahead_block)
+            )
+        elif attention_mask is None:
+            block_window = (self.look_backward_block, self.look_ahead_block)
+
         # attention
         attn_output = self.attn(
             hidden_states=norm,
             position_embeddings=position_embeddings,
-            attention_mask=(block_diff >= -float(self.look_backward_block))
-            & (block_diff <= float(self.look_ahead_block)),
+            attention_mask=attention_mask,
+            block_window=block_window,
         )
 
         # process attention output for input x
@@ -833,6 +914,16 @@ class DownSample1d(nn.Module):
 
 
 class TorchActivation1d(nn.Module):
+    """
+    Anti-aliased activation: `downsample(act(upsample(x)))`.
+
+    With equal up / down ratios it runs fused in polyphase form. The upsampled signal is never interleaved: each of
+    its `ratio` phases is computed from the input by a depthwise convolution, passed through the activation (which
+    must act pointwise per channel, like `SnakeBeta`), and filtered by its share of the decimating low-pass. This
+    skips the zero-stuffed transposed convolution and the full-rate padded copies, and matches the unfused chain
+    including the replicate padding at the edges.
+    """
+
     def __init__(
         self,
         activation,
@@ -847,13 +938,76 @@ class TorchActivation1d(nn.Module):
         self.act = activation
         self.upsample = UpSample1d(up_ratio, up_kernel_size)
         self.downsample = DownSample1d(down_ratio, down_kernel_size)
+        self.fused = up_ratio == down_ratio and self.upsample.kernel_size % up_ratio == 0
+        self._polyphase_weights = {}
+
+    def polyphase_weights(self, channels, device, dtype):
+        """
+        Depthwise filters of the fused form, cached per (channels, device, dtype).
+
+        Returns:
+            `(up_weights, up_padding, down_weights, down_padding)`: phase `p` of the upsampled signal is
+            `conv1d(pad(x, up_padding), up_weights[p])`, and the output is the sum over phases of
+            `conv1d(pad(phase_p, down_padding), down_weights[p])`.
+        """
+        key = (channels, device, dtype)
+        if key not in self._polyphase_weights:
+            ratio = self.upsample.ratio
+            taps = self.upsample.kernel_size // ratio
+            up_filter = self.upsample.filter[0, 0].float().cpu()
+            down_filter = self.downsample.filter[0, 0].float().cpu()
+
+            # upsampled[ratio * m + p] = sum_k up_phases[p][k] * x[m + up_offsets[p] + k]
+            up_phases, up_offsets = [], []
+            for phase in range(ratio):
+                shift, tap = divmod(phase + self.upsample.pad_left, ratio)
+                up_phases.append(ratio * up_filter[tap::ratio].flip(0))
+                up_offsets.append(shift - (taps - 1) - self.upsample.pad)
+            first = min(up_offsets)
+            up_weights = torch.zeros(ratio, max(up_offsets) - first + taps)
+            for phase, (offset, phase_filter) in enumerate(zip(up_offsets, up_phases)):
+                up_weights[phase, offset - first : offset - first + taps] = phase_filter
+            up_padding = (-first, max(up_offsets) + taps - 1)
+
+            # out[m] = sum_k down_filter[k] * upsampled[ratio * m + k - pad_left], i.e. phase (k - pad_left) % ratio
+            # at offset (k - pad_left) // ratio
+            down_offsets = [(k - self.downsample.pad_left) // ratio for k in range(down_filter.shape[0])]
+            first = min(down_offsets)
+            down_weights = torch.zeros(ratio, max(down_offsets) - first + 1)
+            for k, offset in enumerate(down_offsets):
+                down_weights[(k - self.downsample.pad_left) % ratio, offset - first] = down_filter[k]
+            down_padding = (-first, max(down_offsets))
+
+            def per_channel(weights):
+                return [w.view(1, 1, -1).repeat(channels, 1, 1).to(device=device, dtype=dtype) for w in weights]
+
+            self._polyphase_weights[key] = (per_channel(up_weights), up_padding, per_channel(down_weights), down_padding)
+        return self._polyphase_weights[key]
 
     def forward(self, hidden_states):
-        hidden_states = self.upsample(hidden_states)
-        hidden_states = self.act(hidden_states)
-        hidden_states = self.downsample(hidden_states)
+        if not self.fused:
+            hidden_states = self.upsample(hidden_states)
+            hidden_states = self.act(hidden_states)
+            hidden_states = self.downsample(hidden_states)
+            return hidden_states
 
-        return hidden_states
+        channels = hidden_states.shape[1]
+        up_weights, up_padding, down_weights, down_padding = self.polyphase_weights(
+            channels, hidden_states.device, hidden_states.dtype
+        )
+
+        hidden_states = F.pad(hidden_states, up_padding, mode="replicate")
+        phases = [self.act(F.conv1d(hidden_states, weight, groups=channels)) for weight in up_weights]
+
+        # replicate padding of the upsampled signal: its first sample is the first of phase 0, its last sample the
+        # last of the last phase
+        left = phases[0][..., :1].expand(-1, -1, down_padding[0])
+        right = phases[-1][..., -1:].expand(-1, -1, down_padding[1])
+        output = None
+        for phase, weight in zip(phases, down_weights):
+            filtered = F.conv1d(torch.cat([left, phase, right], dim=-1), weight, groups=channels)
+            output = filtered if output is None else output + filtered
+        return output
 
 
 class CausalConv1d(nn.Conv1d):
@@ -1067,6 +1221,28 @@ class Qwen3TTSTokenizerV1DecoderBigVGANModel(Qwen3TTSTokenizerV1DecoderPreTraine
         return torch.clamp(output_waveform, min=-1.0, max=1.0).squeeze(1)
 
 
+def randn_tensor(
+    shape,
+    generator: Optional[Union[torch.Generator, List[torch.Generator]]] = None,
+    device: Optional[torch.device] = None,
+    dtype: Optional[torch.dtype] = None,
+) -> torch.Tensor:
+    """
+    Standard normal noise of `shape` on `device`. `generator` may be one generator for the whole batch or a list with
+    one generator per batch item. Noise from a generator on another device (e.g. a CPU generator for CUDA decoding)
+    is drawn on the generator's device and then moved.
+    """
+    if isinstance(generator, (list, tuple)):
+        if len(generator) != shape[0]:
+            raise ValueError(f"Got {len(generator)} generators for a batch of {shape[0]}.")
+        return torch.cat(
+            [randn_tensor((1, *shape[1:]), generator=g, device=device, dtype=dtype) for g in generator], dim=0
+        )
+    if generator is not None and generator.device.type != torch.device(device).type:
+        return torch.randn(shape, generator=generator, device=generator.device, dtype=dtype).to(device)
+    return torch.randn(shape, generator=generator, device=device, dtype=dtype)
+
+
 @auto_docstring
 class Qwen3TTSTokenizerV1DecoderDiTModel(Qwen3TTSTokenizerV1DecoderPreTrainedModel):
     config: Qwen3TTSTokenizerV1DecoderDiTConfig
@@ -1101,38 +1277,26 @@ class Qwen3TTSTokenizerV1DecoderDiTModel(Qwen3TTSTokenizerV1DecoderPreTrainedMod
         self.norm_out = AdaLayerNormZero_Final(config.hidden_size)  # final modulation
         self.proj_out = nn.Linear(config.hidden_size, config.mel_dim)
 
-    def _create_block_diff(self, hidden_states):
-        batch, seq_len = hidden_states.shape[0], hidden_states.shape[1]
-        block_indices = torch.arange(seq_len, device=hidden_states.device) // self.block_size  # [seq_length]
-
-        block_i = block_indices.unsqueeze(1)  # [seq_length, 1]
-        block_j = block_indices.unsqueeze(0)  # [1, seq_length]
-        block_diff = block_j - block_i  # (n, n)
-
-        return block_diff.expand(batch, self.num_attention_heads, seq_len, seq_len)
-
-    def forward(
+    def prepare_conditioning(
         self,
-        hidden_states,
         condition_vector,
         speaker_embedding,
         quantized_code,
-        time_step,
         drop_audio_conditioning=False,
         drop_code=False,
         apply_cfg=True,
     ):
-        batch_size = hidden_states.shape[0] * 2
-        if time_step.ndim == 0:
-            time_step = time_step.repeat(batch_size)
+        """
+        Compute the parts of `forward` that do not depend on the noised input or the time step: the speaker
+        encoder output and code embeddings (already projected by the input embedding) and the rotary embeddings.
+        `sample` computes them once and reuses them for every ODE step.
 
-        # Compute embeddings
-        time_embedding = self.time_embed(time_step)
+        Returns:
+            dict: Pass as `conditioning=` to `forward`, together with the same `apply_cfg`.
+        """
         text_embedding = self.text_embed(quantized_code, drop_code=False if apply_cfg else drop_code)
         text_embedding_unconditioned = self.text_embed(quantized_code, drop_code=True) if apply_cfg else None
-
-        hidden_states = self.input_embed(
-            hidden_states,
+        input_conditioning = self.input_embed.embed_conditioning(
             speaker_embedding,
             condition_vector,
             text_embedding,
@@ -1141,17 +1305,51 @@ class Qwen3TTSTokenizerV1DecoderDiTModel(Qwen3TTSTokenizerV1DecoderPreTrainedMod
             apply_cfg=apply_cfg,
         )
 
-        # Compute positional encodings
-        position_embeddings = self.rotary_embed(hidden_states)
-        blockwise_difference = self._create_block_diff(hidden_states)
+        position_embeddings = self.rotary_embed(input_conditioning)
+
+        return {
+            "input_conditioning": input_conditioning,
+            "position_embeddings": position_embeddings,
+        }
+
+    def forward(
+        self,
+        hidden_states,
+        condition_vector=None,
+        speaker_embedding=None,
+        quantized_code=None,
+        time_step=None,
+        drop_audio_conditioning=False,
+        drop_code=False,
+        apply_cfg=True,
+        conditioning=None,
+    ):
+        batch_size = hidden_states.shape[0] * 2 if apply_cfg else hidden_states.shape[0]
+        if time_step.ndim == 0:
+            time_step = time_step.repeat(batch_size)
+
+        if conditioning is None:
+            conditioning = self.prepare_conditioning(
+                condition_vector,
+                speaker_embedding,
+                quantized_code,
+                drop_audio_conditioning=drop_audio_conditioning,
+                drop_code=drop_code,
+                apply_cfg=apply_cfg,
+            )
 
-        # Transformer blocks
+        # Compute embeddings
+        time_embedding = self.time_embed(time_step)
+        hidden_states = self.input_embed(
+            hidden_states, apply_cfg=apply_cfg, conditioning=conditioning["input_conditioning"]
+        )
+
+        # Transformer blocks, with block-sparse attention over each layer's look-back / look-ahead window
         for transformer_block in self.transformer_blocks:
             hidden_states = transformer_block(
                 hidden_states,
                 time_embedding,
-                position_embeddings=position_embeddings,
-                block_diff=blockwise_difference,
+                position_embeddings=conditioning["position_embeddings"],
             )
 
         hidden_states = self.norm_out(hidden_states, time_embedding)
@@ -1177,50 +1375,106 @@ class Qwen3TTSTokenizerV1DecoderDiTModel(Qwen3TTSTokenizerV1DecoderPreTrainedMod
         num_steps=10,
         guidance_scale=0.5,
         sway_coefficient=-1.0,
+        generator=None,
+        noise=None,
+        solver="euler",
+        timesteps=None,
+        guidance_interval=None,
+        reuse_guidance=False,
     ):
-        noise_initialization = torch.randn([quantized_code.shape[0], 30000, self.mel_dim], dtype=reference_mel_spectrogram.dtype)
+        """
+        Generate mel spectrograms from codes by integrating the DiT flow from noise (t = 0) to mel (t = 1).
+
+        Args:
+            num_steps (`int`):
+                Number of time points; the ODE takes `num_steps - 1` steps.
+            sway_coefficient (`float`, *optional*):
+                Sway sampling of the time points, `t + s * (cos(pi / 2 * t) - 1 + t)`; negative values spend more
+                steps near the noise. `None` keeps them uniform.
+            solver (`str`):
+                ODE solver, one of `ode_solvers.ODE_SOLVERS`: `"euler"`, `"midpoint"`, `"heun"`, `"rk4"` or
+                `"multistep"`. See `ode_solvers.ODE_SOLVER_EVALS` for the DiT passes each takes per step.
+            timesteps (`torch.Tensor` of shape `(num_points,)`, *optional*):
+                Increasing time points from 0 to 1, overriding `num_steps` and `sway_coefficient`.
+            guidance_interval (`Tuple[float, float]`, *optional*):
+                Apply classifier-free guidance only at time points `lo <= t <= hi`, e.g. `(0.0, 0.5)` for the early,
+                high-noise steps. The other steps run one conditional DiT pass instead of a conditional and an
+                unconditional one. `None` guides every step.
+            reuse_guidance (`bool`):
+                Outside `guidance_interval`, add the guidance term `guided - unconditional` of the last guided step
+                instead of dropping it. It costs no DiT pass and stays close to full guidance.
+            generator (`torch.Generator` or `List[torch.Generator]`, *optional*):
+                Generator(s) for the initial noise, one for the batch or one per batch item, for reproducible
+                output. Defaults to the global RNG of the code device.
+            noise (`torch.Tensor` of shape `(batch_size, codes_length * repeats, mel_dim)`, *optional*):
+                Initial noise to use instead of drawing it, e.g. a slice of the noise of a longer utterance.
+        """
+        ode_solver = get_ode_solver(solver)
+        if guidance_interval is not None and guidance_interval[0] > guidance_interval[1]:
+            raise ValueError(f"guidance_interval must be (lo, hi) with lo <= hi, got {guidance_interval}")
         maximum_duration = quantized_code.shape[1] * self.repeats
-        initial_state = noise_initialization[:, :maximum_duration].to(quantized_code.device)
+        if noise is not None:
+            initial_state = noise.to(device=quantized_code.device, dtype=reference_mel_spectrogram.dtype)
+        else:
+            initial_state = randn_tensor(
+                (quantized_code.shape[0], maximum_duration, self.mel_dim),
+                generator=generator,
+                device=quantized_code.device,
+                dtype=reference_mel_spectrogram.dtype,
+            )
         conditioning_vector = conditioning_vector.unsqueeze(1).repeat(1, maximum_duration, 1)
 
+        # the reference mel, speaker embedding and codes are the same for every ODE step
+        conditioning = self.prepare_conditioning(
+            reference_mel_spectrogram, conditioning_vector, quantized_code, apply_cfg=True
+        )
+        # the conditional half of the batch, for steps without guidance
+        batch_size = quantized_code.shape[0]
+        conditional = {
+            "input_conditioning": conditioning["input_conditioning"][:batch_size],
+            "position_embeddings": tuple(emb[:batch_size] for emb in conditioning["position_embeddings"]),
+        }
+        guidance = None  # guided - unconditional prediction of the last guided step
+
         def ode_function(time_step, hidden_states):
-            if guidance_scale < 1e-5:
+            nonlocal guidance
+            guided_step = guidance_scale >= 1e-5 and (
+                guidance_interval is None or guidance_interval[0] <= float(time_step) <= guidance_interval[1]
+            )
+            if not guided_step:
                 prediction = self(
                     hidden_states=hidden_states,
-                    speaker_embedding=conditioning_vector,
-                    condition_vector=reference_mel_spectrogram,
-                    quantized_code=quantized_code,
                     time_step=time_step,
-                    drop_audio_conditioning=False,
-                    drop_code=False,
+                    apply_cfg=False,
+                    conditioning=conditional,
                 )
+                if reuse_guidance and guidance is not None and guidance_scale >= 1e-5:
+                    prediction = prediction + guidance * guidance_scale
                 return prediction
 
             model_output = self(
                 hidden_states=hidden_states,
-                quantized_code=quantized_code,
-                speaker_embedding=conditioning_vector,
-                condition_vector=reference_mel_spectrogram,
                 time_step=time_step,
                 apply_cfg=True,
+                conditioning=conditioning,
             )
             guided_prediction, null_prediction = torch.chunk(model_output, 2, dim=0)
+            guidance = guided_prediction - null_prediction
 
-            return guided_prediction + (guided_prediction - null_prediction) * guidance_scale
+            return guided_prediction + guidance * guidance_scale
 
-        initial_time = 0
-        time_embedding = torch.linspace(
-            initial_time, 1, num_steps, device=quantized_code.device, dtype=conditioning_vector.dtype
-        )
+        if timesteps is not None:
+            time_embedding = torch.as_tensor(timesteps, device=quantized_code.device, dtype=conditioning_vector.dtype)
+        else:
+            initial_time = 0
+            time_embedding = torch.linspace(
+                initial_time, 1, num_steps, device=quantized_code.device, dtype=conditioning_vector.dtype
+            )
 
-        if sway_coefficient is not None:
-            time_embedding += sway_coefficient * (torch.cos(torch.pi / 2 * time_embedding) - 1 + time_embedding)
+            if sway_coefficient is not None:
+                time_embedding += sway_coefficient * (torch.cos(torch.pi / 2 * time_embedding) - 1 + time_embedding)
 
-        values = initial_state.clone()
-        for t0, t1 in zip(time_embedding[:-1], time_embedding[1:]):
-            dt = t1 - t0
-            vt = ode_function(t0, values)
-            values = values + vt * dt
+        values = ode_solver(ode_function, initial_state, time_embedding)
 
         generated_mel_spectrogram = values.permute(0, 2, 1)
         return generated_mel_spectrogram
@@ -1261,6 +1515,10 @@ class Qwen3TTSTokenizerV1Decoder(Qwen3TTSTokenizerV1DecoderPreTrainedModel):
         num_steps=10,
         guidance_scale=0.5,
         sway_coefficient=-1.0,
+        generator=None,
+        solver="euler",
+        guidance_interval=None,
+        reuse_guidance=False,
         **kwargs,
     ):
         """Generates a waveform from input code and conditioning parameters."""
@@ -1272,12 +1530,111 @@ class Qwen3TTSTokenizerV1Decoder(Qwen3TTSTokenizerV1DecoderPreTrainedModel):
             num_steps=num_steps,
             guidance_scale=guidance_scale,
             sway_coefficient=sway_coefficient,
+            generator=generator,
+            solver=solver,
+            guidance_interval=guidance_interval,
+            reuse_guidance=reuse_guidance,
         )
 
         waveform = self.bigvgan(mel_spectrogram)
 
         return waveform
 
+    @torch.no_grad()
+    def chunked_decode(
+        self,
+        code,
+        conditioning,
+        reference_mel,
+        chunk_size=48,
+        left_context_blocks=None,
+        right_context_blocks=None,
+        vocoder_context=16,
+        crossfade=4,
+        num_steps=10,
+        guidance_scale=0.5,
+        sway_coefficient=-1.0,
+        generator=None,
+        solver="euler",
+        guidance_interval=None,
+        reuse_guidance=False,
+    ):
+        """
+        Decode chunk by chunk and yield the waveform as it is produced, with latency and memory bounded by the chunk
+        size instead of the utterance length.
+
+        The DiT only attends within a few blocks per layer, so each chunk of `chunk_size` codes is sampled over a
+        window extended by `left_context_blocks` / `right_context_blocks` DiT blocks, aligned to the block grid of
+        the full utterance and using the same initial noise. The accepted mel is vocoded by BigVGAN with
+        `vocoder_context` mel frames of context on each side (the look-ahead comes from the DiT window's right
+        context), and consecutive waveform chunks are cross-faded over `crossfade` mel frames.
+
+        The context defaults to the receptive field of one DiT pass: the number of look-back / look-ahead layers.
+        The ODE repeats the pass `num_steps` times, so the result approaches `forward` as the context grows.
+
+        Args:
+            code (`torch.LongTensor` of shape `(batch_size, codes_length)`)
+            conditioning (`torch.FloatTensor` of shape `(batch_size, xvector_dim)`)
+            reference_mel (`torch.FloatTensor` of shape `(batch_size, mel_length, mel_dim)`)
+            chunk_size (`int`): Codes per chunk, a multiple of `block_size / repeats`.
+            generator (`torch.Generator` or `List[torch.Generator]`, *optional*): See `sample`.
+            solver (`str`), guidance_interval (`Tuple[float, float]`, *optional*), reuse_guidance (`bool`):
+                ODE solver and guidance schedule, see `sample`.
+
+        Yields:
+            `torch.FloatTensor` of shape `(batch_size, chunk_samples)`; concatenated they have the length of the
+            `forward` output.
+        """
+        dit = self.dit
+        repeats, block_size = dit.repeats, dit.block_size
+        chunk = chunk_size * repeats
+        if chunk <= 0 or chunk % block_size:
+            raise ValueError(f"chunk_size must be a positive multiple of {block_size // repeats} codes, got {chunk_size}")
+        if left_context_blocks is None:
+            left_context_blocks = sum(block.look_backward_block for block in dit.transformer_blocks)
+        if right_context_blocks is None:
+            right_context_blocks = sum(block.look_ahead_block for block in dit.transformer_blocks)
+        left, right = left_context_blocks * block_size, right_context_blocks * block_size
+        hop = int(np.prod(self.bigvgan.config.upsample_rates))
+
+        total = code.shape[1] * repeats
+        noise = randn_tensor(
+            (code.shape[0], total, dit.mel_dim), generator=generator, device=code.device, dtype=reference_mel.dtype
+        )
+
+        history = None  # accepted mel before the current chunk, left context of the vocoder
+        tail = None  # samples of the first `crossfade` frames of the current chunk, from the previous chunk
+        for start in range(0, total, chunk):
+            end = min(start + chunk, total)
+            window_start, window_end = max(start - left, 0), min(end + right, total)
+            mel = dit.sample(
+                conditioning,
+                reference_mel,
+                code[:, window_start // repeats : window_end // repeats],
+                num_steps=num_steps,
+                guidance_scale=guidance_scale,
+                sway_coefficient=sway_coefficient,
+                noise=noise[:, window_start:window_end],
+                solver=solver,
+                guidance_interval=guidance_interval,
+                reuse_guidance=reuse_guidance,
+            )
+            current = mel[..., start - window_start : end - window_start]
+            ahead = mel[..., end - window_start : min(end + vocoder_context, window_end) - window_start]
+            behind = history if history is not None else current[..., :0]
+
+            wav = self.bigvgan(torch.cat([behind, current, ahead], dim=-1))
+            body_start = behind.shape[-1] * hop
+            body_end = body_start + current.shape[-1] * hop
+            out = wav[..., body_start:body_end]
+            if tail is not None:
+                fade = min(tail.shape[-1], out.shape[-1])
+                weight = torch.linspace(0, 1, fade + 2, device=out.device, dtype=out.dtype)[1:-1]
+                out = torch.cat([tail[..., :fade] * (1 - weight) + out[..., :fade] * weight, out[..., fade:]], dim=-1)
+            tail = wav[..., body_end : body_end + min(crossfade, ahead.shape[-1]) * hop]
+            history = torch.cat([behind, current], dim=-1)[..., max(behind.shape[-1] + current.shape[-1] - vocoder_context, 0) :]
+            yield out
+
 
 class Qwen3TTSTokenizerV1Encoder(Qwen3TTSTokenizerV1EncoderPreTrainedModel):
     config: Qwen3TTSTokenizerV1EncoderConfig
@@ -1375,8 +1732,17 @@ class Qwen3TTSTokenizerV1Model(Qwen3TTSTokenizerV1PreTrainedModel):
 
         self.post_init()
     
-    def load_encoder_xvector_extractor(self, model_path):
-        self.encoder_xvector_extractor = XVectorExtractor(model_path)
+    def load_encoder_xvector_extractor(self, model_path, num_threads=1, max_padding_frames=0, feature_batch_size=None):
+        """
+        Load the CAM++ x-vector ONNX model. `num_threads` sets its onnxruntime intra-op threads; see
+        `XVectorExtractor` for the batching options.
+        """
+        self.encoder_xvector_extractor = XVectorExtractor(
+            model_path,
+            num_threads=num_threads,
+            max_padding_frames=max_padding_frames,
+            feature_batch_size=feature_batch_size,
+        )
     
     def get_model_type(self):
         return self.config.model_type
@@ -1407,6 +1773,8 @@ class Qwen3TTSTokenizerV1Model(Qwen3TTSTokenizerV1PreTrainedModel):
         revision="main",
         use_safetensors=None,
         weights_only=True,
+        xvector_num_threads=1,
+        xvector_max_padding_frames=0,
         **kwargs,
     ):
         model = super().from_pretrained(
@@ -1437,7 +1805,11 @@ class Qwen3TTSTokenizerV1Model(Qwen3TTSTokenizerV1PreTrainedModel):
         )
         if encoder_xvector_extractor_path is None:
             raise ValueError(f"""{pretrained_model_name_or_path}/{encoder_xvector_extractor_path} not exists""")
-        model.load_encoder_xvector_extractor(encoder_xvector_extractor_path)
+        model.load_encoder_xvector_extractor(
+            encoder_xvector_extractor_path,
+            num_threads=xvector_num_threads,
+            max_padding_frames=xvector_max_padding_frames,
+        )
 
         return model
 
@@ -1466,14 +1838,9 @@ class Qwen3TTSTokenizerV1Model(Qwen3TTSTokenizerV1PreTrainedModel):
         codes, codes_lens = self.encoder.quantize_speech(wavs)
         codes = [c[:l] for c, l in zip(codes, codes_lens)]
 
-        xvectors = []
-        ref_mels = []
-        for wav in wavs:
-            xvector, ref_mel = self.encoder_xvector_extractor.extract_code(wav.cpu().numpy())
-            xvector = torch.tensor(xvector).to(wav.dtype).to(wav.device)
-            ref_mel = torch.tensor(ref_mel).to(wav.dtype).to(wav.device)
-            xvectors.append(xvector)
-            ref_mels.append(ref_mel)
+        xvectors, ref_mels = self.encoder_xvector_extractor.extract_batch(wavs)
+        xvectors = [xvector.to(wav.dtype).to(wav.device) for xvector, wav in zip(xvectors, wavs)]
+        ref_mels = [ref_mel.to(wav.dtype).to(wav.device) for ref_mel, wav in zip(ref_mels, wavs)]
 
         if not return_dict:
             return (
@@ -1490,6 +1857,12 @@ class Qwen3TTSTokenizerV1Model(Qwen3TTSTokenizerV1PreTrainedModel):
         xvectors: torch.Tensor,
         ref_mels: torch.Tensor,
         return_dict: Optional[bool] = None,
+        audio_lengths: Optional[torch.LongTensor] = None,
+        generator: Optional[Union[torch.Generator, List[torch.Generator]]] = None,
+        num_steps: int = 10,
+        solver: str = "euler",
+        guidance_interval: Optional[Tuple[float, float]] = None,
+        reuse_guidance: bool = False,
     ) -> Union[tuple[torch.Tensor, torch.Tensor], Qwen3TTSTokenizerV1DecoderOutput]:
         """
         Decodes the given frames into an output audio waveform.
@@ -1506,15 +1879,34 @@ class Qwen3TTSTokenizerV1Model(Qwen3TTSTokenizerV1PreTrainedModel):
                 Reference mel spectrogram computed using `model.encode`.
             return_dict (`bool`, *optional*):
                 Whether or not to return a [`~utils.ModelOutput`] instead of a plain tuple.
+            audio_lengths (`torch.LongTensor` of shape `(batch_size,)`, *optional*):
+                Number of valid codes per item. Defaults to everything up to the last non-zero code.
+            generator (`torch.Generator` or `List[torch.Generator]`, *optional*):
+                Generator(s) for the DiT initial noise, one for the batch or one per item, for reproducible output.
+            num_steps (`int`):
+                Number of DiT ODE time points.
+            solver (`str`):
+                DiT ODE solver: `"euler"`, `"midpoint"`, `"heun"`, `"rk4"` or `"multistep"`.
+            guidance_interval (`Tuple[float, float]`, *optional*):
+                Time interval of the DiT ODE with classifier-free guidance; other steps take one conditional pass.
+            reuse_guidance (`bool`):
+                Outside `guidance_interval`, reuse the guidance term of the last guided step.
 
         """
         return_dict = return_dict if return_dict is not None else self.config.return_dict
 
         audio_values = self.decoder(code=audio_codes,
                                     reference_mel=ref_mels,
-                                    conditioning=xvectors)
+                                    conditioning=xvectors,
+                                    generator=generator,
+                                    num_steps=num_steps,
+                                    solver=solver,
+                                    guidance_interval=guidance_interval,
+                                    reuse_guidance=reuse_guidance)
         
-        audio_lengths = (audio_codes > 0).sum(1) * self.decode_upsample_rate
+        if audio_lengths is None:
+            audio_lengths = trailing_code_lengths(audio_codes)
+        audio_lengths = audio_lengths * self.decode_upsample_rate
         audio_values = [a[:l] for a, l in zip(audio_values, audio_lengths)]
 
         if not return_dict:
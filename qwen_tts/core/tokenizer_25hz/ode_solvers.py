@@ -0,0 +1,104 @@
+# coding=utf-8
+# Copyright 2026 The Alibaba Qwen team.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+ODE solvers for the flow-matching DiT of the 25Hz tokenizer.
+
+The DiT predicts the velocity of the flow from noise (t = 0) to mel (t = 1). Every solver integrates
+`velocity(t, x)` over an increasing time grid and returns the state at the last time point. The solvers
+differ in the number of velocity evaluations (DiT forward passes) per step, see `ODE_SOLVER_EVALS`.
+"""
+from typing import Callable, Dict
+
+import torch
+
+Velocity = Callable[[torch.Tensor, torch.Tensor], torch.Tensor]
+
+
+def euler(velocity: Velocity, x: torch.Tensor, timesteps: torch.Tensor) -> torch.Tensor:
+    """First order, one evaluation per step."""
+    for t0, t1 in zip(timesteps[:-1], timesteps[1:]):
+        x = x + velocity(t0, x) * (t1 - t0)
+    return x
+
+
+def midpoint(velocity: Velocity, x: torch.Tensor, timesteps: torch.Tensor) -> torch.Tensor:
+    """Explicit midpoint method: second order, two evaluations per step."""
+    for t0, t1 in zip(timesteps[:-1], timesteps[1:]):
+        dt = t1 - t0
+        k1 = velocity(t0, x)
+        x = x + velocity(t0 + dt / 2, x + k1 * dt / 2) * dt
+    return x
+
+
+def heun(velocity: Velocity, x: torch.Tensor, timesteps: torch.Tensor) -> torch.Tensor:
+    """Heun's method (explicit trapezoidal): second order, two evaluations per step."""
+    for t0, t1 in zip(timesteps[:-1], timesteps[1:]):
+        dt = t1 - t0
+        k1 = velocity(t0, x)
+        k2 = velocity(t1, x + k1 * dt)
+        x = x + (k1 + k2) * dt / 2
+    return x
+
+
+def rk4(velocity: Velocity, x: torch.Tensor, timesteps: torch.Tensor) -> torch.Tensor:
+    """Classic Runge-Kutta: fourth order, four evaluations per step."""
+    for t0, t1 in zip(timesteps[:-1], timesteps[1:]):
+        dt = t1 - t0
+        k1 = velocity(t0, x)
+        k2 = velocity(t0 + dt / 2, x + k1 * dt / 2)
+        k3 = velocity(t0 + dt / 2, x + k2 * dt / 2)
+        k4 = velocity(t1, x + k3 * dt)
+        x = x + (k1 + 2 * k2 + 2 * k3 + k4) * dt / 6
+    return x
+
+
+def multistep(velocity: Velocity, x: torch.Tensor, timesteps: torch.Tensor) -> torch.Tensor:
+    """
+    Second order Adams-Bashforth with variable steps: one evaluation per step.
+
+    Like DPM-Solver++(2M), it reuses the previous step's DiT output for a second order correction instead of
+    evaluating the DiT again, so it costs the same as Euler. The correction extrapolates the velocity, which is
+    smooth along the flow, rather than the mel prediction, which bends sharply near t = 1. The first step is Euler.
+    """
+    prev_velocity, prev_t = None, None
+    for t0, t1 in zip(timesteps[:-1], timesteps[1:]):
+        dt = t1 - t0
+        vt = velocity(t0, x)
+        if prev_velocity is None:
+            x = x + vt * dt
+        else:
+            ratio = dt / (t0 - prev_t)
+            x = x + ((1 + ratio / 2) * vt - ratio / 2 * prev_velocity) * dt
+        prev_velocity, prev_t = vt, t0
+    return x
+
+
+ODE_SOLVERS: Dict[str, Callable[[Velocity, torch.Tensor, torch.Tensor], torch.Tensor]] = {
+    "euler": euler,
+    "midpoint": midpoint,
+    "heun": heun,
+    "rk4": rk4,
+    "multistep": multistep,
+}
+
+# DiT forward passes per step
+ODE_SOLVER_EVALS: Dict[str, int] = {"euler": 1, "midpoint": 2, "heun": 2, "rk4": 4, "multistep": 1}
+
+
+def get_ode_solver(name: str) -> Callable[[Velocity, torch.Tensor, torch.Tensor], torch.Tensor]:
+    if name not in ODE_SOLVERS:
+        raise ValueError(f"Unknown ODE solver: {name}. Expected one of {sorted(ODE_SOLVERS)}.")
+    return ODE_SOLVERS[name]
@@ -13,8 +13,6 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-import sox
-import copy
 import torch
 import operator
 import onnxruntime
@@ -25,11 +23,12 @@ import torchaudio.compliance.kaldi as kaldi
 
 from librosa.filters import mel as librosa_mel_fn
 from itertools import accumulate
-from typing import List
+from typing import List, Optional, Tuple
 from torch import Tensor
+from torch.nn.utils.rnn import pad_sequence
 
 from .core_vq import DistributedGroupResidualVectorQuantization
-from .whisper_encoder import WhisperEncoder, Conv1d, ConvTranspose1d
+from .whisper_encoder import WhisperEncoder, Conv1d, ConvTranspose1d, positions_in_segments
 
 
 def dynamic_range_compression_torch(x, C=1, clip_val=1e-5):
@@ -96,14 +95,31 @@ class MelSpectrogramFeatures(nn.Module):
         assert len(audio.shape) == 2
 
         y = audio
-        if len(list(self.mel_basis.keys())) == 0:
+        y = torch.nn.functional.pad(y.unsqueeze(1), (int((self.filter_length-self.hop_length)/2), int((self.filter_length-self.hop_length)/2)), mode='reflect')
+        y = y.squeeze(1)
+
+        return self._padded_extract(y)
+
+    def extract_batch(self, audios: List[torch.Tensor]) -> List[torch.Tensor]:
+        """
+        `extract` of 1-D waveforms of different lengths in one STFT. Each item is reflect padded on its own, so
+        the result equals per-item `extract`.
+
+        Returns:
+            List[torch.Tensor]: Mel spectrogram of shape (n_mel_channels, frames) per item.
+        """
+        pad = int((self.filter_length-self.hop_length)/2)
+        padded = [torch.nn.functional.pad(a.view(1, 1, -1), (pad, pad), mode='reflect').view(-1) for a in audios]
+        num_frames = [1 + (p.shape[-1] - self.filter_length) // self.hop_length for p in padded]
+        spec = self._padded_extract(pad_sequence(padded, batch_first=True))
+        return [s[:, :n] for s, n in zip(spec, num_frames)]
+
+    def _padded_extract(self, y):
+        if str(self.mel_fmax)+'_'+str(y.device) not in self.mel_basis:
             mel = librosa_mel_fn(sr=self.sampling_rate, n_fft=self.filter_length, n_mels=self.n_mel_channels, fmin=self.mel_fmin, fmax=self.mel_fmax)
             self.mel_basis[str(self.mel_fmax)+'_'+str(y.device)] = torch.from_numpy(mel).float().to(y.device)
             self.hann_window[str(y.device)] = torch.hann_window(self.win_length).to(y.device)
 
-        y = torch.nn.functional.pad(y.unsqueeze(1), (int((self.filter_length-self.hop_length)/2), int((self.filter_length-self.hop_length)/2)), mode='reflect')
-        y = y.squeeze(1)
-
         spec = torch.stft(y, self.filter_length, hop_length=self.hop_length, win_length=self.win_length, window=self.hann_window[str(y.device)],
                           center=False, pad_mode='reflect', normalized=False, onesided=True, return_complex=True)
         spec = torch.view_as_real(spec)
@@ -115,17 +131,81 @@ class MelSpectrogramFeatures(nn.Module):
         return spec
         
 
+def peak_normalize(audio: torch.Tensor, db_level: float = -6.0) -> torch.Tensor:
+    """
+    Scale a waveform so that its absolute peak is at `db_level` dBFS, like `sox norm <db_level>`. Silence is
+    returned unchanged.
+    """
+    peak = audio.abs().max() if audio.numel() else audio.new_zeros(())
+    if peak == 0:
+        return audio
+    return audio * (10 ** (db_level / 20) / peak)
+
+
+def batched_fbank(
+    waveforms: List[torch.Tensor],
+    num_mel_bins: int = 80,
+    sample_frequency: float = 16000.0,
+) -> List[torch.Tensor]:
+    """
+    `kaldi.fbank(waveform.unsqueeze(0), num_mel_bins=num_mel_bins, dither=0, sample_frequency=sample_frequency)` for
+    1-D waveforms of different lengths in one batched pass (25 ms povey window, 10 ms shift, snip edges).
+
+    Returns:
+        List[torch.Tensor]: Log mel filterbank of shape (frames, num_mel_bins) per waveform.
+    """
+    frame_length = int(sample_frequency * 0.025)
+    frame_shift = int(sample_frequency * 0.010)
+    padded_length = 1 << (frame_length - 1).bit_length()
+    num_frames = [
+        1 + (w.shape[-1] - frame_length) // frame_shift if w.shape[-1] >= frame_length else 0 for w in waveforms
+    ]
+
+    batch = pad_sequence(waveforms, batch_first=True)
+    if batch.shape[-1] < frame_length:
+        return [batch.new_zeros(0, num_mel_bins) for _ in waveforms]
+    frames = batch.unfold(-1, frame_length, frame_shift)
+    frames = frames - frames.mean(dim=-1, keepdim=True)
+    frames = frames - 0.97 * torch.cat([frames[..., :1], frames[..., :-1]], dim=-1)
+    window = torch.hann_window(frame_length, periodic=False, device=batch.device, dtype=batch.dtype).pow(0.85)
+    power = torch.fft.rfft(frames * window, n=padded_length).abs().pow(2.0)
+
+    mel_banks, _ = kaldi.get_mel_banks(num_mel_bins, padded_length, sample_frequency, 20.0, 0.0, 100.0, -500.0, 1.0)
+    mel_banks = F.pad(mel_banks, (0, 1)).to(device=batch.device, dtype=batch.dtype)
+    feats = torch.matmul(power, mel_banks.T)
+    feats = torch.max(feats, torch.tensor(torch.finfo(feats.dtype).eps, device=feats.device, dtype=feats.dtype)).log()
+    return [f[:n] for f, n in zip(feats, num_frames)]
+
+
 class XVectorExtractor(nn.Module):
-    def __init__(self, audio_codec_with_xvector):
+    """
+    CAM++ speaker embedding (ONNX) and reference mel of 16kHz waveforms.
+
+    Args:
+        audio_codec_with_xvector (str): Path of the CAM++ ONNX model.
+        num_threads (int): onnxruntime intra-op threads.
+        max_padding_frames (int): Items whose fbank lengths differ by at most this many frames share a batched
+            ONNX run, the shorter ones padded with zeros after mean normalisation. The embedding pools over time, so
+            padding perturbs it; the default 0 only batches items of equal length and is exact.
+        feature_batch_size (int, optional): Waveforms per padded fbank / mel pass. Features are computed on the
+            device of the waveforms; `None` batches all of them on accelerators and runs one at a time on CPU, where
+            the working set of a single item stays in cache and is faster than a padded batch.
+    """
+    def __init__(
+        self,
+        audio_codec_with_xvector,
+        num_threads: int = 1,
+        max_padding_frames: int = 0,
+        feature_batch_size: Optional[int] = None,
+    ):
         super().__init__()
         option = onnxruntime.SessionOptions()
         option.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
-        option.intra_op_num_threads = 1
+        option.intra_op_num_threads = num_threads
         providers = ["CPUExecutionProvider"]
         self.ort_session = onnxruntime.InferenceSession(audio_codec_with_xvector, sess_options=option, providers=providers)
-
-        self.tfm = sox.Transformer()
-        self.tfm.norm(db_level=-6)
+        self.max_padding_frames = max_padding_frames
+        self.feature_batch_size = feature_batch_size
 
         self.mel_ext = MelSpectrogramFeatures(
             filter_length=1024,
@@ -138,25 +218,59 @@ class XVectorExtractor(nn.Module):
         )
 
     def extract_code(self, audio):
+        xvectors, ref_mels = self.extract_batch([torch.from_numpy(audio)])
+        return xvectors[0].numpy(), ref_mels[0].numpy()
+
+    def extract_batch(self, audios: List[torch.Tensor]) -> Tuple[List[torch.Tensor], List[torch.Tensor]]:
+        """
+        Speaker embeddings and reference mels of a list of 1-D 16kHz waveforms.
+
+        Returns:
+            Tuple[List[torch.Tensor], List[torch.Tensor]]: L2-normalised float32 embeddings of shape (xvector_dim,)
+            on CPU, and float32 reference mels of shape (frames, 80) on the device of each waveform.
+        """
         with torch.no_grad():
-            norm_audio = self.sox_norm(audio)
-
-            norm_audio = torch.from_numpy(copy.deepcopy(norm_audio)).unsqueeze(0)
-            feat = kaldi.fbank(norm_audio,
-                            num_mel_bins=80,
-                            dither=0,
-                            sample_frequency=16000)
-            feat = feat - feat.mean(dim=0, keepdim=True)
-            norm_embedding = self.ort_session.run(None, {self.ort_session.get_inputs()[0].name: feat.unsqueeze(dim=0).cpu().numpy()})[0].flatten()
-            norm_embedding = F.normalize(torch.from_numpy(norm_embedding), dim=0)
-            
-            ref_mel = self.mel_ext.extract(audio=norm_audio)
-        
-        return norm_embedding.numpy(), ref_mel.permute(0,2,1).squeeze(0).numpy()
-    
-    def sox_norm(self, audio):
-        wav_norm = self.tfm.build_array(input_array=audio, sample_rate_in=16000)
-        return wav_norm
+            norm_audios = [peak_normalize(audio.detach().float()) for audio in audios]
+
+            batch_size = self.feature_batch_size
+            if batch_size is None:
+                on_cpu = all(audio.device.type == "cpu" for audio in norm_audios)
+                batch_size = 1 if on_cpu else max(len(norm_audios), 1)
+            feats, ref_mels = [], []
+            for start in range(0, len(norm_audios), batch_size):
+                group = norm_audios[start : start + batch_size]
+                feats += [feat - feat.mean(dim=0, keepdim=True) for feat in batched_fbank(group, num_mel_bins=80)]
+                ref_mels += [mel.T for mel in self.mel_ext.extract_batch(group)]
+
+            embeddings = self._run_xvector([feat.cpu() for feat in feats])
+            xvectors = [F.normalize(embedding, dim=0) for embedding in embeddings]
+
+        return xvectors, ref_mels
+
+    def _run_xvector(self, feats: List[torch.Tensor]) -> List[torch.Tensor]:
+        """
+        Run the ONNX model over length-sorted groups of fbank features, one batch per group.
+        """
+        session_input = self.ort_session.get_inputs()[0]
+        fixed_batch = isinstance(session_input.shape[0], int)
+        order = sorted(range(len(feats)), key=lambda i: feats[i].shape[0])
+        embeddings: List[Optional[torch.Tensor]] = [None] * len(feats)
+        start = 0
+        while start < len(order):
+            end = start + 1
+            while (
+                not fixed_batch
+                and end < len(order)
+                and feats[order[end]].shape[0] - feats[order[start]].shape[0] <= self.max_padding_frames
+            ):
+                end += 1
+            group = order[start:end]
+            batch = pad_sequence([feats[i] for i in group], batch_first=True)
+            outputs = self.ort_session.run(None, {session_input.name: batch.numpy()})[0]
+            for i, output in zip(group, outputs):
+                embeddings[i] = torch.from_numpy(output).flatten()
+            start = end
+        return embeddings
 
 
 class WhisperEncoderVQ(WhisperEncoder):
@@ -281,34 +395,13 @@ class WhisperEncoderVQ(WhisperEncoder):
             the mel spectrogram of the audio
         """
 
-        aftercnn_x_list = []
-        pe_for_vq_list = []
-        for each_x in x_list:
-            each_x_split_list = each_x.split(self.n_window * 2, dim=1)
-            for each_x_split in each_x_split_list:
-                each_x_split = F.gelu(self.conv1(each_x_split))
-                each_x_split = F.gelu(self.conv2(each_x_split))
-                each_x_split = each_x_split.permute(1, 0) # L,D
-
-                each_positional_embedding_split = self.positional_embedding[:each_x_split.shape[0]]
-                aftercnn_x_list.append(each_x_split+each_positional_embedding_split.to(each_x_split.dtype))
-
-                pe_for_vq_split = self.positional_embedding[:each_x_split.shape[0] // self.audio_vq_ds_rate]
-                pe_for_vq_list.append(pe_for_vq_split.to(each_x_split.dtype))
-
-        pe_for_vq = torch.cat(pe_for_vq_list, dim=0)
-        x = torch.cat(aftercnn_x_list, dim=0)
+        x, window_lens = self.conv_frontend(x_list)
         src_len = x.size(0)
 
-        output_list = []
-        for item in audio_aftercnnlens:
-            while item > self.n_window:
-                output_list.append(self.n_window)
-                item -= self.n_window
-            output_list.append(item)
+        # positional embedding of the VQ input, restarting in every window
+        pe_for_vq = self.positional_embedding[positions_in_segments(window_lens // self.audio_vq_ds_rate)].to(x.dtype)
 
-        cu_seqlens = list(accumulate(output_list, func=operator.add,initial=0))
-        cu_seqlens = torch.Tensor(cu_seqlens).to(device=x.device, dtype=torch.int32)
+        cu_seqlens = F.pad(window_lens.cumsum(0), (1, 0)).to(torch.int32)
 
         layer_id = 0
 
@@ -22,7 +22,7 @@ import numpy as np
 import torch.nn.functional as F
 
 from functools import lru_cache
-from typing import Optional, Union, List
+from typing import Optional, Union, List, Tuple
 from torch import nn, Tensor
 from itertools import accumulate
 
@@ -135,6 +135,12 @@ def sinusoids(length, channels, max_timescale=10000):
     return torch.cat([torch.sin(scaled_time), torch.cos(scaled_time)], dim=1)
 
 
+def positions_in_segments(lengths: Tensor) -> Tensor:
+    """Position of every element inside its segment, for consecutive segments of the given lengths."""
+    starts = lengths.cumsum(0) - lengths
+    return torch.arange(int(lengths.sum()), device=lengths.device) - starts.repeat_interleave(lengths)
+
+
 class Conv1d(nn.Conv1d):
     def _conv_forward(
         self, x: Tensor, weight: Tensor, bias: Optional[Tensor]
@@ -214,52 +220,39 @@ class MultiHeadAttention(nn.Module):
     def qkv_attention_manual(
         self, q: Tensor, k: Tensor, v: Tensor, cu_seqlens: Tensor
     ):
+        """
+        Variable-length attention without flash-attn: every window of the packed sequence attends only to itself.
+
+        The windows are scattered into a padded (windows, max_seqlen) layout by index, attended in one SDPA call with
+        a key padding mask, and gathered back into the packed layout.
+        """
         n_ctx, n_state = q.shape
         head_dim = n_state // self.n_head
-        scale = head_dim ** -0.5
-
-        q = q.view(n_ctx, self.n_head, head_dim)
-        k = k.view(n_ctx, self.n_head, head_dim)
-        v = v.view(n_ctx, self.n_head, head_dim)
-
-        seqlens = (cu_seqlens[1:] - cu_seqlens[:-1]).tolist()
-        batch_size = len(seqlens)
-        max_seqlen = max(seqlens)
-
-        q_padded = torch.zeros(batch_size, max_seqlen, self.n_head, head_dim, dtype=q.dtype, device=q.device)
-        k_padded = torch.zeros_like(q_padded)
-        v_padded = torch.zeros_like(q_padded)
-
-        for i in range(batch_size):
-            start_idx = cu_seqlens[i]
-            end_idx = cu_seqlens[i+1]
-            seq_len = seqlens[i]
-            q_padded[i, :seq_len] = q[start_idx:end_idx]
-            k_padded[i, :seq_len] = k[start_idx:end_idx]
-            v_padded[i, :seq_len] = v[start_idx:end_idx]
-        
-        q_padded = q_padded.transpose(1, 2)
-        k_padded = k_padded.transpose(1, 2)
-        v_padded = v_padded.transpose(1, 2)
 
-        attn_mask = torch.arange(max_seqlen, device=q.device)[None, :] < torch.tensor(seqlens, device=q.device)[:, None]
-        attn_mask = attn_mask.unsqueeze(1).unsqueeze(2)
+        seqlens = cu_seqlens[1:] - cu_seqlens[:-1]
+        batch_size = seqlens.shape[0]
+        max_seqlen = int(seqlens.max())
 
-        attn_mask = attn_mask.masked_fill(attn_mask == 0, -torch.finfo(q.dtype).max)
+        if batch_size * max_seqlen == n_ctx:
+            # all windows have the same length: the packed sequence already is a batch
+            q, k, v = (x.view(batch_size, max_seqlen, self.n_head, head_dim).transpose(1, 2) for x in (q, k, v))
+            context = F.scaled_dot_product_attention(q, k, v)
+            return context.transpose(1, 2).reshape(n_ctx, n_state)
 
-        attn_scores = torch.matmul(q_padded, k_padded.transpose(-2, -1)) * scale
-        attn_scores = attn_scores + attn_mask
-        attn_weights = F.softmax(attn_scores, dim=-1)
+        window = torch.repeat_interleave(torch.arange(batch_size, device=q.device), seqlens, output_size=n_ctx)
+        position = torch.arange(n_ctx, device=q.device) - cu_seqlens[:-1].to(q.device)[window]
 
-        context = torch.matmul(attn_weights, v_padded)
-        
-        context = context.transpose(1, 2).contiguous().view(batch_size, max_seqlen, n_state)
+        packed = torch.stack([q, k, v]).view(3, n_ctx, self.n_head, head_dim)
+        padded = packed.new_zeros(3, batch_size, max_seqlen, self.n_head, head_dim)
+        padded[:, window, position] = packed
+        q_padded, k_padded, v_padded = padded.transpose(2, 3).unbind(0)
 
-        output_packed = torch.cat([context[i, :seqlens[i]] for i in range(batch_size)], dim=0)
+        key_mask = torch.arange(max_seqlen, device=q.device)[None, :] < seqlens.to(q.device)[:, None]
+        context = F.scaled_dot_product_attention(
+            q_padded, k_padded, v_padded, attn_mask=key_mask[:, None, None, :]
+        )
 
-        assert output_packed.shape == (n_ctx, n_state)
-        
-        return output_packed
+        return context.transpose(1, 2)[window, position].reshape(n_ctx, n_state)
 
 
 class ResidualAttentionBlock(nn.Module):
@@ -335,34 +328,49 @@ class WhisperEncoder(nn.Module):
             if not name.startswith("blocks"):
                 setattr(param, "audio_sync", True)
 
+    def conv_frontend(self, x_list: List[Tensor]) -> Tuple[Tensor, Tensor]:
+        """
+        Run conv1 -> GELU -> conv2 -> GELU over the `n_window * 2` frame windows of all mels as one batch and add the
+        positional embedding, which restarts in every window.
+
+        The last window of each mel is zero padded, and its conv1 output past the end is zeroed, so conv2 sees the
+        same zero padding as when the window runs alone.
+
+        Returns:
+            Tuple[Tensor, Tensor]: The windows after the CNN packed as (total_length, n_state), and the length of
+            every window after the CNN, which are also the attention windows.
+        """
+        window = self.n_window * 2
+        mellens = [each_x.shape[1] for each_x in x_list]
+        counts = [-(-mellen // window) for mellen in mellens]
+        x = torch.cat([
+            F.pad(each_x, (0, count * window - mellen)).view(each_x.shape[0], count, window).transpose(0, 1)
+            for each_x, mellen, count in zip(x_list, mellens, counts)
+        ], dim=0)  # (n_windows, n_mels, window)
+
+        counts = torch.tensor(counts, device=x.device)
+        window_mellens = torch.tensor(mellens, device=x.device).repeat_interleave(counts)
+        window_mellens = (window_mellens - window * positions_in_segments(counts)).clamp(max=window)
+
+        x = F.gelu(self.conv1(x))
+        x = x.masked_fill((torch.arange(window, device=x.device) >= window_mellens[:, None])[:, None, :], 0)
+        x = F.gelu(self.conv2(x)).transpose(1, 2)  # (n_windows, window // 2, n_state)
+        x = x + self.positional_embedding[:x.shape[1]].to(x.dtype)
+
+        window_lens = get_T_after_cnn(window_mellens)
+        x = x[torch.arange(x.shape[1], device=x.device) < window_lens[:, None]]
+        return x, window_lens
+
     def forward(self, x_list: List[Tensor], audio_mellens:List[int], audio_aftercnnlens:List[int], audio_seqlens:List[int]):
         """
         x : torch.Tensor, shape = (n_mels, n_ctx)
             the mel spectrogram of the audio
         """
 
-        aftercnn_x_list = []
-        for each_x in x_list:
-            each_x_split_list = each_x.split(self.n_window * 2, dim=1)
-            for each_x_split in each_x_split_list:
-                each_x_split = F.gelu(self.conv1(each_x_split))
-                each_x_split = F.gelu(self.conv2(each_x_split))
-                each_x_split = each_x_split.permute(1, 0) # L,D
-                each_positional_embedding_split = self.positional_embedding[:each_x_split.shape[0]]
-                aftercnn_x_list.append(each_x_split+each_positional_embedding_split.to(each_x_split.dtype))
-
-        x = torch.cat(aftercnn_x_list, dim=0)
+        x, window_lens = self.conv_frontend(x_list)
         src_len = x.size(0)
 
-        output_list = []
-        for item in audio_aftercnnlens:
-            while item > self.n_window:
-                output_list.append(self.n_window)
-                item -= self.n_window
-            output_list.append(item)
-
-        cu_seqlens = list(accumulate(output_list, func=operator.add,initial=0))
-        cu_seqlens = torch.Tensor(cu_seqlens).to(device=x.device, dtype=torch.int32)
+        cu_seqlens = F.pad(window_lens.cumsum(0), (1, 0)).to(torch.int32)
 
         layer_id = 0
         for block in self.blocks:
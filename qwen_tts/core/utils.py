@@ -0,0 +1,28 @@
+# coding=utf-8
+# Copyright 2026 The Alibaba Qwen team.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import torch
+
+
+def trailing_code_lengths(audio_codes: torch.Tensor) -> torch.Tensor:
+    """
+    Lengths of right padded codes: everything up to the last frame with a non-zero code.
+    `audio_codes` is (B, T) for 25Hz or (B, T, Q) for 12Hz.
+    """
+    nonzero = audio_codes != 0
+    if nonzero.dim() == 3:
+        nonzero = nonzero.any(-1)
+    last = nonzero.shape[1] - nonzero.flip(1).int().argmax(1)
+    return torch.where(nonzero.any(1), last, torch.zeros_like(last))
@@ -0,0 +1,329 @@
+# coding=utf-8
+# Copyright 2026 The Alibaba Qwen team.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import io
+import math
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
+import soundfile as sf
+
+from .qwen3_tts_memory import estimate_prompt_length
+
+# task -> (generate method, per-request fields that are batched as lists, required fields)
+BATCH_TASKS = {
+    "custom_voice": ("generate_custom_voice", ["text", "speaker", "instruct"], ["text", "speaker"]),
+    "voice_design": ("generate_voice_design", ["text", "instruct"], ["text", "instruct"]),
+    "voice_clone": (
+        "generate_voice_clone",
+        ["text", "ref_audio", "ref_text", "x_vector_only_mode", "voice_clone_prompt"],
+        ["text"],
+    ),
+}
+
+
+@dataclass
+class _PendingRequest:
+    task: str
+    key: Hashable
+    item_kwargs: Dict[str, Any]
+    shared_kwargs: Dict[str, Any]
+    future: Future
+    arrival: float = field(default_factory=time.monotonic)
+    prompt_length: int = 0
+    ref_frames: int = 0
+
+
+class Qwen3TTSBatchScheduler:
+    """
+    Dynamic micro-batching for a `Qwen3TTSModel`.
+
+    Single-sample requests are queued by `submit()` from any thread. A background thread groups
+    compatible requests (same task, language, sampling parameters and other generate kwargs),
+    waits at most `max_wait_ms` after the oldest request of a group arrived or until
+    `max_batch_size` requests are available, runs them as one batched generate_* call and
+    resolves each future with its own `([wav], sample_rate)`.
+
+    Notes:
+      - All generation of the wrapped model should go through the scheduler while it is running;
+        the model itself is not safe to call from several threads at once.
+      - Voice clone requests given `ref_audio` get their prompts built in one batched
+        `create_voice_clone_prompt` call. Requests passing the dict form of `voice_clone_prompt`
+        are run on their own.
+      - With a `memory_budget` (bytes), each batch is further limited to the largest prefix of the
+        group whose peak memory, predicted by `model.get_memory_estimator()`, fits the budget. The estimator
+        is resolved when the scheduler is created. ICL voice clone requests given `ref_audio` are sized by the
+        duration of the reference audio. If that is unknown before loading it (URL input), they run on their own.
+    """
+
+    def __init__(
+        self,
+        model,
+        max_batch_size: int = 8,
+        max_wait_ms: float = 10.0,
+        memory_budget: Optional[int] = None,
+    ):
+        if max_batch_size < 1:
+            raise ValueError(f"max_batch_size must be >= 1, got {max_batch_size}")
+        if max_wait_ms < 0:
+            raise ValueError(f"max_wait_ms must be >= 0, got {max_wait_ms}")
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.memory_budget = memory_budget
+        self.memory_estimator = model.get_memory_estimator() if memory_budget is not None else None
+
+        self._cond = threading.Condition()
+        self._queue: Deque[_PendingRequest] = deque()
+        self._closed = False
+        self._thread = None
+
+    def _group_key(self, task: str, item_kwargs: Dict[str, Any], shared_kwargs: Dict[str, Any]) -> Hashable:
+        if isinstance(item_kwargs.get("voice_clone_prompt", None), dict):
+            # Already merged prompt dicts cannot be concatenated: run alone.
+            return (task, object())
+        return (task,) + tuple(sorted((k, repr(v)) for k, v in shared_kwargs.items()))
+
+    def submit(self, task: str, **kwargs) -> Future:
+        """
+        Queue one sample for generation.
+
+        Args:
+            task (str):
+                One of "custom_voice", "voice_design", "voice_clone".
+            **kwargs:
+                Keyword arguments of the corresponding generate_* method for a single sample,
+                e.g. `text="Hello.", speaker="Ryan", language="English", max_new_tokens=2048`.
+
+        Returns:
+            concurrent.futures.Future:
+                Resolves to `([wav], sample_rate)`, or raises the exception of the batched call.
+
+        Raises:
+            ValueError: If `task` is unknown, a required field is missing or `text` is a list.
+            RuntimeError: If the scheduler has been shut down.
+        """
+        if task not in BATCH_TASKS:
+            raise ValueError(f"Unknown task: {task}. Expected one of {sorted(BATCH_TASKS)}.")
+        _, item_fields, required = BATCH_TASKS[task]
+        missing = [k for k in required if kwargs.get(k, None) is None]
+        if missing:
+            raise ValueError(f"Missing required arguments for task '{task}': {missing}")
+        if isinstance(kwargs["text"], list):
+            raise ValueError("submit() takes a single `text` per request, got a list.")
+
+        item_kwargs = {k: kwargs.pop(k) for k in item_fields if k in kwargs}
+        kwargs["language"] = kwargs.get("language", None) or "Auto"
+        self._validate(task, item_kwargs, kwargs)
+        request = _PendingRequest(
+            task=task,
+            key=self._group_key(task, item_kwargs, kwargs),
+            item_kwargs=item_kwargs,
+            shared_kwargs=kwargs,
+            future=Future(),
+        )
+        if self.memory_budget is not None:
+            # tokenize in the caller's thread, the scheduler only sums up lengths
+            request.prompt_length, ref_frames = self._prompt_length(task, item_kwargs)
+            if ref_frames is None:
+                # the reference length is only known once the audio is loaded: run alone
+                request.key = (task, object())
+            request.ref_frames = ref_frames or 0
+
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("cannot submit after the batch scheduler has been shut down")
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="qwen3-tts-batcher", daemon=True)
+                self._thread.start()
+            self._queue.append(request)
+            self._cond.notify()
+        return request.future
+
+    def _validate(self, task: str, item_kwargs: Dict[str, Any], shared_kwargs: Dict[str, Any]) -> None:
+        # Reject bad requests in the caller's thread, so they cannot fail the batch they would join.
+        self.model._validate_languages([shared_kwargs["language"]])
+        if task == "custom_voice":
+            self.model._validate_speakers([item_kwargs["speaker"]])
+        if task == "voice_clone" and item_kwargs.get("voice_clone_prompt", None) is None:
+            if item_kwargs.get("ref_audio", None) is None:
+                raise ValueError("Either `voice_clone_prompt` or `ref_audio` must be provided.")
+            if not item_kwargs.get("x_vector_only_mode", False) and not item_kwargs.get("ref_text", None):
+                raise ValueError("ref_text is required when x_vector_only_mode=False (ICL mode).")
+
+    def _ref_audio_frames(self, ref_audio) -> Optional[int]:
+        """
+        Codec frames the reference audio of an ICL voice clone request is encoded to, from its duration.
+        None if the duration is not known without fetching the audio (URL input) or the audio cannot be read.
+        """
+        if isinstance(ref_audio, list) and len(ref_audio) == 1:
+            ref_audio = ref_audio[0]
+        try:
+            if isinstance(ref_audio, tuple) and len(ref_audio) == 2 and isinstance(ref_audio[0], np.ndarray):
+                duration = ref_audio[0].shape[0] / float(ref_audio[1])
+            elif isinstance(ref_audio, str) and not self.model._is_url(ref_audio):
+                if self.model._is_probably_base64(ref_audio):
+                    duration = sf.info(io.BytesIO(self.model._decode_base64_to_wav_bytes(ref_audio))).duration
+                else:
+                    duration = sf.info(ref_audio).duration
+            else:
+                return None
+        except Exception:
+            return None
+        speech_tokenizer = self.model.model.speech_tokenizer
+        frame_rate = speech_tokenizer.get_input_sample_rate() / speech_tokenizer.get_encode_downsample_rate()
+        return math.ceil(duration * frame_rate)
+
+    def _prompt_length(self, task: str, item_kwargs: Dict[str, Any]) -> Tuple[int, Optional[int]]:
+        ref_frames = 0
+        ref_text = None
+        prompt = item_kwargs.get("voice_clone_prompt", None)
+        if isinstance(prompt, list) and len(prompt) == 1:
+            prompt = prompt[0]
+        if prompt is not None and not isinstance(prompt, (dict, list)):
+            ref_text = prompt.ref_text
+            ref_frames = 0 if prompt.ref_code is None else int(prompt.ref_code.shape[0])
+        elif task == "voice_clone" and not item_kwargs.get("x_vector_only_mode", False):
+            # ICL mode from `ref_audio`: the reference codes are prepended to the prompt and to the vocoder input
+            ref_text = item_kwargs.get("ref_text", None)
+            ref_frames = self._ref_audio_frames(item_kwargs.get("ref_audio", None))
+        length = estimate_prompt_length(
+            self.model,
+            item_kwargs["text"],
+            instruct=item_kwargs.get("instruct", None),
+            ref_text=ref_text,
+            ref_frames=ref_frames or 0,
+        )
+        return length, ref_frames
+
+    def _batch_limit(self, group: List[_PendingRequest]) -> int:
+        group = group[: self.max_batch_size]
+        if self.memory_budget is None or not group:
+            return len(group)
+        max_new_tokens = self.model._merge_generate_kwargs(
+            max_new_tokens=group[0].shared_kwargs.get("max_new_tokens", None)
+        )["max_new_tokens"]
+        n = self.memory_estimator.max_prefix(
+            [r.prompt_length for r in group],
+            max_new_tokens,
+            self.memory_budget,
+            ref_frames=max(r.ref_frames for r in group),
+        )
+        # a request that does not fit on its own is still attempted alone
+        return max(n, 1)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Stop accepting requests. Already queued requests are still processed.
+
+        Args:
+            wait (bool): Block until the queue is drained and the worker thread exited.
+        """
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+            thread = self._thread
+        if wait and thread is not None:
+            thread.join()
+
+    def _next_batch(self) -> List[_PendingRequest]:
+        with self._cond:
+            while not self._queue and not self._closed:
+                self._cond.wait()
+            if not self._queue:
+                return []
+
+            # The oldest request decides which group runs next, so no group starves.
+            key = self._queue[0].key
+            deadline = self._queue[0].arrival + self.max_wait
+            while True:
+                group = [r for r in self._queue if r.key == key]
+                limit = self._batch_limit(group)
+                remaining = deadline - time.monotonic()
+                if self._closed or len(group) > limit or len(group) >= self.max_batch_size or remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+
+            batch = group[:limit]
+            taken = set(id(r) for r in batch)
+            self._queue = deque(r for r in self._queue if id(r) not in taken)
+            return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._next_batch()
+            if not batch:
+                return
+            self._run_batch(batch)
+
+    def _run_batch(self, batch: List[_PendingRequest]) -> None:
+        batch = [r for r in batch if r.future.set_running_or_notify_cancel()]
+        if not batch:
+            return
+        try:
+            wavs, sr = self._generate(batch)
+        except BaseException as e:
+            for r in batch:
+                r.future.set_exception(e)
+            return
+        for r, wav in zip(batch, wavs):
+            r.future.set_result(([wav], sr))
+
+    def _generate(self, batch: List[_PendingRequest]) -> Tuple[List[np.ndarray], int]:
+        task = batch[0].task
+        method, item_fields, _ = BATCH_TASKS[task]
+        kwargs = dict(batch[0].shared_kwargs)
+        kwargs["language"] = [kwargs["language"]] * len(batch)
+
+        if task == "voice_clone":
+            kwargs["text"] = [r.item_kwargs["text"] for r in batch]
+            prompt = batch[0].item_kwargs.get("voice_clone_prompt", None)
+            if isinstance(prompt, dict):
+                kwargs["voice_clone_prompt"] = prompt
+            else:
+                kwargs["voice_clone_prompt"] = self._voice_clone_prompt_items(batch)
+        else:
+            for k in item_fields:
+                kwargs[k] = [r.item_kwargs.get(k, None) for r in batch]
+
+        return getattr(self.model, method)(**kwargs)
+
+    def _voice_clone_prompt_items(self, batch: List[_PendingRequest]) -> List[Any]:
+        to_build = [r.item_kwargs for r in batch if r.item_kwargs.get("voice_clone_prompt", None) is None]
+        built = iter([])
+        if to_build:
+            built = iter(self.model.create_voice_clone_prompt(
+                ref_audio=[kw["ref_audio"] for kw in to_build],
+                ref_text=[kw.get("ref_text", None) for kw in to_build],
+                x_vector_only_mode=[kw.get("x_vector_only_mode", False) for kw in to_build],
+            ))
+
+        items = []
+        for r in batch:
+            prompt = r.item_kwargs.get("voice_clone_prompt", None)
+            if prompt is None:
+                items.append(next(built))
+            elif isinstance(prompt, list):
+                if len(prompt) != 1:
+                    raise ValueError(f"submit() takes a single voice clone prompt per request, got {len(prompt)}.")
+                items.append(prompt[0])
+            else:
+                items.append(prompt)
+        return items
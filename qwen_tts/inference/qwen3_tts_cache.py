@@ -0,0 +1,138 @@
+# coding=utf-8
+# Copyright 2026 The Alibaba Qwen team.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+import numpy as np
+import torch
+
+
+def hash_audio(wav: np.ndarray, sr: int, namespace: str = "") -> str:
+    """
+    Content hash of a decoded waveform and its sampling rate.
+
+    Args:
+        wav (np.ndarray): Waveform; hashed as contiguous float32 PCM.
+        sr (int): Sampling rate of `wav`.
+        namespace (str): Prefix that separates entries of different models / kinds.
+
+    Returns:
+        str: Hex sha256 digest.
+    """
+    h = hashlib.sha256()
+    h.update(f"{namespace}:{int(sr)}:".encode("utf-8"))
+    h.update(np.ascontiguousarray(wav, dtype=np.float32))
+    return h.hexdigest()
+
+
+def _to_cpu(value: Any) -> Any:
+    if isinstance(value, torch.Tensor):
+        return value.detach().cpu()
+    if isinstance(value, dict):
+        return {k: _to_cpu(v) for k, v in value.items()}
+    return value
+
+
+class Qwen3TTSFeatureCache:
+    """
+    Thread-safe LRU of per-clip features (speech tokenizer codes, speaker embeddings), keyed by `hash_audio`.
+
+    Entries are dicts of tensors. The memory tier holds up to `max_items` entries; with `cache_dir` set, every
+    entry is also written to `<cache_dir>/<key>.pt` and memory misses fall back to disk, so the cache survives
+    restarts and can be shared by processes. Use one `cache_dir` per checkpoint.
+    """
+
+    def __init__(self, max_items: int = 256, cache_dir: Optional[str] = None):
+        if max_items < 0:
+            raise ValueError(f"max_items must be >= 0, got {max_items}")
+        self.max_items = int(max_items)
+        self.cache_dir = cache_dir
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        if cache_dir is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.pt")
+
+    def _remember(self, key: str, entry: Dict[str, Any]) -> None:
+        if self.max_items == 0:
+            return
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_items:
+                self._entries.popitem(last=False)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up an entry; returns None on a miss. Returned tensors are on CPU.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+
+        if self.cache_dir is not None and os.path.exists(self._path(key)):
+            try:
+                entry = torch.load(self._path(key), map_location="cpu", weights_only=True)
+            except Exception:
+                # Partially written or stale file: treat as a miss, it is overwritten by the next put().
+                entry = None
+            if entry is not None:
+                self._remember(key, entry)
+                with self._lock:
+                    self.hits += 1
+                return entry
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: str, entry: Dict[str, Any]) -> None:
+        """
+        Store an entry (a dict of tensors). Tensors are copied to CPU.
+        """
+        entry = _to_cpu(entry)
+        self._remember(key, entry)
+        if self.cache_dir is not None:
+            # Write to a temporary file first so concurrent readers never see a partial entry.
+            tmp = f"{self._path(key)}.{os.getpid()}.{threading.get_ident()}.tmp"
+            torch.save(entry, tmp)
+            os.replace(tmp, self._path(key))
+
+    def clear(self, disk: bool = False) -> None:
+        """
+        Drop all memory entries, and the `.pt` files in `cache_dir` if `disk` is True.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+        if disk and self.cache_dir is not None:
+            for name in os.listdir(self.cache_dir):
+                if name.endswith(".pt"):
+                    os.remove(os.path.join(self.cache_dir, name))
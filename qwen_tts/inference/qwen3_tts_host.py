@@ -0,0 +1,277 @@
+# coding=utf-8
+# Copyright 2026 The Alibaba Qwen team.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import hashlib
+import os
+import threading
+from typing import Any, Dict, List, Optional
+
+import torch
+from transformers import AutoConfig, AutoModel, AutoProcessor
+from transformers.utils.hub import cached_file
+
+from ..core.models import Qwen3TTSConfig, Qwen3TTSForConditionalGeneration, Qwen3TTSProcessor
+from .qwen3_tts_model import Qwen3TTSModel
+from .qwen3_tts_tokenizer import Qwen3TTSTokenizer
+
+# Files that fully determine the text processor of a checkpoint.
+PROCESSOR_FILES = [
+    "vocab.json",
+    "merges.txt",
+    "tokenizer.json",
+    "tokenizer_config.json",
+    "special_tokens_map.json",
+    "added_tokens.json",
+    "chat_template.json",
+    "processor_config.json",
+]
+
+# `from_pretrained` kwargs that select which files are fetched from the hub.
+HUB_KWARGS = ("cache_dir", "force_download", "local_files_only", "proxies", "revision", "subfolder", "token")
+
+_HASH_CHUNK_SIZE = 1 << 20
+
+
+def _hub_kwargs(kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    return {k: kwargs[k] for k in HUB_KWARGS if k in kwargs}
+
+
+def _hash_file(h, path: str) -> None:
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(_HASH_CHUNK_SIZE)
+            if not chunk:
+                break
+            h.update(chunk)
+
+
+def hash_directory(path: str) -> str:
+    """
+    Content hash of every file below `path` (relative names + bytes, in sorted order).
+
+    Args:
+        path (str): Local directory, e.g. a `speech_tokenizer/` snapshot.
+
+    Returns:
+        str: Hex sha256 digest.
+    """
+    h = hashlib.sha256()
+    for root, dirs, files in os.walk(path):
+        dirs.sort()
+        for name in sorted(files):
+            full = os.path.join(root, name)
+            h.update(os.path.relpath(full, path).replace(os.sep, "/").encode("utf-8"))
+            _hash_file(h, full)
+    return h.hexdigest()
+
+
+def hash_tensor(tensor: torch.Tensor) -> str:
+    """
+    Content hash of a tensor (dtype, shape and raw bytes).
+
+    Args:
+        tensor (torch.Tensor): Any tensor, on any device.
+
+    Returns:
+        str: Hex sha256 digest.
+    """
+    h = hashlib.sha256()
+    h.update(f"{tensor.dtype}:{tuple(tensor.shape)}".encode("utf-8"))
+    data = tensor.detach().contiguous().view(-1).view(torch.uint8).cpu().numpy()
+    h.update(data)
+    return h.hexdigest()
+
+
+class Qwen3TTSModelHost:
+    """
+    Hosts several Qwen3 TTS checkpoints (Base / CustomVoice / VoiceDesign) in one process and
+    loads the components they have in common only once.
+
+    Shared components are detected by content hash, never by name:
+      - speech tokenizer: hash of the `speech_tokenizer/` directory; identical tokenizers are
+        loaded once and the same `Qwen3TTSTokenizer` instance is attached to every model.
+      - text embedding table (`talker.model.text_embedding`): hash of the loaded weights; duplicates
+        are replaced by the first loaded parameter once the checkpoint has loaded, so their memory is
+        released. This only saves steady-state memory: every checkpoint still reads its own table,
+        so peak memory and load time during `load()` are those of a standalone load.
+      - processor: hash of the tokenizer files of the checkpoint.
+
+    Each `load()` returns a regular `Qwen3TTSModel` wrapper that references the shared modules,
+    so all generation APIs work unchanged.
+
+    Notes:
+      - Components are only shared between models loaded on the same device with the same dtype.
+      - Shared modules must be treated as read-only (e.g. do not fine-tune a hosted model).
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._models: Dict[str, Qwen3TTSModel] = {}
+        self._speech_tokenizers: Dict[str, Qwen3TTSTokenizer] = {}
+        self._text_embeddings: Dict[str, torch.nn.Parameter] = {}
+        self._processors: Dict[str, Qwen3TTSProcessor] = {}
+
+    def _component_key(self, digest: str, **kwargs) -> str:
+        # Same content loaded with a different placement/precision is a different component.
+        placement = (repr(kwargs.get("device_map", None)), repr(kwargs.get("dtype", kwargs.get("torch_dtype", None))))
+        return f"{digest}:{placement[0]}:{placement[1]}"
+
+    def _processor_digest(self, pretrained_model_name_or_path: str, **kwargs) -> Optional[str]:
+        h = hashlib.sha256()
+        found = False
+        for name in PROCESSOR_FILES:
+            path = cached_file(
+                pretrained_model_name_or_path,
+                name,
+                _raise_exceptions_for_missing_entries=False,
+                **_hub_kwargs(kwargs),
+            )
+            if path is None:
+                continue
+            found = True
+            h.update(name.encode("utf-8"))
+            _hash_file(h, path)
+        return h.hexdigest() if found else None
+
+    def _load_processor(self, pretrained_model_name_or_path: str, **kwargs) -> Qwen3TTSProcessor:
+        digest = self._processor_digest(pretrained_model_name_or_path, **kwargs)
+        if digest is not None and digest in self._processors:
+            return self._processors[digest]
+        processor = AutoProcessor.from_pretrained(
+            pretrained_model_name_or_path, fix_mistral_regex=True, **_hub_kwargs(kwargs)
+        )
+        if digest is not None:
+            self._processors[digest] = processor
+        return processor
+
+    def _make_speech_tokenizer_loader(self, **kwargs):
+        tokenizer_kwargs = {k: v for k, v in kwargs.items() if k != "attn_implementation"}
+
+        def loader(speech_tokenizer_dir: str) -> Qwen3TTSTokenizer:
+            key = self._component_key(hash_directory(speech_tokenizer_dir), **tokenizer_kwargs)
+            speech_tokenizer = self._speech_tokenizers.get(key, None)
+            if speech_tokenizer is None:
+                speech_tokenizer = Qwen3TTSTokenizer.from_pretrained(speech_tokenizer_dir, **tokenizer_kwargs)
+                self._speech_tokenizers[key] = speech_tokenizer
+            return speech_tokenizer
+
+        return loader
+
+    def _share_text_embedding(self, model: Qwen3TTSForConditionalGeneration) -> None:
+        embedding = model.talker.get_text_embeddings()
+        weight = embedding.weight
+        key = f"{hash_tensor(weight)}:{weight.device}"
+        shared = self._text_embeddings.get(key, None)
+        if shared is None:
+            self._text_embeddings[key] = weight
+        elif shared is not weight:
+            embedding.weight = shared
+
+    def load(self, name: str, pretrained_model_name_or_path: str, **kwargs) -> Qwen3TTSModel:
+        """
+        Load a checkpoint under `name`, reusing any component already held by the host.
+
+        Args:
+            name (str):
+                Handle for the hosted model, e.g. "base", "custom_voice", "voice_design".
+            pretrained_model_name_or_path (str):
+                HuggingFace repo id or local directory of the model.
+            **kwargs:
+                Forwarded to `Qwen3TTSModel.from_pretrained(...)`,
+                e.g. device_map="cuda:0", dtype=torch.bfloat16, attn_implementation="flash_attention_2".
+
+        Returns:
+            Qwen3TTSModel:
+                Wrapper referencing the shared speech tokenizer, text embedding and processor.
+
+        Raises:
+            ValueError: If `name` is already hosted.
+        """
+        with self._lock:
+            if name in self._models:
+                raise ValueError(f"A model is already hosted under name '{name}'. Call unload('{name}') first.")
+
+            AutoConfig.register("qwen3_tts", Qwen3TTSConfig)
+            AutoModel.register(Qwen3TTSConfig, Qwen3TTSForConditionalGeneration)
+            AutoProcessor.register(Qwen3TTSConfig, Qwen3TTSProcessor)
+
+            processor = self._load_processor(pretrained_model_name_or_path, **kwargs)
+            model = Qwen3TTSModel.from_pretrained(
+                pretrained_model_name_or_path,
+                processor=processor,
+                speech_tokenizer_loader=self._make_speech_tokenizer_loader(**kwargs),
+                **kwargs,
+            )
+            self._share_text_embedding(model.model)
+
+            self._models[name] = model
+            return model
+
+    def get(self, name: str) -> Qwen3TTSModel:
+        """
+        Get a hosted model by name.
+
+        Raises:
+            KeyError: If no model is hosted under `name`.
+        """
+        with self._lock:
+            if name not in self._models:
+                raise KeyError(f"No model hosted under name '{name}'. Hosted: {sorted(self._models)}")
+            return self._models[name]
+
+    def unload(self, name: str) -> None:
+        """
+        Drop a hosted model. Shared components stay cached while any other hosted model uses them.
+        """
+        with self._lock:
+            self._models.pop(name)
+            self._release_unused()
+
+    def _release_unused(self) -> None:
+        used_tokenizers = {id(m.model.speech_tokenizer) for m in self._models.values()}
+        used_embeddings = {id(m.model.talker.get_text_embeddings().weight) for m in self._models.values()}
+        used_processors = {id(m.processor) for m in self._models.values()}
+        self._speech_tokenizers = {k: v for k, v in self._speech_tokenizers.items() if id(v) in used_tokenizers}
+        self._text_embeddings = {k: v for k, v in self._text_embeddings.items() if id(v) in used_embeddings}
+        self._processors = {k: v for k, v in self._processors.items() if id(v) in used_processors}
+
+    def names(self) -> List[str]:
+        """
+        Names of all hosted models.
+        """
+        with self._lock:
+            return sorted(self._models)
+
+    def shared_components(self) -> Dict[str, Any]:
+        """
+        Number of distinct shared components currently held, for monitoring.
+
+        Returns:
+            Dict[str, Any]: counts of hosted models, speech tokenizers, text embeddings and processors.
+        """
+        with self._lock:
+            return dict(
+                models=len(self._models),
+                speech_tokenizers=len(self._speech_tokenizers),
+                text_embeddings=len(self._text_embeddings),
+                processors=len(self._processors),
+            )
+
+    def __contains__(self, name: str) -> bool:
+        with self._lock:
+            return name in self._models
+
+    def __getitem__(self, name: str) -> Qwen3TTSModel:
+        return self.get(name)
@@ -0,0 +1,350 @@
+# coding=utf-8
+# Copyright 2026 The Alibaba Qwen team.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import torch
+
+from ..core.models import Qwen3TTSConfig
+
+# Role / codec control tokens wrapped around the text in a talker prompt
+# (im_start, role, codec think/language/speaker ids, bos/eos, ...).
+PROMPT_OVERHEAD_TOKENS = 16
+
+
+def _element_size(dtype: torch.dtype) -> int:
+    return torch.empty((), dtype=dtype).element_size()
+
+
+def decoder_bytes_per_frame(decoder_config, dtype: torch.dtype) -> int:
+    """
+    Activation bytes per codec frame at the widest stage of the 12Hz decoder
+    (`Qwen3TTSTokenizerV2Decoder`): the input of a decoder block plus a few copies of its upsampled output
+    held by the residual units.
+
+    Args:
+        decoder_config: `Qwen3TTSTokenizerV2DecoderConfig`.
+        dtype (torch.dtype): Dtype of the decoder weights.
+
+    Returns:
+        int: Bytes per frame.
+    """
+    length = int(np.prod(decoder_config.upsampling_ratios))
+    peak = 0
+    for i, rate in enumerate(decoder_config.upsample_rates):
+        in_dim = decoder_config.decoder_dim // 2 ** i
+        out_dim = decoder_config.decoder_dim // 2 ** (i + 1)
+        peak = max(peak, in_dim * length + 3 * out_dim * length * rate)
+        length *= rate
+    return peak * _element_size(dtype)
+
+
+@dataclass
+class MemoryEstimate:
+    """
+    Predicted peak memory (bytes) of one batched generate_* call, on top of the model weights.
+    """
+    talker: int
+    vocoder: int
+    overhead: int = 0
+
+    @property
+    def total(self) -> int:
+        # The talker's KV cache and outputs are released before the codes are decoded.
+        return max(self.talker, self.vocoder) + self.overhead
+
+    @property
+    def total_pipelined(self) -> int:
+        # `generate_pipelined` decodes one batch while the talker runs the next.
+        return self.talker + self.vocoder + self.overhead
+
+
+class Qwen3TTSMemoryEstimator:
+    """
+    Predicts the peak memory of batched generation from the model configs, so batch sizes can be
+    chosen against a memory budget instead of by trial and error.
+
+    The talker term covers the KV cache of the talker (prompt + `max_new_tokens`, in the KV cache dtype),
+    the per-step KV cache of the code predictor, the per-step hidden states kept by `generate()`,
+    prefill activations and logits. The vocoder term covers one chunk of the speech tokenizer decoder
+    (`vocoder_chunk_size` + `vocoder_left_context` frames per sample).
+
+    Both terms are analytic upper-bound style models; `calibrate()` replaces their scale factors with
+    ratios measured on the current host.
+    """
+
+    def __init__(
+        self,
+        config: Qwen3TTSConfig,
+        dtype: torch.dtype = torch.bfloat16,
+        kv_dtype: Optional[torch.dtype] = None,
+        vocoder_bytes_per_frame: Optional[int] = None,
+        vocoder_chunk_size: int = 300,
+        vocoder_left_context: int = 25,
+        talker_scale: float = 1.0,
+        vocoder_scale: float = 1.0,
+        overhead_bytes: int = 0,
+    ):
+        self.talker_config = config.talker_config
+        self.code_predictor_config = config.talker_config.code_predictor_config
+        self.dtype = dtype
+        self.kv_dtype = kv_dtype or dtype
+        self.vocoder_bytes_per_frame = vocoder_bytes_per_frame
+        self.vocoder_chunk_size = vocoder_chunk_size
+        self.vocoder_left_context = vocoder_left_context
+        self.talker_scale = talker_scale
+        self.vocoder_scale = vocoder_scale
+        self.overhead_bytes = overhead_bytes
+
+    @classmethod
+    def from_model(cls, model, **kwargs) -> "Qwen3TTSMemoryEstimator":
+        """
+        Build an estimator for a loaded `Qwen3TTSModel`, reading dtypes and the vocoder config from it.
+
+        Args:
+            model (Qwen3TTSModel): Loaded wrapper.
+            **kwargs: Overrides for `Qwen3TTSMemoryEstimator.__init__`, e.g. kv_dtype=torch.float8_e4m3fn.
+
+        Raises:
+            ValueError: If the speech tokenizer is not 12Hz and `vocoder_bytes_per_frame` is not given.
+        """
+        kwargs.setdefault("dtype", model.model.dtype)
+        if "vocoder_bytes_per_frame" not in kwargs:
+            speech_tokenizer = model.model.speech_tokenizer
+            _check_12hz(speech_tokenizer, "Pass vocoder_bytes_per_frame explicitly.")
+            decoder = speech_tokenizer.model.decoder
+            kwargs["vocoder_bytes_per_frame"] = decoder_bytes_per_frame(decoder.config, decoder.dtype)
+        return cls(model.model.config, **kwargs)
+
+    def _kv_bytes_per_token(self, config) -> int:
+        head_dim = getattr(config, "head_dim", None) or config.hidden_size // config.num_attention_heads
+        return 2 * config.num_hidden_layers * config.num_key_value_heads * head_dim * _element_size(self.kv_dtype)
+
+    def _talker_bytes(self, prompt_lengths: Sequence[int], max_new_tokens: int) -> int:
+        cfg, cp_cfg = self.talker_config, self.code_predictor_config
+        act = _element_size(self.dtype)
+        batch_size = len(prompt_lengths)
+        prompt_len = max(prompt_lengths)
+        seq_len = prompt_len + max_new_tokens  # batched prompts are left padded to the longest one
+
+        kv_cache = self._kv_bytes_per_token(cfg) * batch_size * seq_len
+        code_predictor_kv = self._kv_bytes_per_token(cp_cfg) * batch_size * (cfg.num_code_groups + 1)
+        kept_hidden = (cfg.num_hidden_layers + 1) * cfg.hidden_size * act * batch_size * seq_len
+        prefill = batch_size * prompt_len * (4 * cfg.hidden_size + 2 * cfg.intermediate_size) * act
+        prefill += batch_size * cfg.num_attention_heads * prompt_len * prompt_len * act
+        logits = 2 * batch_size * cfg.vocab_size * 4
+        return kv_cache + code_predictor_kv + kept_hidden + prefill + logits
+
+    def _vocoder_bytes(self, batch_size: int, frames: int) -> int:
+        window = min(frames, self.vocoder_chunk_size + self.vocoder_left_context)
+        return batch_size * window * int(self.vocoder_bytes_per_frame or 0)
+
+    def estimate(self, prompt_lengths: Sequence[int], max_new_tokens: int, ref_frames: int = 0) -> MemoryEstimate:
+        """
+        Predict the peak memory of one batched call.
+
+        Args:
+            prompt_lengths (Sequence[int]):
+                Talker prompt length of each sample in the batch (see `estimate_prompt_length`).
+            max_new_tokens (int):
+                Generation limit of the call.
+            ref_frames (int):
+                Longest reference code prepended before decoding (voice clone ICL mode).
+
+        Returns:
+            MemoryEstimate
+        """
+        if len(prompt_lengths) == 0:
+            return MemoryEstimate(talker=0, vocoder=0, overhead=self.overhead_bytes)
+        return MemoryEstimate(
+            talker=int(self.talker_scale * self._talker_bytes(prompt_lengths, max_new_tokens)),
+            vocoder=int(self.vocoder_scale * self._vocoder_bytes(len(prompt_lengths), max_new_tokens + ref_frames)),
+            overhead=self.overhead_bytes,
+        )
+
+    def max_prefix(
+        self,
+        prompt_lengths: Sequence[int],
+        max_new_tokens: int,
+        budget_bytes: int,
+        ref_frames: int = 0,
+        pipelined: bool = False,
+    ) -> int:
+        """
+        Largest `n` such that the first `n` samples fit in `budget_bytes` when run as one batch.
+
+        Returns:
+            int: 0 if not even one sample fits.
+        """
+        n = 0
+        for i in range(1, len(prompt_lengths) + 1):
+            est = self.estimate(prompt_lengths[:i], max_new_tokens, ref_frames=ref_frames)
+            if (est.total_pipelined if pipelined else est.total) > budget_bytes:
+                break
+            n = i
+        return n
+
+    def max_batch_size(
+        self,
+        prompt_length: int,
+        max_new_tokens: int,
+        budget_bytes: int,
+        limit: int = 256,
+        pipelined: bool = False,
+    ) -> int:
+        """
+        Largest batch of samples with `prompt_length` tokens that fits in `budget_bytes` (at most `limit`).
+        """
+        return self.max_prefix([prompt_length] * limit, max_new_tokens, budget_bytes, pipelined=pipelined)
+
+    def calibrate(
+        self,
+        model,
+        batch_sizes: Sequence[int] = (1, 2, 4),
+        text: str = "Calibration sentence used to measure the memory used by batched speech generation.",
+        max_new_tokens: int = 256,
+    ) -> Dict[str, Any]:
+        """
+        Measure peak CUDA memory of real talker and vocoder runs on this host and set
+        `talker_scale` / `vocoder_scale` to the largest measured / predicted ratio.
+
+        Args:
+            model (Qwen3TTSModel):
+                The loaded model the estimator is used for.
+            batch_sizes (Sequence[int]):
+                Batch sizes to measure.
+            text (str):
+                Text synthesized for the talker measurement.
+            max_new_tokens (int):
+                Generation limit of the talker measurement; also the number of frames decoded per sample.
+
+        Returns:
+            Dict[str, Any]: The new scales and the raw measurements.
+
+        Raises:
+            ValueError: If the model is not on a CUDA device, its speech tokenizer is not 12Hz, or it is a
+                CustomVoice model without speakers.
+        """
+        device = torch.device(model.device)
+        if device.type != "cuda":
+            raise ValueError(f"Memory calibration measures CUDA memory, but the model is on {device}.")
+        speech_tokenizer = model.model.speech_tokenizer
+        _check_12hz(speech_tokenizer, "Its decode needs x-vectors and reference mels, not just codes.")
+
+        prompt_length = estimate_prompt_length(model, text)
+        num_code_groups = self.talker_config.num_code_groups
+        codebook_size = int(speech_tokenizer.model.decoder.config.codebook_size)
+
+        measurements: List[Dict[str, Any]] = []
+        for batch_size in batch_sizes:
+            task, kwargs = _calibration_request(model, text, batch_size)
+            kwargs["max_new_tokens"] = max_new_tokens
+
+            talker_peak, codes = _measure_peak(device, lambda: model._talker_stage(task)(**kwargs)[0])
+            frames = max(int(c.shape[0]) for c in codes) + 1
+            talker_pred = self._talker_bytes([prompt_length] * batch_size, frames)
+
+            vocoder_frames = min(max_new_tokens, self.vocoder_chunk_size + self.vocoder_left_context)
+            fake_codes = [
+                torch.randint(1, codebook_size, (vocoder_frames, num_code_groups), device=device)
+                for _ in range(batch_size)
+            ]
+            vocoder_peak, _ = _measure_peak(device, lambda: model._decode_talker_codes(fake_codes))
+            vocoder_pred = self._vocoder_bytes(batch_size, vocoder_frames)
+
+            measurements.append(dict(
+                batch_size=batch_size,
+                talker_frames=frames,
+                talker_peak=talker_peak,
+                talker_predicted=talker_pred,
+                vocoder_peak=vocoder_peak,
+                vocoder_predicted=vocoder_pred,
+            ))
+
+        self.talker_scale = max(m["talker_peak"] / max(m["talker_predicted"], 1) for m in measurements)
+        if self.vocoder_bytes_per_frame:
+            self.vocoder_scale = max(m["vocoder_peak"] / max(m["vocoder_predicted"], 1) for m in measurements)
+        return dict(talker_scale=self.talker_scale, vocoder_scale=self.vocoder_scale, measurements=measurements)
+
+
+def estimate_prompt_length(
+    model,
+    text: str,
+    instruct: Optional[str] = None,
+    ref_text: Optional[str] = None,
+    ref_frames: int = 0,
+) -> int:
+    """
+    Approximate talker prompt length (in positions) of one sample, by tokenizing its text parts.
+
+    Args:
+        model (Qwen3TTSModel): Wrapper whose processor is used for tokenization.
+        text (str): Text to synthesize.
+        instruct (Optional[str]): Instruction text, if any.
+        ref_text (Optional[str]): Reference transcript (voice clone ICL mode).
+        ref_frames (int): Reference codec frames (voice clone ICL mode).
+
+    Returns:
+        int
+    """
+    length = PROMPT_OVERHEAD_TOKENS + ref_frames
+    length += int(model._tokenize_texts([model._build_assistant_text(text)])[0].shape[-1])
+    if instruct:
+        length += int(model._tokenize_texts([model._build_instruct_text(instruct)])[0].shape[-1])
+    if ref_text:
+        length += int(model._tokenize_texts([model._build_ref_text(ref_text)])[0].shape[-1])
+    return length
+
+
+def _measure_peak(device: torch.device, fn) -> Tuple[int, Any]:
+    torch.cuda.synchronize(device)
+    torch.cuda.reset_peak_memory_stats(device)
+    base = torch.cuda.memory_allocated(device)
+    with torch.no_grad():
+        out = fn()
+    torch.cuda.synchronize(device)
+    return torch.cuda.max_memory_allocated(device) - base, out
+
+
+def _check_12hz(speech_tokenizer, hint: str) -> None:
+    # Only the 12Hz decoder has an analytic memory model and decodes from codes alone.
+    model_type = speech_tokenizer.get_model_type()
+    if model_type != "qwen3_tts_tokenizer_12hz":
+        raise ValueError(f"Vocoder memory can only be modeled for the 12Hz speech tokenizer, got {model_type}. {hint}")
+
+
+def _calibration_request(model, text: str, batch_size: int) -> Tuple[str, Dict[str, Any]]:
+    tts_model_type = model.model.tts_model_type
+    request: Dict[str, Any] = dict(text=[text] * batch_size, language="Auto", do_sample=True)
+    if tts_model_type == "custom_voice":
+        speakers = model.get_supported_speakers()
+        if not speakers:
+            raise ValueError("Cannot calibrate a CustomVoice model without supported speakers.")
+        request.update(speaker=speakers[0])
+        return "custom_voice", request
+    if tts_model_type == "voice_design":
+        request.update(instruct="")
+        return "voice_design", request
+    # x-vector only prompt with a neutral speaker embedding: no reference audio needed
+    spk_embedding = torch.zeros(model.model.config.talker_config.hidden_size)
+    request.update(voice_clone_prompt=dict(
+        ref_code=[None] * batch_size,
+        ref_spk_embedding=[spk_embedding] * batch_size,
+        x_vector_only_mode=[True] * batch_size,
+        icl_mode=[False] * batch_size,
+    ))
+    return "voice_clone", request
@@ -13,20 +13,29 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import asyncio
 import base64
+import contextlib
 import io
+import threading
 import urllib.request
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Tuple, Union
+from functools import partial
+from typing import Any, AsyncIterator, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 from urllib.parse import urlparse
 
 import librosa
 import numpy as np
 import soundfile as sf
 import torch
-from transformers import AutoConfig, AutoModel, AutoProcessor
+from transformers import AutoConfig, AutoModel, AutoProcessor, StoppingCriteria, StoppingCriteriaList
 
 from ..core.models import Qwen3TTSConfig, Qwen3TTSForConditionalGeneration, Qwen3TTSProcessor
+from .qwen3_tts_batching import Qwen3TTSBatchScheduler
+from .qwen3_tts_cache import Qwen3TTSFeatureCache, hash_audio
+from .qwen3_tts_memory import Qwen3TTSMemoryEstimator
 
 AudioLike = Union[
     str,                     # wav path, URL, base64
@@ -51,6 +60,48 @@ class VoiceClonePromptItem:
     ref_text: Optional[str] = None
 
 
+class CancellationCriteria(StoppingCriteria):
+    """
+    Stops every sequence of a `generate()` call at the next decode step once `event` is set.
+    """
+
+    def __init__(self, event: threading.Event):
+        self.event = event
+
+    def __call__(self, input_ids: torch.LongTensor, scores: torch.FloatTensor, **kwargs) -> torch.BoolTensor:
+        return torch.full((input_ids.shape[0],), self.event.is_set(), dtype=torch.bool, device=input_ids.device)
+
+
+@contextlib.contextmanager
+def codec_frame_hook(talker: torch.nn.Module, callback: Optional[Callable[[torch.Tensor], None]]):
+    """
+    Call `callback(codec_ids)` with the (B, num_code_groups) codec frame completed by each talker decode step of
+    the `generate()` run by the calling thread.
+
+    The hook sees every forward of the shared talker, including those of other threads (the batching scheduler,
+    `generate_pipelined` or plain `generate_*` calls), so it only forwards frames produced on the thread that
+    entered the context.
+    """
+    if callback is None:
+        yield
+        return
+
+    owner = threading.get_ident()
+
+    def hook(module, args, output):
+        if threading.get_ident() != owner:
+            return
+        codec_ids = output.hidden_states[-1]
+        if codec_ids is not None:
+            callback(codec_ids)
+
+    handle = talker.register_forward_hook(hook)
+    try:
+        yield
+    finally:
+        handle.remove()
+
+
 class Qwen3TTSModel:
     """
     A HuggingFace-style wrapper for Qwen3 TTS models (CustomVoice/VoiceDesign/Base) that provides:
@@ -59,6 +110,8 @@ class Qwen3TTSModel:
           * CustomVoice: generate_custom_voice()
           * VoiceDesign: generate_voice_design()
           * Base: generate_voice_clone() + create_voice_clone_prompt()
+      - thread-safe dynamic micro-batching via submit()
+      - asyncio APIs: agenerate_*() coroutines and astream_*() async iterators
       - consistent output: (wavs: List[np.ndarray], sample_rate: int)
 
     Notes:
@@ -71,6 +124,12 @@ class Qwen3TTSModel:
         self.model = model
         self.processor = processor
         self.generate_defaults = generate_defaults or {}
+        self.batch_scheduler: Optional[Qwen3TTSBatchScheduler] = None
+        self._batch_scheduler_lock = threading.Lock()
+        self._async_executors: Dict[str, ThreadPoolExecutor] = {}
+        self._async_executors_lock = threading.Lock()
+        self._memory_estimator: Optional[Qwen3TTSMemoryEstimator] = None
+        self.prompt_cache: Optional[Qwen3TTSFeatureCache] = None
 
         self.device = getattr(model, "device", None)
         if self.device is None:
@@ -83,6 +142,7 @@ class Qwen3TTSModel:
     def from_pretrained(
         cls,
         pretrained_model_name_or_path: str,
+        processor: Optional[Qwen3TTSProcessor] = None,
         **kwargs,
     ) -> "Qwen3TTSModel":
         """
@@ -91,12 +151,14 @@ class Qwen3TTSModel:
         This method:
           1) Loads config via AutoConfig (so your side can register model_type -> config/model).
           2) Loads the model via AutoModel.from_pretrained(...), forwarding `kwargs` unchanged.
-          3) Loads the processor via AutoProcessor.from_pretrained(model_path).
+          3) Loads the processor via AutoProcessor.from_pretrained(model_path), unless `processor` is given.
           4) Loads optional `generate_config.json` from the model directory/repo snapshot if present.
 
         Args:
             pretrained_model_name_or_path (str):
                 HuggingFace repo id or local directory of the model.
+            processor (Optional[Qwen3TTSProcessor]):
+                An already loaded processor to reuse instead of loading one from the checkpoint.
             **kwargs:
                 Forwarded as-is into `AutoModel.from_pretrained(...)`.
                 Typical examples: device_map="cuda:0", dtype=torch.bfloat16, attn_implementation="flash_attention_2".
@@ -115,7 +177,8 @@ class Qwen3TTSModel:
                 f"AutoModel returned {type(model)}, expected Qwen3TTSForConditionalGeneration. "
             )
 
-        processor = AutoProcessor.from_pretrained(pretrained_model_name_or_path, fix_mistral_regex=True,)
+        if processor is None:
+            processor = AutoProcessor.from_pretrained(pretrained_model_name_or_path, fix_mistral_regex=True,)
 
         generate_defaults = model.generate_config
         return cls(model=model, processor=processor, generate_defaults=generate_defaults)
@@ -417,6 +480,44 @@ class Qwen3TTSModel:
 
         normalized = self._normalize_audio_inputs(ref_audio_list)
 
+        for i, (rtext, xvec_only) in enumerate(zip(ref_text_list, xvec_list)):
+            if not xvec_only:
+                if rtext is None or rtext == "":
+                    raise ValueError(f"ref_text is required when x_vector_only_mode=False (ICL mode). Bad index={i}")
+
+        features: List[Optional[Dict[str, torch.Tensor]]] = [None] * len(normalized)
+        keys: List[Optional[str]] = [None] * len(normalized)
+        if self.prompt_cache is not None:
+            namespace = f"voice_clone_prompt:{self.model.config._name_or_path}"
+            for i, (wav, sr) in enumerate(normalized):
+                keys[i] = hash_audio(wav, sr, namespace)
+                entry = self.prompt_cache.get(keys[i])
+                if entry is not None:
+                    features[i] = {name: value.to(self.device) for name, value in entry.items()}
+
+        missing = [i for i, entry in enumerate(features) if entry is None]
+        for i, entry in zip(missing, self._extract_voice_clone_features([normalized[i] for i in missing])):
+            features[i] = entry
+            if self.prompt_cache is not None:
+                self.prompt_cache.put(keys[i], entry)
+
+        items: List[VoiceClonePromptItem] = []
+        for entry, rtext, xvec_only in zip(features, ref_text_list, xvec_list):
+            items.append(
+                VoiceClonePromptItem(
+                    ref_code=None if xvec_only else entry["ref_code"],
+                    ref_spk_embedding=entry["ref_spk_embedding"],
+                    x_vector_only_mode=bool(xvec_only),
+                    icl_mode=bool(not xvec_only),
+                    ref_text=rtext,
+                )
+            )
+        return items
+
+    def _extract_voice_clone_features(self, normalized: List[Tuple[np.ndarray, int]]) -> List[Dict[str, torch.Tensor]]:
+        if not normalized:
+            return []
+
         ref_wavs_for_code: List[np.ndarray] = []
         ref_sr_for_code: List[int] = []
         for wav, sr in normalized:
@@ -431,12 +532,8 @@ class Qwen3TTSModel:
             for wav, sr in normalized:
                 ref_codes.append(self.model.speech_tokenizer.encode(wav, sr=sr).audio_codes[0])
 
-        items: List[VoiceClonePromptItem] = []
-        for i, ((wav, sr), code, rtext, xvec_only) in enumerate(zip(normalized, ref_codes, ref_text_list, xvec_list)):
-            if not xvec_only:
-                if rtext is None or rtext == "":
-                    raise ValueError(f"ref_text is required when x_vector_only_mode=False (ICL mode). Bad index={i}")
-
+        features: List[Dict[str, torch.Tensor]] = []
+        for (wav, sr), code in zip(normalized, ref_codes):
             wav_resample = wav
             if sr != self.model.speaker_encoder_sample_rate:
                 wav_resample = librosa.resample(y=wav_resample.astype(np.float32), 
@@ -445,17 +542,27 @@ class Qwen3TTSModel:
 
             spk_emb = self.model.extract_speaker_embedding(audio=wav_resample,
                                                            sr=self.model.speaker_encoder_sample_rate)
+            features.append(dict(ref_code=code, ref_spk_embedding=spk_emb))
+        return features
 
-            items.append(
-                VoiceClonePromptItem(
-                    ref_code=None if xvec_only else code,
-                    ref_spk_embedding=spk_emb,
-                    x_vector_only_mode=bool(xvec_only),
-                    icl_mode=bool(not xvec_only),
-                    ref_text=rtext,
-                )
-            )
-        return items
+    def enable_prompt_cache(self, max_items: int = 256, cache_dir: Optional[str] = None) -> Qwen3TTSFeatureCache:
+        """
+        Cache the reference codes and speaker embedding computed by `create_voice_clone_prompt` (and the
+        `generate_voice_clone` calls that build prompts from `ref_audio`), keyed by a hash of the decoded PCM and
+        its sampling rate. A repeated reference clip then skips resampling, the speech tokenizer and the
+        speaker encoder.
+
+        Args:
+            max_items (int, default=256):
+                Entries kept in memory (least recently used are evicted).
+            cache_dir (Optional[str]):
+                Optional directory for a persistent disk tier; use one directory per checkpoint.
+
+        Returns:
+            Qwen3TTSFeatureCache: The new cache, also stored in `self.prompt_cache`. Set it to `None` to disable.
+        """
+        self.prompt_cache = Qwen3TTSFeatureCache(max_items=max_items, cache_dir=cache_dir)
+        return self.prompt_cache
 
     def _prompt_items_to_voice_clone_prompt(self, items: List[VoiceClonePromptItem]) -> Dict[str, Any]:
         return dict(
@@ -531,6 +638,10 @@ class Qwen3TTSModel:
                 Top-p for sub-talker sampling (only valid for qwen3-tts-tokenizer-v2).
             subtalker_temperature:
                 Temperature for sub-talker sampling (only valid for qwen3-tts-tokenizer-v2).
+            subtalker_num_code_groups:
+                Preview mode (only valid for qwen3-tts-tokenizer-v2): predict only the first N code groups per
+                frame and decode from those N quantizers; the codes have N groups per frame. Lower N skips
+                sub-talker steps and decodes faster at lower audio quality. Defaults to all code groups.
             max_new_tokens:
                 Maximum number of new codec tokens to generate.
             **kwargs:
@@ -545,6 +656,36 @@ class Qwen3TTSModel:
             ValueError:
                 If batch sizes mismatch or required prompt inputs are missing.
         """
+        codes_for_decode, ref_code_lens = self._talker_voice_clone(
+            text=text,
+            language=language,
+            ref_audio=ref_audio,
+            ref_text=ref_text,
+            x_vector_only_mode=x_vector_only_mode,
+            voice_clone_prompt=voice_clone_prompt,
+            non_streaming_mode=non_streaming_mode,
+            **kwargs,
+        )
+        return self._decode_talker_codes(codes_for_decode, ref_code_lens, kwargs.get("subtalker_num_code_groups", None))
+
+    def _talker_voice_clone(
+        self,
+        text: Union[str, List[str]],
+        language: Union[str, List[str]] = None,
+        ref_audio: Optional[Union[AudioLike, List[AudioLike]]] = None,
+        ref_text: Optional[Union[str, List[Optional[str]]]] = None,
+        x_vector_only_mode: Union[bool, List[bool]] = False,
+        voice_clone_prompt: Optional[Union[Dict[str, Any], List[VoiceClonePromptItem]]] = None,
+        non_streaming_mode: bool = False,
+        **kwargs,
+    ) -> Tuple[List[torch.Tensor], List[Optional[int]]]:
+        """
+        Talker stage of `generate_voice_clone`: validate inputs and generate codec tokens.
+
+        Returns:
+            Tuple[List[torch.Tensor], List[Optional[int]]]:
+                (codes with the reference codes prepended, number of prepended reference frames per sample)
+        """
         if self.model.tts_model_type != "base":
             raise ValueError(
                 f"model with \ntokenizer_type: {self.model.tokenizer_type}\n"
@@ -609,28 +750,21 @@ class Qwen3TTSModel:
             **gen_kwargs,
         )
 
-        codes_for_decode = []
+        ref_code_list = voice_clone_prompt_dict.get("ref_code", None)
+        codes_for_decode: List[torch.Tensor] = []
+        ref_code_lens: List[Optional[int]] = []
         for i, codes in enumerate(talker_codes_list):
-            ref_code_list = voice_clone_prompt_dict.get("ref_code", None)
             if ref_code_list is not None and ref_code_list[i] is not None:
-                codes_for_decode.append(torch.cat([ref_code_list[i].to(codes.device), codes], dim=0))
+                ref_code = ref_code_list[i].to(codes.device)
+                if ref_code.dim() == 2:
+                    # preview mode generates fewer code groups than the reference was encoded with
+                    ref_code = ref_code[:, : codes.shape[1]]
+                codes_for_decode.append(torch.cat([ref_code, codes], dim=0))
+                ref_code_lens.append(int(ref_code_list[i].shape[0]))
             else:
                 codes_for_decode.append(codes)
-
-        wavs_all, fs = self.model.speech_tokenizer.decode([{"audio_codes": c} for c in codes_for_decode])
-
-        wavs_out: List[np.ndarray] = []
-        for i, wav in enumerate(wavs_all):
-            ref_code_list = voice_clone_prompt_dict.get("ref_code", None)
-            if ref_code_list is not None and ref_code_list[i] is not None:
-                ref_len = int(ref_code_list[i].shape[0])
-                total_len = int(codes_for_decode[i].shape[0])
-                cut = int(ref_len / max(total_len, 1) * wav.shape[0])
-                wavs_out.append(wav[cut:])
-            else:
-                wavs_out.append(wav)
-
-        return wavs_out, fs
+                ref_code_lens.append(None)
+        return codes_for_decode, ref_code_lens
 
     # voice design model
     @torch.no_grad()
@@ -673,6 +807,10 @@ class Qwen3TTSModel:
                 Top-p for sub-talker sampling (only valid for qwen3-tts-tokenizer-v2).
             subtalker_temperature:
                 Temperature for sub-talker sampling (only valid for qwen3-tts-tokenizer-v2).
+            subtalker_num_code_groups:
+                Preview mode (only valid for qwen3-tts-tokenizer-v2): predict only the first N code groups per
+                frame and decode from those N quantizers; the codes have N groups per frame. Lower N skips
+                sub-talker steps and decodes faster at lower audio quality. Defaults to all code groups.
             max_new_tokens:
                 Maximum number of new codec tokens to generate.
             **kwargs:
@@ -683,6 +821,30 @@ class Qwen3TTSModel:
             Tuple[List[np.ndarray], int]:
                 (wavs, sample_rate)
         """
+        codes_for_decode, ref_code_lens = self._talker_voice_design(
+            text=text,
+            instruct=instruct,
+            language=language,
+            non_streaming_mode=non_streaming_mode,
+            **kwargs,
+        )
+        return self._decode_talker_codes(codes_for_decode, ref_code_lens, kwargs.get("subtalker_num_code_groups", None))
+
+    def _talker_voice_design(
+        self,
+        text: Union[str, List[str]],
+        instruct: Union[str, List[str]],
+        language: Union[str, List[str]] = None,
+        non_streaming_mode: bool = True,
+        **kwargs,
+    ) -> Tuple[List[torch.Tensor], List[Optional[int]]]:
+        """
+        Talker stage of `generate_voice_design`: validate inputs and generate codec tokens.
+
+        Returns:
+            Tuple[List[torch.Tensor], List[Optional[int]]]:
+                (codes per sample, None per sample as no reference codes are prepended)
+        """
         if self.model.tts_model_type != "voice_design":
             raise ValueError(
                 f"model with \ntokenizer_type: {self.model.tokenizer_type}\n"
@@ -724,8 +886,7 @@ class Qwen3TTSModel:
             **gen_kwargs,
         )
 
-        wavs, fs = self.model.speech_tokenizer.decode([{"audio_codes": c} for c in talker_codes_list])
-        return wavs, fs
+        return talker_codes_list, [None] * len(talker_codes_list)
 
     # custom voice model
     @torch.no_grad()
@@ -771,6 +932,10 @@ class Qwen3TTSModel:
                 Top-p for sub-talker sampling (only valid for qwen3-tts-tokenizer-v2).
             subtalker_temperature:
                 Temperature for sub-talker sampling (only valid for qwen3-tts-tokenizer-v2).
+            subtalker_num_code_groups:
+                Preview mode (only valid for qwen3-tts-tokenizer-v2): predict only the first N code groups per
+                frame and decode from those N quantizers; the codes have N groups per frame. Lower N skips
+                sub-talker steps and decodes faster at lower audio quality. Defaults to all code groups.
             max_new_tokens:
                 Maximum number of new codec tokens to generate.
             **kwargs:
@@ -785,6 +950,32 @@ class Qwen3TTSModel:
             ValueError:
                 If any speaker/language is unsupported or batch sizes mismatch.
         """
+        codes_for_decode, ref_code_lens = self._talker_custom_voice(
+            text=text,
+            speaker=speaker,
+            language=language,
+            instruct=instruct,
+            non_streaming_mode=non_streaming_mode,
+            **kwargs,
+        )
+        return self._decode_talker_codes(codes_for_decode, ref_code_lens, kwargs.get("subtalker_num_code_groups", None))
+
+    def _talker_custom_voice(
+        self,
+        text: Union[str, List[str]],
+        speaker: Union[str, List[str]],
+        language: Union[str, List[str]] = None,
+        instruct: Optional[Union[str, List[str]]] = None,
+        non_streaming_mode: bool = True,
+        **kwargs,
+    ) -> Tuple[List[torch.Tensor], List[Optional[int]]]:
+        """
+        Talker stage of `generate_custom_voice`: validate inputs and generate codec tokens.
+
+        Returns:
+            Tuple[List[torch.Tensor], List[Optional[int]]]:
+                (codes per sample, None per sample as no reference codes are prepended)
+        """
         if self.model.tts_model_type != "custom_voice":
             raise ValueError(
                 f"model with \ntokenizer_type: {self.model.tokenizer_type}\n"
@@ -835,9 +1026,512 @@ class Qwen3TTSModel:
             **gen_kwargs,
         )
 
-        wavs, fs = self.model.speech_tokenizer.decode([{"audio_codes": c} for c in talker_codes_list])
-        return wavs, fs
+        return talker_codes_list, [None] * len(talker_codes_list)
+
+    def _talker_stage(self, task: str):
+        talker_stages = {
+            "custom_voice": self._talker_custom_voice,
+            "voice_design": self._talker_voice_design,
+            "voice_clone": self._talker_voice_clone,
+        }
+        if task not in talker_stages:
+            raise ValueError(f"Unknown task: {task}. Expected one of {sorted(talker_stages)}.")
+        return talker_stages[task]
+
+    def _decode_talker_codes(
+        self,
+        codes_for_decode: List[torch.Tensor],
+        ref_code_lens: Optional[List[Optional[int]]] = None,
+        num_quantizers: Optional[int] = None,
+    ) -> Tuple[List[np.ndarray], int]:
+        """
+        Vocoder stage shared by all generate_* methods: decode codec tokens with the speech tokenizer
+        and cut the audio of prepended reference codes (voice clone ICL mode). `num_quantizers` decodes
+        a preview from the first code groups only (see `subtalker_num_code_groups`).
+        """
+        wavs_all, fs = self.model.speech_tokenizer.decode(
+            [{"audio_codes": c} for c in codes_for_decode], num_quantizers=num_quantizers
+        )
+        if ref_code_lens is None:
+            return wavs_all, fs
+
+        wavs_out: List[np.ndarray] = []
+        for wav, codes, ref_len in zip(wavs_all, codes_for_decode, ref_code_lens):
+            if ref_len is not None:
+                total_len = int(codes.shape[0])
+                cut = int(ref_len / max(total_len, 1) * wav.shape[0])
+                wavs_out.append(wav[cut:])
+            else:
+                wavs_out.append(wav)
+        return wavs_out, fs
+
+    def _vocoder_worker(
+        self,
+        codes_for_decode: List[torch.Tensor],
+        ref_code_lens: List[Optional[int]],
+        stream: Optional["torch.cuda.Stream"],
+        ready: Optional["torch.cuda.Event"],
+        num_quantizers: Optional[int] = None,
+    ) -> Tuple[List[np.ndarray], int]:
+        if stream is None:
+            return self._decode_talker_codes(codes_for_decode, ref_code_lens, num_quantizers)
+        # Decode on a side stream so vocoder kernels can overlap with the talker on the default stream.
+        stream.wait_event(ready)
+        with torch.cuda.stream(stream):
+            return self._decode_talker_codes(codes_for_decode, ref_code_lens, num_quantizers)
+
+    def generate_pipelined(
+        self,
+        task: str,
+        requests: Iterable[Dict[str, Any]],
+        max_pending: int = 2,
+        talker_threads: Optional[int] = None,
+        vocoder_threads: Optional[int] = None,
+    ) -> Iterator[Tuple[List[np.ndarray], int]]:
+        """
+        Run a stream of generation batches with the talker and the speech tokenizer decoder overlapped.
+
+        Each request is one (possibly batched) call of the generate_* method selected by `task`.
+        While the talker generates codec tokens for request `i + 1`, the codes of request `i` are
+        decoded to audio on a dedicated vocoder worker thread (on its own CUDA stream when the
+        model lives on a GPU). Results are yielded in request order.
+
+        Args:
+            task (str):
+                One of "custom_voice", "voice_design", "voice_clone".
+            requests (Iterable[Dict[str, Any]]):
+                Keyword arguments of the corresponding generate_* method, one dict per batch,
+                e.g. `{"text": [...], "speaker": [...], "language": [...], "max_new_tokens": 2048}`.
+                Can be a lazy iterator (e.g. fed from a queue).
+            max_pending (int):
+                Maximum number of batches left to the vocoder while the talker works on the next one.
+                When exceeded, the oldest batch is awaited before generating more. Bounds the memory held by codes.
+            talker_threads (Optional[int]):
+                Intra-op CPU threads for the talker stage (`torch.set_num_threads` in the calling thread).
+                Restored when the iterator is exhausted or closed. None keeps the current setting.
+            vocoder_threads (Optional[int]):
+                Intra-op CPU threads for the vocoder worker thread. None keeps the library default.
+
+        Yields:
+            Tuple[List[np.ndarray], int]:
+                (wavs, sample_rate) for each request, identical to the generate_* method output.
+
+        Raises:
+            ValueError:
+                If `task` is unknown or `max_pending` < 1.
+        """
+        talker_stage = self._talker_stage(task)
+        if max_pending < 1:
+            raise ValueError(f"max_pending must be >= 1, got {max_pending}")
+
+        stream = None
+        if self.device is not None and torch.device(self.device).type == "cuda":
+            stream = torch.cuda.Stream(device=self.device)
+
+        def _init_vocoder_thread():
+            if vocoder_threads is not None:
+                torch.set_num_threads(vocoder_threads)
+
+        prev_threads = torch.get_num_threads()
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="qwen3-tts-vocoder", initializer=_init_vocoder_thread)
+        pending: Deque[Future] = deque()
+        try:
+            if talker_threads is not None:
+                torch.set_num_threads(talker_threads)
+
+            for request in requests:
+                with torch.no_grad():
+                    codes_for_decode, ref_code_lens = talker_stage(**request)
+
+                ready = None
+                if stream is not None:
+                    ready = torch.cuda.Event()
+                    ready.record(torch.cuda.current_stream(self.device))
+                pending.append(executor.submit(
+                    self._vocoder_worker, codes_for_decode, ref_code_lens, stream, ready,
+                    request.get("subtalker_num_code_groups", None),
+                ))
+
+                while len(pending) > max_pending or (pending and pending[0].done()):
+                    yield pending.popleft().result()
+
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            for fut in pending:
+                fut.cancel()
+            executor.shutdown(wait=True)
+            if talker_threads is not None:
+                torch.set_num_threads(prev_threads)
+
+    def get_memory_estimator(self, **kwargs) -> Qwen3TTSMemoryEstimator:
+        """
+        Memory estimator used to size batches against a memory budget.
+
+        The estimator is created on first use; call `get_memory_estimator().calibrate(model)` once on the
+        serving host to replace its analytic constants with measured ones.
+
+        Args:
+            **kwargs:
+                If given, (re)create the estimator with these overrides,
+                e.g. kv_dtype=torch.float8_e4m3fn or vocoder_chunk_size=300.
+
+        Returns:
+            Qwen3TTSMemoryEstimator
+
+        Raises:
+            ValueError: If the speech tokenizer is not 12Hz and no `vocoder_bytes_per_frame` override is given.
+        """
+        if self._memory_estimator is None or kwargs:
+            self._memory_estimator = Qwen3TTSMemoryEstimator.from_model(self, **kwargs)
+        return self._memory_estimator
+
+    def _resolve_memory_budget(self, memory_budget: Optional[Union[int, str]]) -> Optional[int]:
+        if memory_budget != "auto":
+            return memory_budget
+        device = torch.device(self.device)
+        if device.type != "cuda":
+            raise ValueError(f"memory_budget='auto' needs a CUDA device, the model is on {device}. Pass a budget in bytes.")
+        free, _ = torch.cuda.mem_get_info(device)
+        return int(free * 0.9)
+
+    def configure_batching(
+        self,
+        max_batch_size: int = 8,
+        max_wait_ms: float = 10.0,
+        memory_budget: Optional[Union[int, str]] = None,
+    ) -> Qwen3TTSBatchScheduler:
+        """
+        Configure the dynamic micro-batching used by `submit()`.
+
+        A previously configured scheduler is shut down after finishing its queued requests.
+
+        Args:
+            max_batch_size (int):
+                Maximum number of requests run in one batched generate_* call.
+            max_wait_ms (float):
+                Maximum time the oldest queued request waits for compatible requests to join its batch.
+            memory_budget (Optional[Union[int, str]]):
+                Bytes available for generation on top of the loaded weights. Batches are cut to the
+                largest size whose predicted peak memory fits. "auto" uses 90% of the currently free
+                CUDA memory. None disables memory-aware sizing.
+
+        Returns:
+            Qwen3TTSBatchScheduler:
+                The new scheduler.
+        """
+        memory_budget = self._resolve_memory_budget(memory_budget)
+        with self._batch_scheduler_lock:
+            old = self.batch_scheduler
+            self.batch_scheduler = Qwen3TTSBatchScheduler(
+                self, max_batch_size=max_batch_size, max_wait_ms=max_wait_ms, memory_budget=memory_budget
+            )
+        if old is not None:
+            old.shutdown(wait=True)
+        return self.batch_scheduler
+
+    def submit(self, task: str, **kwargs) -> Future:
+        """
+        Thread-safe, non-blocking generation of a single sample with dynamic micro-batching.
+
+        Requests with the same task, language and sampling parameters that arrive within the
+        batching window are run together as one batched generate_* call by a background thread.
+        Uses default batching settings unless `configure_batching()` was called.
+
+        Args:
+            task (str):
+                One of "custom_voice", "voice_design", "voice_clone".
+            **kwargs:
+                Keyword arguments of `generate_custom_voice` / `generate_voice_design` / `generate_voice_clone`
+                for one sample (scalar `text`, `speaker`, `instruct`, `ref_audio`, ...).
+
+        Returns:
+            concurrent.futures.Future:
+                Resolves to `(wavs, sample_rate)` with a single waveform, like the generate_* methods.
+
+        Raises:
+            ValueError:
+                If the task is unknown or the request is invalid.
+        """
+        with self._batch_scheduler_lock:
+            if self.batch_scheduler is None:
+                self.batch_scheduler = Qwen3TTSBatchScheduler(self)
+            scheduler = self.batch_scheduler
+        return scheduler.submit(task, **kwargs)
+
+    def shutdown_batching(self, wait: bool = True) -> None:
+        """
+        Stop the micro-batching scheduler after its queued requests are done. `submit()` starts a new one.
+        """
+        with self._batch_scheduler_lock:
+            scheduler = self.batch_scheduler
+            self.batch_scheduler = None
+        if scheduler is not None:
+            scheduler.shutdown(wait=wait)
+
+    def _get_async_executor(self, stage: str = "talker") -> ThreadPoolExecutor:
+        # One thread per stage: inference calls are serialized, the vocoder of a stream runs beside the talker.
+        with self._async_executors_lock:
+            executor = self._async_executors.get(stage, None)
+            if executor is None:
+                executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"qwen3-tts-async-{stage}")
+                self._async_executors[stage] = executor
+            return executor
+
+    def shutdown_async(self, wait: bool = True) -> None:
+        """
+        Shut down the executors used by the agenerate_* / astream_* methods. They are recreated on next use.
+        """
+        with self._async_executors_lock:
+            executors = list(self._async_executors.values())
+            self._async_executors = {}
+        for executor in executors:
+            executor.shutdown(wait=wait)
+
+    def _generate_cancellable(
+        self,
+        task: str,
+        kwargs: Dict[str, Any],
+        cancel: threading.Event,
+        on_frame: Optional[Callable[[torch.Tensor], None]] = None,
+        decode: bool = True,
+    ) -> Optional[Tuple[List[np.ndarray], int]]:
+        """
+        Run a generate_* call that stops at the next decode step once `cancel` is set.
+        Returns None if cancelled (or if `decode` is False).
+        """
+        if cancel.is_set():
+            return None
+        kwargs = dict(kwargs)
+        stopping_criteria = StoppingCriteriaList(kwargs.pop("stopping_criteria", None) or [])
+        stopping_criteria.append(CancellationCriteria(cancel))
+        kwargs["stopping_criteria"] = stopping_criteria
+
+        # grad mode is thread-local, so it must be disabled in the worker thread itself
+        with torch.no_grad(), codec_frame_hook(self.model.talker, on_frame):
+            codes_for_decode, ref_code_lens = self._talker_stage(task)(**kwargs)
+            if cancel.is_set() or not decode:
+                return None
+            return self._decode_talker_codes(codes_for_decode, ref_code_lens, kwargs.get("subtalker_num_code_groups", None))
+
+    async def _agenerate(self, task: str, kwargs: Dict[str, Any]) -> Tuple[List[np.ndarray], int]:
+        loop = asyncio.get_running_loop()
+        cancel = threading.Event()
+        job = loop.run_in_executor(self._get_async_executor(), partial(self._generate_cancellable, task, kwargs, cancel))
+        try:
+            return await job
+        except asyncio.CancelledError:
+            cancel.set()
+            raise
+
+    async def agenerate_custom_voice(
+        self,
+        text: Union[str, List[str]],
+        speaker: Union[str, List[str]],
+        language: Union[str, List[str]] = None,
+        instruct: Optional[Union[str, List[str]]] = None,
+        non_streaming_mode: bool = True,
+        **kwargs,
+    ) -> Tuple[List[np.ndarray], int]:
+        """
+        Asyncio version of `generate_custom_voice`, run on a dedicated inference thread.
+
+        Cancelling the awaiting task stops generation at the next decode step and skips decoding.
+        """
+        kwargs.update(text=text, speaker=speaker, language=language, instruct=instruct, non_streaming_mode=non_streaming_mode)
+        return await self._agenerate("custom_voice", kwargs)
+
+    async def agenerate_voice_design(
+        self,
+        text: Union[str, List[str]],
+        instruct: Union[str, List[str]],
+        language: Union[str, List[str]] = None,
+        non_streaming_mode: bool = True,
+        **kwargs,
+    ) -> Tuple[List[np.ndarray], int]:
+        """
+        Asyncio version of `generate_voice_design`, run on a dedicated inference thread.
+
+        Cancelling the awaiting task stops generation at the next decode step and skips decoding.
+        """
+        kwargs.update(text=text, instruct=instruct, language=language, non_streaming_mode=non_streaming_mode)
+        return await self._agenerate("voice_design", kwargs)
+
+    async def agenerate_voice_clone(
+        self,
+        text: Union[str, List[str]],
+        language: Union[str, List[str]] = None,
+        ref_audio: Optional[Union[AudioLike, List[AudioLike]]] = None,
+        ref_text: Optional[Union[str, List[Optional[str]]]] = None,
+        x_vector_only_mode: Union[bool, List[bool]] = False,
+        voice_clone_prompt: Optional[Union[Dict[str, Any], List[VoiceClonePromptItem]]] = None,
+        non_streaming_mode: bool = False,
+        **kwargs,
+    ) -> Tuple[List[np.ndarray], int]:
+        """
+        Asyncio version of `generate_voice_clone`, run on a dedicated inference thread.
+
+        Cancelling the awaiting task stops generation at the next decode step and skips decoding.
+        """
+        kwargs.update(
+            text=text,
+            language=language,
+            ref_audio=ref_audio,
+            ref_text=ref_text,
+            x_vector_only_mode=x_vector_only_mode,
+            voice_clone_prompt=voice_clone_prompt,
+            non_streaming_mode=non_streaming_mode,
+        )
+        return await self._agenerate("voice_clone", kwargs)
+
+    def _decode_stream_chunk(self, decoder, frames: torch.Tensor, num_quantizers: Optional[int] = None) -> np.ndarray:
+        # frames: (T, Q) -> (1, Q, T), keeping the first num_quantizers code groups in preview mode
+        codes = frames[:, :num_quantizers].to(self.model.speech_tokenizer.device).transpose(0, 1).unsqueeze(0)
+        with torch.inference_mode():
+            wav = decoder.decode(codes)
+        return wav[0, 0].to(torch.float32).cpu().numpy()
+
+    async def _astream(
+        self,
+        task: str,
+        kwargs: Dict[str, Any],
+        chunk_frames: int,
+    ) -> AsyncIterator[Tuple[np.ndarray, int]]:
+        if self.model.speech_tokenizer.get_model_type() != "qwen3_tts_tokenizer_12hz":
+            raise ValueError("Streaming generation requires a model with the 12Hz speech tokenizer.")
+        if isinstance(kwargs["text"], list):
+            raise ValueError("Streaming generation takes a single `text`, got a list.")
+        if chunk_frames < 1:
+            raise ValueError(f"chunk_frames must be >= 1, got {chunk_frames}")
+
+        loop = asyncio.get_running_loop()
+        executor = self._get_async_executor()
+        vocoder_executor = self._get_async_executor("vocoder")
+        decoder = self.model.speech_tokenizer.create_streaming_decoder()
+
+        # In ICL voice clone mode the reference codes are the natural left context of the first chunk.
+        context = None
+        if task == "voice_clone":
+            prompt = kwargs.get("voice_clone_prompt", None)
+            if prompt is None:
+                if kwargs.get("ref_audio", None) is None:
+                    raise ValueError("Either `voice_clone_prompt` or `ref_audio` must be provided.")
+                prompt = await loop.run_in_executor(executor, partial(
+                    self.create_voice_clone_prompt,
+                    ref_audio=kwargs.pop("ref_audio"),
+                    ref_text=kwargs.pop("ref_text", None),
+                    x_vector_only_mode=kwargs.pop("x_vector_only_mode", False),
+                ))
+                kwargs["voice_clone_prompt"] = prompt
+            ref_codes = prompt["ref_code"] if isinstance(prompt, dict) else [it.ref_code for it in prompt]
+            context = ref_codes[0] if ref_codes else None
+
+        num_quantizers = kwargs.get("subtalker_num_code_groups", None)
+        eos_token_id = self.model.config.talker_config.codec_eos_token_id
+        frames: "asyncio.Queue[Optional[torch.Tensor]]" = asyncio.Queue()
+        cancel = threading.Event()
+
+        def on_frame(codec_ids: torch.Tensor) -> None:
+            loop.call_soon_threadsafe(frames.put_nowait, codec_ids[0])
+
+        job = loop.run_in_executor(
+            executor, partial(self._generate_cancellable, task, kwargs, cancel, on_frame=on_frame, decode=False)
+        )
+        job.add_done_callback(lambda _: frames.put_nowait(None))
+        fs = self.model.speech_tokenizer.get_output_sample_rate()
+
+        try:
+            if context is not None:
+                # prime the decoder state, the reference audio itself is not yielded
+                await loop.run_in_executor(vocoder_executor, self._decode_stream_chunk, decoder, context, num_quantizers)
+            pending: List[torch.Tensor] = []
+            finished = False
+            while not finished:
+                frame = await frames.get()
+                if frame is None or int(frame[0]) == eos_token_id:
+                    finished = True
+                else:
+                    pending.append(frame)
+                if pending and (finished or len(pending) >= chunk_frames):
+                    chunk = torch.stack(pending, dim=0)
+                    pending = []
+                    wav = await loop.run_in_executor(vocoder_executor, self._decode_stream_chunk, decoder, chunk, num_quantizers)
+                    yield wav, fs
+            # surface talker errors
+            await job
+        finally:
+            cancel.set()
+
+    def astream_custom_voice(
+        self,
+        text: str,
+        speaker: str,
+        language: str = None,
+        instruct: Optional[str] = None,
+        non_streaming_mode: bool = True,
+        chunk_frames: int = 12,
+        **kwargs,
+    ) -> AsyncIterator[Tuple[np.ndarray, int]]:
+        """
+        Stream one `generate_custom_voice` sample as audio chunks while it is being generated.
+
+        Every `chunk_frames` codec frames are decoded incrementally by a stateful streaming decoder
+        and yielded as `(wav_chunk, sample_rate)`. The concatenated chunks match the full-sequence decoder
+        forward; the offline decode of `generate_custom_voice` restarts its context every 300 frames (about 25 s),
+        so longer utterances differ slightly from it.
+        Leaving the `async for` loop early or cancelling the consuming task stops generation at the
+        next decode step.
+        Only supported with the 12Hz speech tokenizer.
+
+        Args:
+            chunk_frames (int):
+                Codec frames per yielded chunk (12 frames is 1 second of audio).
+        """
+        kwargs.update(text=text, speaker=speaker, language=language, instruct=instruct, non_streaming_mode=non_streaming_mode)
+        return self._astream("custom_voice", kwargs, chunk_frames)
+
+    def astream_voice_design(
+        self,
+        text: str,
+        instruct: str,
+        language: str = None,
+        non_streaming_mode: bool = True,
+        chunk_frames: int = 12,
+        **kwargs,
+    ) -> AsyncIterator[Tuple[np.ndarray, int]]:
+        """
+        Stream one `generate_voice_design` sample as audio chunks while it is being generated.
+        See `astream_custom_voice` for the chunking and cancellation behavior.
+        """
+        kwargs.update(text=text, instruct=instruct, language=language, non_streaming_mode=non_streaming_mode)
+        return self._astream("voice_design", kwargs, chunk_frames)
 
+    def astream_voice_clone(
+        self,
+        text: str,
+        language: str = None,
+        ref_audio: Optional[AudioLike] = None,
+        ref_text: Optional[str] = None,
+        x_vector_only_mode: bool = False,
+        voice_clone_prompt: Optional[Union[Dict[str, Any], List[VoiceClonePromptItem]]] = None,
+        non_streaming_mode: bool = False,
+        chunk_frames: int = 12,
+        **kwargs,
+    ) -> AsyncIterator[Tuple[np.ndarray, int]]:
+        """
+        Stream one `generate_voice_clone` sample as audio chunks while it is being generated.
+        See `astream_custom_voice` for the chunking and cancellation behavior.
+        """
+        kwargs.update(
+            text=text,
+            language=language,
+            ref_audio=ref_audio,
+            ref_text=ref_text,
+            x_vector_only_mode=x_vector_only_mode,
+            voice_clone_prompt=voice_clone_prompt,
+            non_streaming_mode=non_streaming_mode,
+        )
+        return self._astream("voice_clone", kwargs, chunk_frames)
 
     def get_supported_speakers(self) -> Optional[List[str]]:
         """
@@ -16,7 +16,7 @@
 import base64
 import io
 import urllib.request
-from typing import List, Optional, Tuple, Union
+from typing import Iterator, List, Optional, Tuple, Union
 from urllib.parse import urlparse
 
 import librosa
@@ -28,10 +28,16 @@ from transformers import AutoConfig, AutoFeatureExtractor, AutoModel
 
 from ..core import (
     Qwen3TTSTokenizerV1Config,
+    Qwen3TTSTokenizerV1EncoderOutput,
     Qwen3TTSTokenizerV1Model,
     Qwen3TTSTokenizerV2Config,
+    Qwen3TTSTokenizerV2EncoderOutput,
     Qwen3TTSTokenizerV2Model,
+    Qwen3TTSTokenizerV2OnnxDecoder,
+    export_decoder_to_onnx,
 )
+from ..core.utils import trailing_code_lengths
+from .qwen3_tts_cache import Qwen3TTSFeatureCache, hash_audio
 
 AudioInput = Union[
     str,  # wav path, or base64 string
@@ -59,6 +65,8 @@ class Qwen3TTSTokenizer:
         self.feature_extractor = None
         self.config = None
         self.device = None
+        self.onnx_decoder = None
+        self.cache: Optional[Qwen3TTSFeatureCache] = None
 
     @classmethod
     def from_pretrained(cls, pretrained_model_name_or_path: str, **kwargs) -> "Qwen3TTSTokenizer":
@@ -237,9 +245,31 @@ class Qwen3TTSTokenizer:
                   - audio_codes: List[torch.LongTensor] each (codes_len, num_quantizers)
 
             If return_dict=False, returns the raw tuple from model.encode.
+
+            With `enable_cache()`, clips already in the cache are not re-encoded.
         """
         wavs = self._normalize_audio_inputs(audios, sr=sr)
+        if self.cache is None or not return_dict:
+            return self._encode_wavs(wavs, return_dict=return_dict)
+
+        # Cached path: encode only the clips not seen before, then reassemble the per-item fields in order.
+        namespace = f"{self.get_model_type()}:{self.config._name_or_path}"
+        keys = [hash_audio(wav, self.get_input_sample_rate(), namespace) for wav in wavs]
+        entries = [self.cache.get(key) for key in keys]
+        missing = [i for i, entry in enumerate(entries) if entry is None]
+        if missing:
+            enc = self._encode_wavs([wavs[i] for i in missing], return_dict=True)
+            for j, i in enumerate(missing):
+                entries[i] = {name: value[j] for name, value in enc.items()}
+                self.cache.put(keys[i], entries[i])
+
+        if self.get_model_type() == "qwen3_tts_tokenizer_25hz":
+            output_cls = Qwen3TTSTokenizerV1EncoderOutput
+        else:
+            output_cls = Qwen3TTSTokenizerV2EncoderOutput
+        return output_cls(**{name: [entry[name].to(self.device) for entry in entries] for name in entries[0]})
 
+    def _encode_wavs(self, wavs: List[np.ndarray], return_dict: bool = True):
         inputs = self.feature_extractor(
             raw_audio=wavs,
             sampling_rate=int(self.feature_extractor.sampling_rate),
@@ -256,9 +286,88 @@ class Qwen3TTSTokenizer:
             )
         return enc
 
+    def enable_cache(self, max_items: int = 256, cache_dir: Optional[str] = None) -> Qwen3TTSFeatureCache:
+        """
+        Cache `encode()` results per clip, keyed by a hash of the resampled PCM, so repeated clips skip the
+        encoder. Only `return_dict=True` calls use the cache.
+
+        Args:
+            max_items (int, default=256):
+                Entries kept in memory (least recently used are evicted).
+            cache_dir (Optional[str]):
+                Optional directory for a persistent disk tier.
+
+        Returns:
+            Qwen3TTSFeatureCache: The new cache, also stored in `self.cache`. Set `self.cache = None` to disable.
+        """
+        self.cache = Qwen3TTSFeatureCache(max_items=max_items, cache_dir=cache_dir)
+        return self.cache
+
+    def create_streaming_encoder(self):
+        """
+        Create a stateful encoder for incremental 12Hz encoding, e.g. of live microphone input.
+
+        `encoder.encode(wav)` takes (B, samples) float waveforms at `get_input_sample_rate()` in blocks of any size
+        and returns the codes of the frames completed so far as (B, new_frames, Q); `encoder.flush()` encodes
+        the zero padded remainder and ends the stream. Memory stays bounded however long the stream runs.
+
+        Returns:
+            Qwen3TTSTokenizerV2StreamingEncoder
+        """
+        if self.model.get_model_type() != "qwen3_tts_tokenizer_12hz":
+            raise ValueError("Streaming encode is only supported by the 12Hz tokenizer.")
+        return self.model.streaming_encoder()
+
+    def encode_streaming(
+        self,
+        audios: AudioInput,
+        sr: Optional[int] = None,
+        block_seconds: float = 10.0,
+    ):
+        """
+        Encode long recordings (12Hz) block by block with a streaming encoder instead of one full forward pass,
+        so encoder memory does not grow with the clip length. Items are encoded one at a time, without padding.
+
+        The streaming encoder attends to the last `sliding_window` encoder steps, while `encode()` attends to the
+        whole clip. Codes match `encode()` for clips up to `sliding_window` encoder steps and may differ beyond that.
+
+        Args:
+            audios (AudioInput):
+                Same forms as `encode()`.
+            sr (Optional[int], default=None):
+                Original sampling rate for numpy waveform input.
+            block_seconds (float, default=10.0):
+                Audio fed to the encoder per step, rounded down to whole codec frames.
+
+        Returns:
+            Qwen3TTSTokenizerV2EncoderOutput with field audio_codes: List[torch.LongTensor] each (codes_len, num_quantizers)
+        """
+        wavs = self._normalize_audio_inputs(audios, sr=sr)
+        frame_size = self.get_encode_downsample_rate()
+        block_size = max(int(block_seconds * self.get_input_sample_rate()) // frame_size, 1) * frame_size
+
+        encoder = self.create_streaming_encoder()
+        audio_codes = []
+        with torch.inference_mode():
+            for wav in wavs:
+                wav = torch.from_numpy(wav).to(self.device).to(self.model.dtype).unsqueeze(0)
+                codes = [encoder.encode(wav[:, i : i + block_size]) for i in range(0, wav.shape[-1], block_size)]
+                codes.append(encoder.flush())
+                audio_codes.append(torch.cat([c for c in codes if c is not None], dim=1)[0])
+        return Qwen3TTSTokenizerV2EncoderOutput(audio_codes)
+
     def decode(
         self,
         encoded,
+        parallel_chunks: Optional[int] = 1,
+        audio_lengths: Optional[List[int]] = None,
+        bucket_size: Optional[int] = None,
+        num_quantizers: Optional[int] = None,
+        generator: Optional[Union[torch.Generator, List[torch.Generator]]] = None,
+        num_steps: Optional[int] = None,
+        solver: Optional[str] = None,
+        guidance_interval: Optional[Tuple[float, float]] = None,
+        reuse_guidance: Optional[bool] = None,
     ) -> Tuple[List[np.ndarray], int]:
         """
         Decode back to waveform.
@@ -277,6 +386,38 @@ class Qwen3TTSTokenizer:
                 - ModelOutput returned by `encode()`, OR
                 - dict, OR
                 - list[dict]
+            parallel_chunks (Optional[int]):
+                12Hz PyTorch decoder only. Long code sequences are decoded in 300-frame chunks; this many chunks are
+                decoded together in one batched forward pass. `None` decodes all chunks at once, which
+                uses more memory but lets a single long utterance use all cores / the whole GPU.
+            audio_lengths (Optional[List[int]]):
+                Number of valid code frames per item. Items are trimmed to these lengths before decoding and the
+                waveforms are trimmed to `length * decode_upsample_rate`. Lists of per-item codes already carry
+                their lengths; for a padded batch tensor without `audio_lengths`, trailing all-zero frames are
+                treated as padding.
+            bucket_size (Optional[int]):
+                Sort items by length and decode them in batches of at most `bucket_size`, each padded only to
+                its own longest item. The output order is unchanged. `None` decodes all items in one batch.
+            num_quantizers (Optional[int]):
+                12Hz only. Decode a lower quality preview from the first `num_quantizers` quantizers, treating
+                the remaining residuals as zero. Previews run on the PyTorch decoder even if an ONNX decoder is loaded.
+                `None` uses all quantizers.
+            generator (Optional[Union[torch.Generator, List[torch.Generator]]]):
+                25Hz only. Generator(s) for the DiT initial noise, for reproducible output: one generator, or a
+                list with one generator per item, which also keeps each item's noise independent of the bucketing.
+            num_steps (Optional[int]):
+                25Hz only. Number of DiT ODE time points (default 10). Fewer steps decode faster at lower quality.
+            solver (Optional[str]):
+                25Hz only. DiT ODE solver: "euler" (default), "midpoint", "heun", "rk4" or "multistep". The
+                second order solvers reach a given mel error in fewer DiT passes, see
+                `examples/benchmark_dit_solvers.py`.
+            guidance_interval (Optional[Tuple[float, float]]):
+                25Hz only. Apply classifier-free guidance only at DiT ODE times `lo <= t <= hi` (t = 0 is noise,
+                t = 1 the mel), e.g. `(0.0, 0.5)`. The other steps take one conditional DiT pass instead of two.
+                `None` guides every step.
+            reuse_guidance (Optional[bool]):
+                25Hz only. Outside `guidance_interval`, add the guidance term of the last guided step instead of
+                dropping it, at no extra DiT pass.
 
         Returns:
             Tuple[List[np.ndarray], int]:
@@ -312,57 +453,247 @@ class Qwen3TTSTokenizer:
         else:
             raise TypeError("`encoded` must be an encode output, a dict, or a list of dicts.")
 
-        # Ensure list form for per-sample tensors
+        # Per-item code tensors with their exact lengths
         if isinstance(audio_codes_list, torch.Tensor):
             # Could be a single sample tensor or an already padded batch tensor.
             t = audio_codes_list
             if t.dim() == 1:
                 # 25Hz single sample: (C,) -> (1, C)
                 t = t.unsqueeze(0)
-            elif t.dim() == 2:
+            elif t.dim() == 2 and model_type == "qwen3_tts_tokenizer_12hz":
                 # 12Hz single sample: (C, Q) -> (1, C, Q)
                 t = t.unsqueeze(0)
-            audio_codes_padded = t.to(self.device)
+            if audio_lengths is None:
+                audio_lengths = trailing_code_lengths(t)
+            codes_items = list(t.unbind(0))
         else:
             # List[Tensor/np]
-            audio_codes_list = [_to_tensor(c, dtype=torch.long) for c in audio_codes_list]
-            audio_codes_padded = pad_sequence(audio_codes_list, batch_first=True, padding_value=0).to(self.device)
-
+            codes_items = [_to_tensor(c, dtype=torch.long) for c in audio_codes_list]
+        if audio_lengths is not None:
+            audio_lengths = [int(l) for l in audio_lengths]
+            if len(audio_lengths) != len(codes_items):
+                raise ValueError(f"Got {len(audio_lengths)} audio_lengths for {len(codes_items)} items.")
+            codes_items = [c[:l] for c, l in zip(codes_items, audio_lengths)]
+
+        if model_type == "qwen3_tts_tokenizer_25hz":
+            if xvectors_list is None or ref_mels_list is None:
+                raise ValueError("25Hz decode requires `xvectors` and `ref_mels`.")
+            if isinstance(xvectors_list, torch.Tensor):
+                xvectors_list = xvectors_list if xvectors_list.dim() > 1 else xvectors_list.unsqueeze(0)  # (D,) -> (1, D)
+            xvector_items = [_to_tensor(x, dtype=torch.float32) for x in xvectors_list]
+            if isinstance(ref_mels_list, torch.Tensor):
+                ref_mels_list = ref_mels_list if ref_mels_list.dim() > 2 else ref_mels_list.unsqueeze(0)  # (T, M) -> (1, T, M)
+            ref_mel_items = [_to_tensor(m, dtype=torch.float32) for m in ref_mels_list]
+        elif model_type != "qwen3_tts_tokenizer_12hz":
+            raise ValueError(f"Unknown model type: {model_type}")
+
+        if num_quantizers is not None:
+            if model_type != "qwen3_tts_tokenizer_12hz":
+                raise ValueError("Reduced-quantizer decode is only supported by the 12Hz tokenizer.")
+            codes_items = [c[:, :num_quantizers] for c in codes_items]
+
+        if isinstance(generator, (list, tuple)) and len(generator) != len(codes_items):
+            raise ValueError(f"Got {len(generator)} generators for {len(codes_items)} items.")
+
+        sampler_kwargs = {}
+        if num_steps is not None:
+            sampler_kwargs["num_steps"] = num_steps
+        if solver is not None:
+            sampler_kwargs["solver"] = solver
+        if guidance_interval is not None:
+            sampler_kwargs["guidance_interval"] = tuple(guidance_interval)
+        if reuse_guidance is not None:
+            sampler_kwargs["reuse_guidance"] = reuse_guidance
+        if sampler_kwargs and model_type != "qwen3_tts_tokenizer_25hz":
+            raise ValueError(f"{sorted(sampler_kwargs)} are only supported by the 25Hz tokenizer.")
+
+        # Longest first, so every bucket is padded only up to its own longest item
+        order = list(range(len(codes_items)))
+        if bucket_size is not None:
+            order.sort(key=lambda i: codes_items[i].shape[0], reverse=True)
+        bucket_size = bucket_size or max(len(order), 1)
+
+        wav_tensors = [None] * len(codes_items)
         with torch.inference_mode():
-            if model_type == "qwen3_tts_tokenizer_25hz":
-                if xvectors_list is None or ref_mels_list is None:
-                    raise ValueError("25Hz decode requires `xvectors` and `ref_mels`.")
+            for start in range(0, len(order), bucket_size):
+                bucket = order[start : start + bucket_size]
+                audio_codes_padded = pad_sequence(
+                    [codes_items[i] for i in bucket], batch_first=True, padding_value=0
+                ).to(self.device)
+                bucket_lengths = torch.tensor([codes_items[i].shape[0] for i in bucket], device=self.device)
+
+                if model_type == "qwen3_tts_tokenizer_25hz":
+                    xvectors_batch = torch.stack([xvector_items[i] for i in bucket], dim=0).to(self.device).to(self.model.dtype)
+                    ref_mels_padded = pad_sequence(
+                        [ref_mel_items[i] for i in bucket], batch_first=True, padding_value=0
+                    ).to(self.device).to(self.model.dtype)
+                    bucket_generator = generator
+                    if isinstance(generator, (list, tuple)):
+                        bucket_generator = [generator[i] for i in bucket]
+                    dec = self.model.decode(
+                        audio_codes_padded, xvectors_batch, ref_mels_padded, return_dict=True,
+                        audio_lengths=bucket_lengths, generator=bucket_generator, **sampler_kwargs,
+                    )
+                    bucket_wavs = dec.audio_values
+
+                elif self.onnx_decoder is not None and audio_codes_padded.shape[-1] == self.model.decoder.config.num_quantizers:
+                    audio_values = self.onnx_decoder.decode(audio_codes_padded.transpose(1, 2).cpu().numpy())[:, 0]
+                    wav_lengths = (bucket_lengths * self.get_decode_upsample_rate()).tolist()
+                    bucket_wavs = [torch.from_numpy(a[:l]) for a, l in zip(audio_values, wav_lengths)]
 
-                if isinstance(xvectors_list, torch.Tensor):
-                    xvectors_batch = xvectors_list
-                    if xvectors_batch.dim() == 1:  # (D,) -> (1, D)
-                        xvectors_batch = xvectors_batch.unsqueeze(0)
-                    xvectors_batch = xvectors_batch.to(self.device).to(self.model.dtype)
                 else:
-                    xvectors_list = [_to_tensor(x, dtype=torch.float32) for x in xvectors_list]
-                    xvectors_batch = torch.stack(xvectors_list, dim=0).to(self.device).to(self.model.dtype)
-
-                if isinstance(ref_mels_list, torch.Tensor):
-                    ref_mels_padded = ref_mels_list
-                    if ref_mels_padded.dim() == 2:  # (T, M) -> (1, T, M)
-                        ref_mels_padded = ref_mels_padded.unsqueeze(0)
-                    ref_mels_padded = ref_mels_padded.to(self.device).to(self.model.dtype)
-                else:
-                    ref_mels_list = [_to_tensor(m, dtype=torch.float32) for m in ref_mels_list]
-                    ref_mels_padded = pad_sequence(ref_mels_list, batch_first=True, padding_value=0).to(self.device).to(self.model.dtype)
+                    dec = self.model.decode(
+                        audio_codes_padded, return_dict=True, parallel_chunks=parallel_chunks, audio_lengths=bucket_lengths
+                    )
+                    bucket_wavs = dec.audio_values
+
+                for i, wav in zip(bucket, bucket_wavs):
+                    wav_tensors[i] = wav
+
+        wavs = [w.to(torch.float32).detach().cpu().numpy() for w in wav_tensors]
+        return wavs, int(self.model.get_output_sample_rate())
 
-                dec = self.model.decode(audio_codes_padded, xvectors_batch, ref_mels_padded, return_dict=True)
-                wav_tensors = dec.audio_values
+    def create_streaming_decoder(self):
+        """
+        Create a stateful decoder for incremental 12Hz decoding.
+
+        Each call of `decoder.decode(codes)` with `codes` of shape (B, Q, N) returns the next
+        N * `get_decode_upsample_rate()` samples as a (B, 1, samples) tensor, so no left context
+        has to be re-decoded between chunks. Call `decoder.reset()` to start a new stream.
+
+        The concatenated output equals the full-sequence `decoder(codes)` forward, which `decode()` matches only
+        for utterances up to its 300-frame chunk size.
+
+        Returns:
+            Qwen3TTSTokenizerV2StreamingDecoder
+        """
+        if self.model.get_model_type() != "qwen3_tts_tokenizer_12hz":
+            raise ValueError("Streaming decode is only supported by the 12Hz tokenizer.")
+        return self.model.streaming_decoder()
+
+    def decode_streaming(
+        self,
+        encoded,
+        chunk_size: Optional[int] = None,
+        **kwargs,
+    ) -> Iterator[np.ndarray]:
+        """
+        Decode a single item chunk by chunk and yield its waveform as it is produced, so the first audio is
+        available after one chunk and memory does not grow with the utterance length.
+
+        - 12Hz: runs a streaming decoder (see `create_streaming_decoder`); the chunks match the full-sequence
+          `decoder(codes)` forward. `decode()` decodes 300-frame chunks with 25 frames of left context, so the
+          two match for the first 300 frames (about 25 s) and differ slightly after that.
+        - 25Hz: runs `Qwen3TTSTokenizerV1Decoder.chunked_decode`, which samples the DiT over block-aligned
+          windows with context and cross-fades the BigVGAN output; the chunks closely approximate `decode()`.
+
+        Args:
+            encoded (Any):
+                One item in any form accepted by `decode()` (a batch of one, a dict, or a one-element list).
+            chunk_size (Optional[int]):
+                Code frames per chunk. Defaults to 12 (12Hz) or 48 (25Hz), about 1 and 2 seconds.
+            **kwargs:
+                25Hz only, forwarded to `chunked_decode` (context sizes, `crossfade`, `generator`, `solver`, ...).
+
+        Yields:
+            np.ndarray: 1-D float32 waveform chunks at `get_output_sample_rate()`.
+        """
+        if hasattr(encoded, "audio_codes"):
+            fields = {name: getattr(encoded, name, None) for name in ("audio_codes", "xvectors", "ref_mels")}
+        elif isinstance(encoded, dict):
+            fields = {name: encoded.get(name, None) for name in ("audio_codes", "xvectors", "ref_mels")}
+        elif isinstance(encoded, list):
+            fields = {name: [e[name] for e in encoded] if name in encoded[0] else None for name in ("audio_codes", "xvectors", "ref_mels")}
+        else:
+            raise TypeError("`encoded` must be an encode output, a dict, or a list of dicts.")
 
-            elif model_type == "qwen3_tts_tokenizer_12hz":
-                dec = self.model.decode(audio_codes_padded, return_dict=True)
-                wav_tensors = dec.audio_values
+        def single(value, item_dim: int, dtype: torch.dtype) -> torch.Tensor:
+            if isinstance(value, (list, tuple)):
+                if len(value) != 1:
+                    raise ValueError(f"decode_streaming decodes one item, got {len(value)}.")
+                value = value[0]
+            value = value if isinstance(value, torch.Tensor) else torch.from_numpy(np.asarray(value))
+            if value.dim() == item_dim + 1:
+                if value.shape[0] != 1:
+                    raise ValueError(f"decode_streaming decodes one item, got {value.shape[0]}.")
+                value = value[0]
+            return value.to(self.device).to(dtype)
+
+        model_type = self.model.get_model_type()
+        with torch.inference_mode():
+            if model_type == "qwen3_tts_tokenizer_12hz":
+                if kwargs:
+                    raise ValueError(f"Unexpected arguments for 12Hz streaming decode: {sorted(kwargs)}")
+                chunk_size = chunk_size or 12
+                codes = single(fields["audio_codes"], 2, torch.long).transpose(0, 1).unsqueeze(0)
+                decoder = self.create_streaming_decoder()
+                for start in range(0, codes.shape[-1], chunk_size):
+                    wav = decoder.decode(codes[..., start : start + chunk_size])
+                    yield wav[0, 0].to(torch.float32).cpu().numpy()
+
+            elif model_type == "qwen3_tts_tokenizer_25hz":
+                if fields["xvectors"] is None or fields["ref_mels"] is None:
+                    raise ValueError("25Hz decode requires `xvectors` and `ref_mels`.")
+                codes = single(fields["audio_codes"], 1, torch.long).unsqueeze(0)
+                xvector = single(fields["xvectors"], 1, self.model.dtype).unsqueeze(0)
+                ref_mel = single(fields["ref_mels"], 2, self.model.dtype).unsqueeze(0)
+                chunks = self.model.decoder.chunked_decode(
+                    codes, xvector, ref_mel, chunk_size=chunk_size or 48, **kwargs
+                )
+                for wav in chunks:
+                    yield wav[0].to(torch.float32).cpu().numpy()
 
             else:
                 raise ValueError(f"Unknown model type: {model_type}")
 
-        wavs = [w.to(torch.float32).detach().cpu().numpy() for w in wav_tensors]
-        return wavs, int(self.model.get_output_sample_rate())
+    def export_onnx_decoder(self, output_path: str, streaming: bool = False, opset_version: int = 17) -> str:
+        """
+        Export the 12Hz decoder (codes -> waveform) to ONNX.
+
+        Args:
+            output_path (str):
+                Destination `.onnx` file.
+            streaming (bool):
+                Export the stateful streaming form instead of the full-sequence form, to be run with
+                `Qwen3TTSTokenizerV2OnnxStreamingDecoder`.
+            opset_version (int):
+                ONNX opset.
+
+        Returns:
+            str: `output_path`.
+
+        Raises:
+            ValueError: If the tokenizer is not 12Hz, or its decoder is bfloat16 (load it in float32 or float16).
+        """
+        if self.model.get_model_type() != "qwen3_tts_tokenizer_12hz":
+            raise ValueError("ONNX export is only supported by the 12Hz tokenizer.")
+        return export_decoder_to_onnx(self.model.decoder, output_path, streaming=streaming, opset_version=opset_version)
+
+    def load_onnx_decoder(
+        self,
+        onnx_model,
+        providers: Optional[List[str]] = None,
+        intra_op_num_threads: Optional[int] = None,
+    ) -> None:
+        """
+        Run `decode()` through an onnxruntime session of a full-form decoder from `export_onnx_decoder()`.
+
+        Args:
+            onnx_model (str | bytes | onnxruntime.InferenceSession):
+                Path or serialized model, or an existing session. `None` switches back to the PyTorch decoder.
+            providers (Optional[List[str]]):
+                onnxruntime execution providers, defaults to CPU.
+            intra_op_num_threads (Optional[int]):
+                onnxruntime intra-op threads, defaults to the onnxruntime default.
+        """
+        if onnx_model is None:
+            self.onnx_decoder = None
+            return
+        if self.model.get_model_type() != "qwen3_tts_tokenizer_12hz":
+            raise ValueError("ONNX decode is only supported by the 12Hz tokenizer.")
+        self.onnx_decoder = Qwen3TTSTokenizerV2OnnxDecoder(
+            onnx_model, providers=providers, intra_op_num_threads=intra_op_num_threads
+        )
 
     def get_model_type(self) -> str:
         """
@@ -0,0 +1 @@
+# Tests for qwen_tts
@@ -0,0 +1,160 @@
+# coding=utf-8
+# Copyright 2026 The Alibaba Qwen team.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Tiny randomly initialized checkpoints, so the tests run on CPU without downloading weights.
+"""
+import json
+import os
+
+import pytest
+import torch
+
+NUM_CODE_GROUPS = 4
+SPEAKER = "tom"
+LANGUAGE = "english"
+SPEAKER_ENCODER_FIELDS = [
+    "mel_dim", "enc_dim", "enc_channels", "enc_kernel_sizes", "enc_dilations", "enc_attention_channels",
+    "enc_res2net_scale", "enc_se_channels", "sample_rate",
+]
+
+
+def _build_text_tokenizer():
+    from tokenizers import Tokenizer, decoders, models, pre_tokenizers, trainers
+    from transformers import Qwen2TokenizerFast
+
+    tokenizer = Tokenizer(models.BPE())
+    tokenizer.pre_tokenizer = pre_tokenizers.ByteLevel(add_prefix_space=False)
+    tokenizer.decoder = decoders.ByteLevel()
+    trainer = trainers.BpeTrainer(vocab_size=260, initial_alphabet=pre_tokenizers.ByteLevel.alphabet())
+    tokenizer.train_from_iterator(["hello world this is a test"] * 10, trainer)
+    fast = Qwen2TokenizerFast(
+        tokenizer_object=tokenizer, unk_token=None, bos_token=None, eos_token="<|im_end|>", pad_token="<|endoftext|>"
+    )
+    fast.add_special_tokens({"additional_special_tokens": ["<|im_start|>", "<|im_end|>", "<|endoftext|>"]})
+    fast.add_tokens(["assistant", "user"])
+    return fast
+
+
+def build_speech_tokenizer_12hz(path: str, sliding_window: int = 8) -> None:
+    from transformers import EncodecFeatureExtractor, MimiConfig
+
+    from qwen_tts.core import Qwen3TTSTokenizerV2Config, Qwen3TTSTokenizerV2Model
+
+    torch.manual_seed(0)
+    encoder_config = MimiConfig(
+        hidden_size=32, num_filters=4, num_residual_layers=1, codebook_size=128, codebook_dim=16, num_hidden_layers=1,
+        intermediate_size=64, num_attention_heads=2, num_key_value_heads=2, head_dim=16,
+        num_quantizers=NUM_CODE_GROUPS, num_semantic_quantizers=1, vector_quantization_hidden_dimension=16,
+        sliding_window=50, use_cache=False, upsample_groups=32,
+    )
+    decoder_config = dict(
+        codebook_size=128, hidden_size=32, latent_dim=32, codebook_dim=32, num_attention_heads=2, num_key_value_heads=2,
+        intermediate_size=64, num_hidden_layers=2, num_quantizers=NUM_CODE_GROUPS, decoder_dim=32,
+        sliding_window=sliding_window,
+    )
+    config = Qwen3TTSTokenizerV2Config(
+        encoder_config=encoder_config.to_dict(), decoder_config=decoder_config,
+        encoder_valid_num_quantizers=NUM_CODE_GROUPS,
+    )
+    config.architectures = ["Qwen3TTSTokenizerV2Model"]
+    model = Qwen3TTSTokenizerV2Model(config)
+    # the default init makes the decoder output silence, which would hide any waveform mismatch
+    with torch.no_grad():
+        for param in model.decoder.parameters():
+            param.add_(torch.randn_like(param) * 0.1)
+    model.save_pretrained(path)
+    EncodecFeatureExtractor(feature_size=1, sampling_rate=24000).save_pretrained(path)
+
+
+def build_tts_model(path: str, tts_model_type: str = "custom_voice") -> None:
+    from qwen_tts.core.models import Qwen3TTSConfig, Qwen3TTSForConditionalGeneration, Qwen3TTSProcessor
+
+    torch.manual_seed(0)
+    text_tokenizer = _build_text_tokenizer()
+    Qwen3TTSProcessor(tokenizer=text_tokenizer).save_pretrained(path)
+    text_vocab_size = len(text_tokenizer)
+    talker_config = dict(
+        vocab_size=1100, hidden_size=32, intermediate_size=64, num_hidden_layers=2, num_attention_heads=4,
+        num_key_value_heads=2, head_dim=8, num_code_groups=NUM_CODE_GROUPS, text_hidden_size=16,
+        text_vocab_size=text_vocab_size + 3,
+        codec_eos_token_id=1090, codec_think_id=1091, codec_nothink_id=1092, codec_think_bos_id=1093,
+        codec_think_eos_id=1094, codec_pad_id=1095, codec_bos_id=1096,
+        spk_id={SPEAKER: 1097}, spk_is_dialect={SPEAKER: False}, codec_language_id={LANGUAGE: 1098},
+        rope_scaling={"rope_type": "default", "mrope_section": [1, 1, 2], "interleaved": False},
+        code_predictor_config=dict(
+            vocab_size=128, hidden_size=32, intermediate_size=64, num_hidden_layers=1, num_attention_heads=4,
+            num_key_value_heads=2, head_dim=8, num_code_groups=NUM_CODE_GROUPS,
+        ),
+    )
+    speaker_encoder_config = dict(
+        enc_dim=32, enc_channels=[16, 16, 16, 16, 48], enc_attention_channels=8, enc_res2net_scale=2, enc_se_channels=8
+    )
+    config = Qwen3TTSConfig(
+        talker_config=talker_config,
+        speaker_encoder_config=speaker_encoder_config,
+        tokenizer_type="qwen3_tts_tokenizer_12hz",
+        tts_model_size="0b6",
+        tts_model_type=tts_model_type,
+        tts_pad_token_id=text_vocab_size,
+        tts_bos_token_id=text_vocab_size + 1,
+        tts_eos_token_id=text_vocab_size + 2,
+        im_start_token_id=text_tokenizer.convert_tokens_to_ids("<|im_start|>"),
+        im_end_token_id=text_tokenizer.convert_tokens_to_ids("<|im_end|>"),
+    )
+    config.architectures = ["Qwen3TTSForConditionalGeneration"]
+    Qwen3TTSForConditionalGeneration(config).save_pretrained(path)
+
+    # the speaker encoder config takes only its own fields, not the generic PretrainedConfig ones
+    config_path = os.path.join(path, "config.json")
+    with open(config_path, "r", encoding="utf-8") as f:
+        saved = json.load(f)
+    saved["speaker_encoder_config"] = {
+        k: v for k, v in saved["speaker_encoder_config"].items() if k in SPEAKER_ENCODER_FIELDS
+    }
+    with open(config_path, "w", encoding="utf-8") as f:
+        json.dump(saved, f, indent=2)
+    with open(os.path.join(path, "generation_config.json"), "w", encoding="utf-8") as f:
+        json.dump({"do_sample": True, "max_new_tokens": 12, "top_k": 50}, f)
+
+    build_speech_tokenizer_12hz(os.path.join(path, "speech_tokenizer"))
+
+
+@pytest.fixture(scope="session")
+def custom_voice_model(tmp_path_factory):
+    from qwen_tts import Qwen3TTSModel
+
+    path = str(tmp_path_factory.mktemp("custom_voice"))
+    build_tts_model(path, "custom_voice")
+    return Qwen3TTSModel.from_pretrained(path)
+
+
+@pytest.fixture(scope="session")
+def speech_tokenizer_12hz(tmp_path_factory):
+    from qwen_tts import Qwen3TTSTokenizer
+
+    # a pre-transformer window wider than the 25 frames of left context of the chunked `decode()`
+    path = str(tmp_path_factory.mktemp("speech_tokenizer_12hz"))
+    build_speech_tokenizer_12hz(path, sliding_window=64)
+    return Qwen3TTSTokenizer.from_pretrained(path)
+
+
+@pytest.fixture(scope="session")
+def base_model(tmp_path_factory):
+    from qwen_tts import Qwen3TTSModel
+
+    path = str(tmp_path_factory.mktemp("base"))
+    build_tts_model(path, "base")
+    return Qwen3TTSModel.from_pretrained(path)
@@ -0,0 +1,43 @@
+# coding=utf-8
+# Copyright 2026 The Alibaba Qwen team.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import base64
+
+import numpy as np
+import soundfile as sf
+
+from qwen_tts.inference.qwen3_tts_batching import Qwen3TTSBatchScheduler
+
+
+def test_icl_ref_audio_is_counted_in_memory_budget(custom_voice_model, tmp_path):
+    scheduler = Qwen3TTSBatchScheduler(custom_voice_model, memory_budget=1 << 30)
+    sr = 24000
+    wav = np.random.default_rng(0).uniform(-0.1, 0.1, int(sr * 2.05)).astype(np.float32)
+    path = str(tmp_path / "ref.wav")
+    sf.write(path, wav, sr)
+    with open(path, "rb") as f:
+        data_url = "data:audio/wav;base64," + base64.b64encode(f.read()).decode("ascii")
+
+    # the speech tokenizer encodes the reference to this many frames
+    expected = custom_voice_model.model.speech_tokenizer.encode(wav, sr=sr).audio_codes[0].shape[0]
+    for ref_audio in ((wav, sr), path, data_url, [path]):
+        assert scheduler._ref_audio_frames(ref_audio) == expected
+    assert scheduler._ref_audio_frames("https://example.com/ref.wav") is None
+
+    item = dict(text="hello world", ref_audio=(wav, sr), ref_text="hello")
+    length, ref_frames = scheduler._prompt_length("voice_clone", item)
+    x_vector_length, x_vector_ref_frames = scheduler._prompt_length("voice_clone", dict(item, x_vector_only_mode=True))
+    assert ref_frames == expected and x_vector_ref_frames == 0
+    assert length > x_vector_length + expected
@@ -0,0 +1,46 @@
+# coding=utf-8
+# Copyright 2026 The Alibaba Qwen team.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import numpy as np
+import torch
+
+from .conftest import LANGUAGE, NUM_CODE_GROUPS, SPEAKER
+
+
+def test_preview_codes_only_have_the_predicted_groups(custom_voice_model):
+    torch.manual_seed(0)
+    codes, _ = custom_voice_model._talker_stage("custom_voice")(
+        text="hello world", speaker=SPEAKER, language=LANGUAGE, max_new_tokens=8, subtalker_num_code_groups=2
+    )
+    assert all(c.shape[1] == 2 for c in codes)
+    wavs, _ = custom_voice_model.model.speech_tokenizer.decode([{"audio_codes": c} for c in codes])
+    upsample = custom_voice_model.model.speech_tokenizer.get_decode_upsample_rate()
+    assert [w.shape[0] for w in wavs] == [c.shape[0] * upsample for c in codes]
+
+
+def test_preview_voice_clone_with_reference_codes(base_model):
+    sr = 24000
+    ref_audio = (np.random.default_rng(0).uniform(-0.1, 0.1, sr).astype(np.float32), sr)
+    prompt = base_model.create_voice_clone_prompt(ref_audio=ref_audio, ref_text="hello")
+    assert prompt[0].ref_code.shape[1] == NUM_CODE_GROUPS
+
+    torch.manual_seed(0)
+    codes, ref_code_lens = base_model._talker_stage("voice_clone")(
+        text="hello world", language=LANGUAGE, voice_clone_prompt=prompt, max_new_tokens=8,
+        subtalker_num_code_groups=1,
+    )
+    assert codes[0].shape[1] == 1 and ref_code_lens[0] == prompt[0].ref_code.shape[0]
+    wavs, _ = base_model._decode_talker_codes(codes, ref_code_lens)
+    assert wavs[0].ndim == 1
@@ -0,0 +1,80 @@
+# coding=utf-8
+# Copyright 2026 The Alibaba Qwen team.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import threading
+
+import numpy as np
+import torch
+
+from qwen_tts.inference.qwen3_tts_model import codec_frame_hook
+
+from .conftest import LANGUAGE, SPEAKER
+
+
+def test_codec_frame_hook_only_sees_its_own_generation(custom_voice_model):
+    model = custom_voice_model
+    eos_token_id = model.model.config.talker_config.codec_eos_token_id
+    # both generations are past their first frame before either continues
+    barrier = threading.Barrier(2, timeout=120)
+    results, errors = {}, []
+
+    def run(index: int, max_new_tokens: int) -> None:
+        frames = []
+
+        def on_frame(codec_ids: torch.Tensor) -> None:
+            if not frames:
+                barrier.wait()
+            frames.append(codec_ids[0].clone())
+
+        try:
+            torch.manual_seed(index)
+            with torch.no_grad(), codec_frame_hook(model.model.talker, on_frame):
+                codes, _ = model._talker_stage("custom_voice")(
+                    text="hello world", speaker=SPEAKER, language=LANGUAGE, max_new_tokens=max_new_tokens
+                )
+            results[index] = (frames, codes[0])
+        except Exception as e:  # surfaced in the main thread
+            errors.append(e)
+
+    threads = [threading.Thread(target=run, args=(i, n)) for i, n in enumerate((20, 31))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors, errors
+    for frames, codes in results.values():
+        generated = torch.stack([f for f in frames if int(f[0]) != eos_token_id])
+        assert torch.equal(generated, codes.to(generated.device))
+
+
+def test_streaming_decode_matches_full_forward_past_chunk_size(speech_tokenizer_12hz):
+    tokenizer = speech_tokenizer_12hz
+    chunk_size = 300  # chunk size of the offline 12Hz `decode()`
+    generator = torch.Generator().manual_seed(0)
+    codes = torch.randint(1, 128, (chunk_size + 40, 4), generator=generator)
+    upsample = tokenizer.get_decode_upsample_rate()
+
+    streamed = np.concatenate(list(tokenizer.decode_streaming({"audio_codes": codes}, chunk_size=12)))
+    with torch.inference_mode():
+        full = tokenizer.model.decoder(codes.T.unsqueeze(0))[0, 0].numpy()
+    offline = tokenizer.decode([{"audio_codes": codes}])[0][0]
+
+    assert streamed.shape == full.shape == offline.shape
+    np.testing.assert_allclose(streamed, full, atol=1e-5)
+    head = chunk_size * upsample
+    np.testing.assert_allclose(streamed[:head], offline[:head], atol=1e-5)
+    # past the first chunk, `decode()` only sees 25 frames of left context
+    assert np.abs(streamed[head:] - offline[head:]).max() > 1e-4